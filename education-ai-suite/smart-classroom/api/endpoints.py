@@ -18,14 +18,33 @@ from monitoring.monitor import start_monitoring, stop_monitoring, get_metrics
 from dto.audiosource import AudioSource
 from components.ffmpeg import audio_preprocessing
 from utils.audio_util import save_audio_file
-from utils.locks import audio_pipeline_lock, video_analytics_lock
+from utils.locks import video_analytics_lock
+from utils.job_scheduler import job_scheduler, SchedulerFullError
+from utils.config_loader import config
+from starlette.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 from components.va.va_pipeline_service import VideoAnalyticsPipelineService, PipelineOptions
 from utils.session_manager import generate_session_id
+from utils.preload_models import get_startup_status
+from utils.transcript_index import get_transcript_index
 import logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _submit_job(session_id, kind, device):
+    try:
+        return job_scheduler.submit(session_id, kind, device)
+    except SchedulerFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+def _add_job_headers(response, job):
+    job_status = next((j for j in job_scheduler.status(job.session_id) if j["job_id"] == job.id), None)
+    response.headers["X-Job-ID"] = job.id
+    if job_status:
+        response.headers["X-Queue-Position"] = str(job_status["queue_position"])
+        response.headers["X-Queue-ETA"] = str(job_status["eta_sec"])
+
 @router.get("/create-session")
 def create_session():
     return JSONResponse(content={"session-id":  generate_session_id()}, status_code=200)
@@ -34,21 +53,26 @@ def create_session():
 def health():
     return JSONResponse(content={"status": "ok"}, status_code=200)
 
+@router.get("/ready")
+def ready():
+    startup_status = get_startup_status()
+    status_code = 200 if startup_status["state"] == "ready" else 503
+    return JSONResponse(content=startup_status, status_code=status_code)
+
 @router.post("/upload-audio")
 def upload_audio(file: UploadFile = File(...)):
     status_code = status.HTTP_201_CREATED
-    
-    if audio_pipeline_lock.locked():
-        raise HTTPException(status_code=429, detail="Session Active, Try Later")
-    
+
     try:
-        filename, filepath = save_audio_file(file)
+        filename, filepath, content_hash, duplicate = save_audio_file(file)
         return JSONResponse(
-            status_code=status_code,
+            status_code=status.HTTP_200_OK if duplicate else status_code,
             content={
                 "filename": filename,
-                "message": "File uploaded successfully",
-                "path": filepath
+                "message": "File already uploaded" if duplicate else "File uploaded successfully",
+                "path": filepath,
+                "sha256": content_hash,
+                "duplicate": duplicate
             }
         )
     except HTTPException as he:
@@ -70,46 +94,57 @@ def transcribe_audio(
     request: TranscriptionRequest,
     x_session_id: Optional[str] = Header(None)
 ):
-    if audio_pipeline_lock.locked():
-        raise HTTPException(status_code=429, detail="Session Active, Try Later")
-   
     pipeline = Pipeline(x_session_id)
-   
+    job = _submit_job(pipeline.session_id, "transcription", config.models.asr.device)
+
     def stream_transcription():
-        for chunk_data in pipeline.run_transcription(request):
-            yield json.dumps(chunk_data) + "\n"
-               
- 
-    response = StreamingResponse(stream_transcription(), media_type="application/json")
+        try:
+            job_scheduler.wait(job)
+            for chunk_data in pipeline.run_transcription(request):
+                yield json.dumps(chunk_data) + "\n"
+        finally:
+            job_scheduler.finish(job)
+
+    # finish() is idempotent; the background task also releases the job if streaming never starts
+    response = StreamingResponse(stream_transcription(), media_type="application/json",
+                                 background=BackgroundTask(job_scheduler.finish, job))
     response.headers["X-Session-ID"] = pipeline.session_id
+    _add_job_headers(response, job)
     return response
 
 
 @router.post("/summarize")
 async def summarize_audio(request: SummaryRequest):
-    if audio_pipeline_lock.locked():
-        raise HTTPException(status_code=429, detail="Session Active, Try Later")
-    
-    pipeline = Pipeline(request.session_id)
-    
-    async def event_stream():
-        for token in pipeline.run_summarizer():
-            if token.startswith("[ERROR]:"):
-                logger.error(f"Error while summarizing: {token}")
-                yield json.dumps({"token": "", "error": token}) + "\n"
-                break
-            else:
-                yield json.dumps({"token": token, "error": ""}) + "\n"
-            await asyncio.sleep(0)
+    # building the pipeline waits for the startup preload to release the models; keep that off the event loop
+    pipeline = await run_in_threadpool(Pipeline, request.session_id)
+    job = _submit_job(request.session_id, "summary", config.models.summarizer.device)
 
-    return StreamingResponse(event_stream(), media_type="application/json")
+    async def event_stream():
+        try:
+            # wait for the device off the event loop so other requests keep being served
+            await run_in_threadpool(job_scheduler.wait, job)
+            for token in pipeline.run_summarizer():
+                if token.startswith("[ERROR]:"):
+                    logger.error(f"Error while summarizing: {token}")
+                    yield json.dumps({"token": "", "error": token}) + "\n"
+                    break
+                else:
+                    yield json.dumps({"token": token, "error": ""}) + "\n"
+                await asyncio.sleep(0)
+        finally:
+            job_scheduler.finish(job)
+
+    response = StreamingResponse(event_stream(), media_type="application/json",
+                                 background=BackgroundTask(job_scheduler.finish, job))
+    _add_job_headers(response, job)
+    return response
 
 @router.post("/mindmap")
-async def generate_mindmap(request: SummaryRequest):
-    if audio_pipeline_lock.locked():
-        raise HTTPException(status_code=429, detail="Session Active, Try Later")
+def generate_mindmap(request: SummaryRequest):
     pipeline = Pipeline(request.session_id)
+    job = _submit_job(request.session_id, "mindmap", config.models.summarizer.device)
     try:
+        job_scheduler.wait(job)
         mindmap_text = pipeline.run_mindmap()
         logger.info("Mindmap generated successfully.")
         return {"mindmap": mindmap_text, "error": ""} 
@@ -121,6 +156,18 @@ async def generate_mindmap(request: SummaryRequest):
             status_code=500,
             detail=f"Mindmap generation failed: {e}"
         )
+    finally:
+        job_scheduler.finish(job)
+
+@router.get("/jobs")
+def get_jobs(x_session_id: Optional[str] = Header(None)):
+    """
+    Queued and running transcription/summary/mindmap jobs, for one session if x-session-id is set
+
+    Returns:
+        JSON with queue position (0 = running) and ETA in seconds per job
+    """
+    return JSONResponse(content={"jobs": job_scheduler.status(x_session_id)}, status_code=200)
 
 @router.get("/devices")
 def list_audio_devices():
@@ -177,6 +224,79 @@ def get_summary_metrics(session_id: Optional[str] = Header(None, alias="session_
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@router.get("/performance-metrics/series")
+def get_metrics_series(name: str, session_ids: Optional[str] = None, since: Optional[float] = None, limit: int = 1000):
+    """
+    Time series of one metric (e.g. performance.tps) across sessions.
+
+    Args:
+        name: metric name, "<group>.<metric>"
+        session_ids: optional comma separated list of session ids
+        since: optional unix timestamp lower bound
+        limit: maximum number of most recent samples
+
+    Returns:
+        JSON with the samples ordered oldest to newest
+    """
+    project_config = RuntimeConfig.get_section("Project")
+    location = project_config.get("location")
+    project_name = project_config.get("name")
+    if not location or not project_name:
+        return JSONResponse(
+            content={"error": "Missing project configuration for 'location' or 'name'"},
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        ids = [s.strip() for s in session_ids.split(",") if s.strip()] if session_ids else None
+        series = StorageManager.read_metrics_series(location, project_name, name, ids, since, limit)
+        return JSONResponse(content={"name": name, "samples": series}, status_code=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error reading metrics series: {e}")
+        return JSONResponse(
+            content={"error": str(e)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@router.get("/search")
+def search_transcripts(q: str, session_ids: Optional[str] = None, limit: int = 20):
+    """
+    Full-text search over the transcripts of all sessions of the current project.
+
+    Args:
+        q: words that must all occur in a transcript chunk
+        session_ids: optional comma separated list of session ids to search in
+        limit: maximum number of hits
+
+    Returns:
+        JSON with the hits, best match first; start_ms/end_ms locate the chunk in the session audio
+    """
+    project_config = RuntimeConfig.get_section("Project")
+    location = project_config.get("location")
+    project_name = project_config.get("name")
+    if not location or not project_name:
+        return JSONResponse(
+            content={"error": "Missing project configuration for 'location' or 'name'"},
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    if not config.search.enabled:
+        return JSONResponse(
+            content={"error": "Transcript search is disabled (search.enabled)"},
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        ids = [s.strip() for s in session_ids.split(",") if s.strip()] if session_ids else None
+        index = get_transcript_index(location, project_name, config.search.tokenizer)
+        hits = index.search(q, ids, max(1, min(limit, 200)))
+        return JSONResponse(content={"query": q, "hits": hits}, status_code=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error searching transcripts: {e}")
+        return JSONResponse(
+            content={"error": str(e)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @router.get("/project")
 def get_project_config():
     return RuntimeConfig.get_section("Project")
@@ -195,11 +315,15 @@ def start_monitoring_endpoint( x_session_id: Optional[str] = Header(None)):
     return JSONResponse(content={"status": "success", "message": "Monitoring started"})
 
 @router.get("/metrics")
-def get_metrics_endpoint(x_session_id: Optional[str] = Header(None)):
+def get_metrics_endpoint(last: Optional[int] = None, points: Optional[int] = None, x_session_id: Optional[str] = Header(None)):
+    """
+    Utilization samples of the session, oldest first.
+    `last` returns only the latest N samples, `points` averages them into at most N windows.
+    """
     if x_session_id is None or "":
         return ""
     project_config = RuntimeConfig.get_section("Project")
-    return get_metrics(os.path.join(project_config.get("location"), project_config.get("name"), x_session_id, "utilization_logs"))
+    return get_metrics(os.path.join(project_config.get("location"), project_config.get("name"), x_session_id, "utilization_logs"), last, points)
 
 @router.get("/platform-info")
 def get_platform_info():
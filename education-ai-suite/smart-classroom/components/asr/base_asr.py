@@ -1,4 +1,7 @@
 class BaseASR:
+   # Set to True when transcribe() also accepts a 16 kHz mono float32 numpy buffer
+   supports_array_input = False
+
    def __init__(self, model_name=..., revision=..., device="cpu"):
        # Abstract Method
        # Load model
@@ -6,5 +9,14 @@ class BaseASR:
 
    def transcribe(self, audio_path: str) -> str:
        # Abstract Method
-       # Return transcribed text from .wav file
-       raise NotImplementedError("Must implement in subclass.")
\ No newline at end of file
+       # Return transcribed text from .wav file (or numpy buffer, see supports_array_input)
+       raise NotImplementedError("Must implement in subclass.")
+
+   def prepare(self, audio):
+       # Optional hook run on the pipeline's preparation stage, ahead of inference
+       # (e.g. loading/resampling a .wav) so it overlaps with the previous chunk's decode
+       return audio
+
+   def transcribe_batch(self, audio_inputs: list, temperature: float = 0.0) -> list:
+       # Backends with native batching override this; results must keep input order
+       return [self.transcribe(audio, temperature=temperature) for audio in audio_inputs]
\ No newline at end of file
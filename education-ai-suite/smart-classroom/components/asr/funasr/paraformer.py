@@ -18,6 +18,8 @@ VAD_MODEL = "iic/speech_fsmn_vad_zh-cn-16k-common-pytorch"
 PUNC_MODEL = "iic/punc_ct-transformer_zh-cn-common-vocab272727-pytorch"
 
 class Paraformer(BaseASR):
+    supports_array_input = True
+
     def __init__(self, model_name, device="cpu", revision="v2.0.4"):
         if model_name not in FUNASR_MODEL_MAP:
             raise ValueError(f"Invalid ASR model name {model_name}. Supported models are: {list(FUNASR_MODEL_MAP.keys())}")
@@ -42,7 +44,7 @@ class Paraformer(BaseASR):
                         device=device, disable_update=True
                         )
 
-    def transcribe(self, audio_path: str, temperature=0.0) -> str:
+    def transcribe(self, audio_path, temperature=0.0) -> str:
         try:
             res = self.model.generate(input=audio_path)
             # res [{'key': <input>, 'text': '...', , 'timestamp': [[], [], ...]}]
@@ -54,4 +56,14 @@ class Paraformer(BaseASR):
         except Exception as e:
             logger.error(f"Error during transcription: {e}")
             return None
-        
\ No newline at end of file
+
+    def transcribe_batch(self, audio_inputs, temperature=0.0):
+        try:
+            res = self.model.generate(input=list(audio_inputs), batch_size=len(audio_inputs))
+            # one result dict per input, in input order
+            if len(res) == len(audio_inputs):
+                return [r.get("text") for r in res]
+            logger.warning(f"Batched ASR returned {len(res)} results for {len(audio_inputs)} inputs, retrying per chunk.")
+        except Exception as e:
+            logger.error(f"Error during batched transcription: {e}")
+        return [self.transcribe(audio, temperature=temperature) for audio in audio_inputs]
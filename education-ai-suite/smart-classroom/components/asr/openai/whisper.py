@@ -13,10 +13,12 @@ WHISPER_MODEL_MAP = {
 }    
  
 class Whisper(BaseASR):
+   supports_array_input = True
+
    def __init__(self, model_name="whisper-small", device="cpu", revision=None):
         model = WHISPER_MODEL_MAP[model_name] if model_name in WHISPER_MODEL_MAP else (_ for _ in ()).throw(ValueError("Invalid ASR model name"))
         logger.info(f"Loading Model: model name={model_name}, device={device}")
         self.model = whisper.load_model(model)
  
-   def transcribe(self, audio_path: str, temperature: float) -> str:
+   def transcribe(self, audio_path, temperature: float) -> str:
         return self.model.transcribe(audio_path, temperature=temperature)["text"]
\ No newline at end of file
@@ -8,14 +8,24 @@ from utils.ensure_model import get_asr_model_path
 logger = logging.getLogger(__name__)  
  
 class Whisper(BaseASR):
+   supports_array_input = True
+
    def __init__(self, model_name="whisper-small", device="CPU", revision=None,threads_limit=None):
         logger.info(f"Loading Model: model name={model_name}, device={device}")
         self.model_path = get_asr_model_path()
         config = {"INFERENCE_NUM_THREADS": str(threads_limit)} if threads_limit and threads_limit > 0 else {}
         self.model = ov_genai.WhisperPipeline( self.model_path, device=device,config=config)
  
-   def transcribe(self, audio_path: str, temperature: float) -> str:
-          audio, sr = self._load_wav_mono_16k(audio_path)
+   def prepare(self, audio):
+          if isinstance(audio, str):
+              audio, _ = self._load_wav_mono_16k(audio)
+          return audio
+
+   def transcribe(self, audio_path, temperature: float) -> str:
+          if isinstance(audio_path, str):
+              audio, sr = self._load_wav_mono_16k(audio_path)
+          else:
+              audio = audio_path
           result = self.model.generate(audio)
           return getattr(result, "text", str(result))
    
@@ -1,23 +1,98 @@
 from components.base_component import PipelineComponent
 import os
+import json
 import time
-import torch
+import queue
+import threading
 from utils.config_loader import config
 from utils.storage_manager import StorageManager
 from utils.runtime_config_loader import RuntimeConfig
-from components.asr.openai.whisper import Whisper as OA_Whisper
-from components.asr.openvino.whisper import Whisper as OV_Whisper
-from components.asr.funasr.paraformer import Paraformer
+from components.ffmpeg.audio_preprocessing import write_chunk_wav
+from utils.transcription_cache import audio_fingerprint, get_transcription_cache
+from utils.transcript_index import get_transcript_index
 import logging
 logger = logging.getLogger(__name__)
 
 DELETE_CHUNK_AFTER_USE =  config.pipeline.delete_chunks_after_use
 threads_limit = config.models.asr.threads_limit
 THREADS_LIMIT = threads_limit if threads_limit and threads_limit > 0 else None
+BATCH_SIZE = max(1, config.models.asr.batch_size or 1)
+QUEUE_SIZE = max(1, config.pipeline.asr_queue_size or 1)
+CACHE_ENABLED = config.models.asr.cache.enabled
+CACHE_MAX_BYTES = int(config.models.asr.cache.max_size_mb * 1024 * 1024)
+SEARCH_ENABLED = config.search.enabled
+
+_END_OF_STAGE = object()
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+def _put(q, item, stop_event):
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _run_stage(source, transform, sink, stop_event):
+    # Runs in its own thread: pulls from source, transforms and forwards into the bounded sink queue
+    try:
+        for item in source:
+            if stop_event.is_set() or not _put(sink, transform(item), stop_event):
+                break
+    except Exception as e:
+        _put(sink, _StageError(e), stop_event)
+    finally:
+        if hasattr(source, "close"):
+            source.close()
+        _put(sink, _END_OF_STAGE, stop_event)
+
+def _get(q, stop_event):
+    # Ends once stop_event is set, since a stopped producer may give up without sending _END_OF_STAGE
+    while True:
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            if stop_event.is_set():
+                return _END_OF_STAGE
+
+def _drain(q, stop_event):
+    while True:
+        item = _get(q, stop_event)
+        if item is _END_OF_STAGE:
+            return
+        if isinstance(item, _StageError):
+            raise item.error
+        yield item
+
 class ASRComponent(PipelineComponent):
 
     _model = None
     _config = None
+    _load_lock = threading.Lock()
+    # Imported on first load only; see utils/preload_models.py for the timed startup import
+    PROVIDER_MODULES = {
+        "openai": "components.asr.openai.whisper",
+        "openvino": "components.asr.openvino.whisper",
+        "funasr": "components.asr.funasr.paraformer",
+    }
+
+    @staticmethod
+    def _load_model(provider, model_name, device, threads_limit):
+        # Provider modules pull in torch / funasr / openvino, so only the configured one is imported
+        if provider == "openai" and "whisper" in model_name:
+            from components.asr.openai.whisper import Whisper as OA_Whisper
+            return OA_Whisper(model_name, device, None)
+        elif provider == "openvino" and "whisper" in model_name:
+            from components.asr.openvino.whisper import Whisper as OV_Whisper
+            return OV_Whisper(model_name, device, None, threads_limit)
+        elif provider == "funasr" and "paraformer" in model_name:
+            from components.asr.funasr.paraformer import Paraformer
+            return Paraformer(model_name, device.lower(), None)
+        raise ValueError(f"Unsupported ASR provider/model: {provider}/{model_name}")
 
     def __init__(self, session_id, provider="openai", model_name="whisper-small", device="CPU", temperature=0.0):
 
@@ -26,62 +101,192 @@ class ASRComponent(PipelineComponent):
         self.provider = provider
         self.model_name = model_name
         self.threads_limit = THREADS_LIMIT
+        self.batch_size = BATCH_SIZE
         provider, model_name = provider.lower(), model_name.lower()
-        config = (provider, model_name, device)
-
-        # Reload only if config changed
-        if ASRComponent._model is None or ASRComponent._config != config:
-            if provider == "openai" and "whisper" in model_name:
-                ASRComponent._model = OA_Whisper(model_name, device, None)
-            elif provider == "openvino" and "whisper" in model_name:
-                ASRComponent._model = OV_Whisper(model_name, device, None,self.threads_limit)
-            elif provider == "funasr" and "paraformer" in model_name:
-                ASRComponent._model = Paraformer(model_name, device.lower(), None)
-            else:
-                raise ValueError(f"Unsupported ASR provider/model: {provider}/{model_name}")
-            ASRComponent._config = config
-
-        self.asr = ASRComponent._model
+        model_config = (provider, model_name, device)
+
+        # Reload only if config changed; requests arriving during startup preload wait for it
+        with ASRComponent._load_lock:
+            if ASRComponent._model is None or ASRComponent._config != model_config:
+                ASRComponent._model = ASRComponent._load_model(provider, model_name, device, self.threads_limit)
+                ASRComponent._config = model_config
+            self.asr = ASRComponent._model
+        self.cache = None
+        # Everything besides the audio that changes the transcript of a chunk
+        self.cache_signature = {"provider": provider, "model": model_name, "temperature": temperature}
+
+    def _prepare(self, chunk_data):
+        # In-memory chunks carry the PCM buffer; only spill to disk if the provider needs a path
+        audio = chunk_data.pop("audio", None)
+        if self.cache is not None:
+            # Hashing runs here, on the preparation thread, so it overlaps with inference
+            chunk_data["cache_key"] = audio_fingerprint(chunk_data["chunk_path"] if audio is None else audio, self.cache_signature)
+            cached_text = self.cache.get(chunk_data["cache_key"])
+            if cached_text is not None:
+                chunk_data["cached_text"] = cached_text
+                return chunk_data, None
+        if audio is None:
+            audio_input = chunk_data["chunk_path"]
+        elif self.asr.supports_array_input:
+            audio_input = audio
+        else:
+            chunk_data["chunk_path"] = write_chunk_wav(audio, chunk_data["chunk_index"])
+            audio_input = chunk_data["chunk_path"]
+        return chunk_data, self.asr.prepare(audio_input)
+
+    def _pipelined_batches(self, input_generator):
+        """
+        Overlaps chunk extraction, input preparation and inference through bounded queues.
+        Yields lists of (chunk_data, audio_input) in chunk order; a batch holds whatever is
+        already prepared (up to batch_size), so live sessions are never delayed to fill one.
+        """
+        stop_event = threading.Event()
+        chunks, prepared = queue.Queue(maxsize=QUEUE_SIZE), queue.Queue(maxsize=QUEUE_SIZE)
+        stages = [
+            threading.Thread(target=_run_stage, args=(input_generator, lambda c: c, chunks, stop_event),
+                             name=f"asr-extract-{self.session_id}", daemon=True),
+            threading.Thread(target=_run_stage, args=(_drain(chunks, stop_event), self._prepare, prepared, stop_event),
+                             name=f"asr-prepare-{self.session_id}", daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+
+        try:
+            terminal = None
+            while terminal is None:
+                item = _get(prepared, stop_event)
+                if item is _END_OF_STAGE or isinstance(item, _StageError):
+                    terminal = item
+                    break
+                batch = [item]
+                while len(batch) < self.batch_size:
+                    try:
+                        next_item = prepared.get_nowait()
+                    except queue.Empty:
+                        break
+                    if next_item is _END_OF_STAGE or isinstance(next_item, _StageError):
+                        # Nothing follows end/error in the queue; handle it once this batch is out
+                        terminal = next_item
+                        break
+                    batch.append(next_item)
+                yield batch
+            if isinstance(terminal, _StageError):
+                raise terminal.error
+        finally:
+            stop_event.set()
+            for stage in stages:
+                stage.join(timeout=5)
 
     def process(self, input_generator):
 
         project_config = RuntimeConfig.get_section("Project")
         project_path = os.path.join(project_config.get("location"), project_config.get("name"), self.session_id)
         StorageManager.save(os.path.join(project_path, "transcription.txt"), "", append=False)
+        # Per-chunk transcript with timestamps, used to split long transcripts on chunk boundaries
+        StorageManager.save(os.path.join(project_path, "transcription_chunks.jsonl"), "", append=False)
+
+        if CACHE_ENABLED:
+            self.cache = get_transcription_cache(project_config.get("location"), CACHE_MAX_BYTES)
+        search_index = None
+        if SEARCH_ENABLED:
+            # Indexing happens on the index's own writer thread; this only enqueues
+            search_index = get_transcript_index(project_config.get("location"), project_config.get("name"), config.search.tokenizer)
+            search_index.reset_session(self.session_id)
 
         start_time = time.perf_counter()
         default_torch_threads = None
+        audio_start, audio_end, chunk_count, cache_hits = None, None, 0, 0
         try: 
             if self.provider in ["openai", "funasr"] and self.threads_limit and self.threads_limit > 0:
+                import torch
                 default_torch_threads = torch.get_num_threads()
                 torch.set_num_threads(self.threads_limit)
 
-            for chunk_data in input_generator:
-                chunk_path = chunk_data["chunk_path"]
-                transcribed_text = self.asr.transcribe(chunk_path, temperature=self.temperature)
+            for batch in self._pipelined_batches(input_generator):
+                # Cached chunks skip inference; results still go out in chunk order
+                texts = [chunk_data.pop("cached_text", None) for chunk_data, _ in batch]
+                misses = [i for i, text in enumerate(texts) if text is None]
+                cache_hits += len(batch) - len(misses)
+                if misses:
+                    batch_start = time.perf_counter()
+                    transcribed = self.asr.transcribe_batch([batch[i][1] for i in misses], temperature=self.temperature)
+                    chunk_latency = (time.perf_counter() - batch_start) / len(misses)
+                    StorageManager.record_metrics(
+                        project_config.get("location"),
+                        project_config.get("name"),
+                        self.session_id,
+                        {"performance.asr_chunk_latency": round(chunk_latency, 4)}
+                    )
+                    for i, transcribed_text in zip(misses, transcribed):
+                        texts[i] = transcribed_text
+                        if self.cache is not None and transcribed_text is not None:
+                            self.cache.put(batch[i][0]["cache_key"], transcribed_text)
 
-                if os.path.exists(chunk_data["chunk_path"]) and DELETE_CHUNK_AFTER_USE:
-                    os.remove(chunk_data["chunk_path"])
+                for (chunk_data, _), transcribed_text in zip(batch, texts):
+                    chunk_data.pop("cache_key", None)
+                    chunk_path = chunk_data.get("chunk_path")
+                    if chunk_path and os.path.exists(chunk_path) and DELETE_CHUNK_AFTER_USE:
+                        os.remove(chunk_path)
 
-                StorageManager.save_async(os.path.join(project_path, "transcription.txt"), transcribed_text, append=True)
+                    StorageManager.save_async(os.path.join(project_path, "transcription.txt"), transcribed_text, append=True)
+                    StorageManager.save_async(
+                        os.path.join(project_path, "transcription_chunks.jsonl"),
+                        json.dumps({
+                            "chunk_index": chunk_data["chunk_index"],
+                            "start_time": chunk_data["start_time"],
+                            "end_time": chunk_data["end_time"],
+                            "text": transcribed_text
+                        }, ensure_ascii=False) + "\n",
+                        append=True
+                    )
 
-                yield {
-                    **chunk_data,  # keep all chunk metadata
-                    "text": transcribed_text
-                }
+                    if search_index is not None:
+                        search_index.add(
+                            self.session_id,
+                            chunk_data["chunk_index"],
+                            chunk_data["start_time"],
+                            chunk_data["end_time"],
+                            transcribed_text,
+                            speaker=chunk_data.get("speaker")
+                        )
+
+                    if audio_start is None:
+                        audio_start = chunk_data["start_time"]
+                    audio_end = chunk_data["end_time"]
+                    chunk_count += 1
+
+                    yield {
+                        **chunk_data,  # keep all chunk metadata
+                        "text": transcribed_text
+                    }
         finally:
             if default_torch_threads is not None:
+                import torch
                 torch.set_num_threads(default_torch_threads)
+            StorageManager.close(os.path.join(project_path, "transcription.txt"))
+            StorageManager.close(os.path.join(project_path, "transcription_chunks.jsonl"))
                 
             end_time = time.perf_counter()
             transcription_time = end_time - start_time
+            audio_duration = (audio_end - audio_start) if chunk_count else 0.0
+            rtf = (transcription_time / audio_duration) if audio_duration > 0 else -1
+            throughput = (audio_duration / transcription_time) if transcription_time > 0 else -1
 
-            # Save the transcription time in the metrics CSV file
-            StorageManager.update_csv(
-                path=os.path.join(project_path, "performance_metrics.csv"),
-                new_data={
+            # Save the transcription time in the session metrics store
+            StorageManager.record_metrics(
+                project_config.get("location"),
+                project_config.get("name"),
+                self.session_id,
+                {
                     "configuration.asr_model": f"{self.provider}/{self.model_name}",
-                    "performance.transcription_time": round(transcription_time, 4)
+                    "configuration.asr_batch_size": self.batch_size,
+                    "performance.transcription_time": round(transcription_time, 4),
+                    "performance.audio_duration": round(audio_duration, 4),
+                    "performance.asr_rtf": round(rtf, 4),
+                    "performance.asr_throughput": round(throughput, 4),
+                    "performance.asr_chunks": chunk_count,
+                    "performance.asr_cache_hits": cache_hits,
+                    "performance.asr_cache_hit_rate": round(cache_hits / chunk_count, 4) if chunk_count else 0.0
                 }
             )
 
@@ -5,9 +5,13 @@ import atexit
 import shutil
 import platform,time
 import logging
+import wave
+import threading
+import numpy as np
 from utils.config_loader import config
 from utils.runtime_config_loader import RuntimeConfig
 from dto.audiosource import AudioSource
+from components.ffmpeg.ring_buffer import PcmRingBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +20,16 @@ SILENCE_THRESH = config.audio_preprocessing.silence_threshold
 SILENCE_DURATION = config.audio_preprocessing.silence_duration
 SEARCH_WINDOW = config.audio_preprocessing.search_window_sec
 CLEAN_UP_ON_EXIT = config.app.cleanup_on_exit
+LIVE_CAPTURE_MODE = config.audio_preprocessing.live_capture_mode
+RING_BUFFER_SEC = config.audio_preprocessing.ring_buffer_sec
+MAX_DURATION = 45 * 60
 
 CHUNKS_DIR = config.audio_preprocessing.chunk_output_path
 os.makedirs(CHUNKS_DIR, exist_ok=True)
 
+SAMPLE_RATE = 16000
+SILENCE_FRAME_SEC = 0.01  # energy is measured over 10 ms frames
+
 FFMPEG_PROCESSES = {}
 
 @atexit.register
@@ -57,6 +67,49 @@ def detect_silences(audio_path):
             current_silence = {}
     return silences
 
+def decode_audio(audio_path, sample_rate=SAMPLE_RATE):
+    """
+    Decodes the whole input once into a mono float32 PCM buffer at `sample_rate`.
+    """
+    result = subprocess.run([
+        "ffmpeg", "-nostdin", "-v", "error", "-i", audio_path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "f32le", "-"
+    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    if result.returncode != 0:
+        error = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Failed to decode audio {audio_path}: {error}")
+
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+def detect_silences_pcm(audio, sample_rate=SAMPLE_RATE, offset=0.0):
+    """
+    Energy based equivalent of `detect_silences` working on a decoded PCM buffer.
+    Returns silences as [{'start': sec, 'end': sec}, ...], shifted by `offset` seconds.
+    """
+    frame_len = max(1, int(sample_rate * SILENCE_FRAME_SEC))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    silent = rms < 10 ** (SILENCE_THRESH / 20)
+
+    # Rising/falling edges of the silent mask give the boundaries of each silent run
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    frame_sec = frame_len / sample_rate
+    min_frames = SILENCE_DURATION / frame_sec
+    return [
+        {"start": offset + start * frame_sec, "end": offset + end * frame_sec}
+        for start, end in zip(run_starts, run_ends)
+        if end - start >= min_frames
+    ]
+
 def get_closest_silence(silences, target_time, window=SEARCH_WINDOW):
     closest = None
     closest_diff = float('inf')
@@ -99,30 +152,150 @@ def process_audio_segment(audio_path, start_time, end_time, chunk_index):
         "chunk_index": chunk_index
     }
 
+def write_chunk_wav(audio, chunk_index, sample_rate=SAMPLE_RATE):
+    """
+    Writes an in-memory chunk to a 16-bit PCM WAV under CHUNKS_DIR.
+    Only needed for ASR providers that cannot consume numpy buffers directly.
+    """
+    chunk_name = f"chunk_{chunk_index}_{uuid4().hex[:6]}.wav"
+    chunk_path = os.path.join(CHUNKS_DIR, chunk_name)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(chunk_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm.tobytes())
+    logger.debug(f"Chunk {chunk_index} saved: {chunk_path}")
+    return chunk_path
+
 def chunk_audio_by_silence(audio_path):
     if SEARCH_WINDOW > CHUNK_DURATION:
         raise ValueError(
             f"Silence search window ({SEARCH_WINDOW}s) can't be more than chunk duration ({CHUNK_DURATION}s)."
         )
-    duration = get_audio_duration(audio_path)
-    silences = detect_silences(audio_path)
+    audio = decode_audio(audio_path)
+    duration = len(audio) / SAMPLE_RATE
+    silences = detect_silences_pcm(audio)
     current_time, chunk_index = 0.0, 0
     while current_time < duration:
         ideal_end = current_time + CHUNK_DURATION
         end_time = get_closest_silence(silences, ideal_end) or min(ideal_end, duration)
         if end_time <= current_time:
             end_time = min(ideal_end, duration)
-        yield process_audio_segment(audio_path, current_time, end_time, chunk_index)
+        start_sample, end_sample = int(round(current_time * SAMPLE_RATE)), int(round(end_time * SAMPLE_RATE))
+        yield {
+            "audio": audio[start_sample:end_sample],  # view into the decoded buffer, no copy
+            "start_time": current_time,
+            "end_time": end_time,
+            "chunk_index": chunk_index
+        }
         current_time = end_time
         chunk_index += 1
 
-def chunk_audiostream_by_silence(session_id: str):
-    global FFMPEG_PROCESSES
+def _get_mic_device():
     mic_device = RuntimeConfig.get_section("Project").get("microphone", "").strip()
     if not mic_device:
         raise ValueError(
             "Microphone device not set in runtime_config.yaml under Project.microphone"
         )
+    return mic_device
+
+def _pump_pcm(stream, ring, block_samples):
+    # Reader thread: move raw f32le PCM from the ffmpeg pipe into the ring buffer
+    try:
+        while True:
+            data = stream.read(block_samples * 4)
+            if not data:
+                break
+            data = data[:len(data) - len(data) % 4]
+            if ring.write(np.frombuffer(data, dtype=np.float32)) < len(data) // 4:
+                break  # consumer closed the buffer
+    except Exception as e:
+        logger.warning(f"Live audio reader stopped: {e}")
+    finally:
+        ring.close()
+
+def stream_audiostream_by_silence(session_id: str):
+    """
+    Streaming capture: ffmpeg writes raw PCM to a pipe, a reader thread fills a bounded
+    ring buffer and chunks are cut at silences found in the buffered window only.
+    Per-chunk cost does not depend on how long the session has been running.
+    """
+    global FFMPEG_PROCESSES
+    mic_device = _get_mic_device()
+    if SEARCH_WINDOW > CHUNK_DURATION:
+        raise ValueError(
+            f"Silence search window ({SEARCH_WINDOW}s) can't be more than chunk duration ({CHUNK_DURATION}s)."
+        )
+    process = subprocess.Popen(
+        [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-f", "dshow",
+            "-i", f"audio={mic_device}",
+            "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-f", "f32le", "-"
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    FFMPEG_PROCESSES[session_id] = process
+
+    # Look ahead by the search window so a silence just after the ideal cut can be used
+    window = int((CHUNK_DURATION + SEARCH_WINDOW) * SAMPLE_RATE)
+    ring = PcmRingBuffer(max(window, int(RING_BUFFER_SEC * SAMPLE_RATE)))
+    reader = threading.Thread(
+        target=_pump_pcm, args=(process.stdout, ring, int(SAMPLE_RATE * SILENCE_FRAME_SEC) * 10),
+        name=f"mic-reader-{session_id}", daemon=True
+    )
+    reader.start()
+    logger.info(f"🎙️ Streaming from {mic_device} (session={session_id}) ... use /stop-mic to stop.")
+
+    current_time, chunk_index = 0.0, 0
+    try:
+        while True:
+            if current_time >= MAX_DURATION:
+                logger.info(f"Session {session_id}: reached 45 min limit, stopping.")
+                break
+            available = ring.wait_for(window)
+            if available == 0:
+                break  # stream closed and fully drained
+
+            pcm = ring.peek(window)
+            buffered = len(pcm) / SAMPLE_RATE
+            if ring.closed and buffered <= CHUNK_DURATION:
+                logger.info(f"Session {session_id}: FFmpeg stopped, processing final chunk...")
+                end_time = current_time + buffered
+            else:
+                silences = detect_silences_pcm(pcm, offset=current_time)
+                ideal_end = current_time + CHUNK_DURATION
+                end_time = get_closest_silence(silences, ideal_end) or min(ideal_end, current_time + buffered)
+                if end_time <= current_time:
+                    end_time = min(ideal_end, current_time + buffered)
+
+            cut = min(len(pcm), int(round((end_time - current_time) * SAMPLE_RATE)))
+            yield {
+                "audio": pcm[:cut],
+                "start_time": current_time,
+                "end_time": end_time,
+                "chunk_index": chunk_index
+            }
+            ring.consume(cut)
+            current_time = end_time
+            chunk_index += 1
+    finally:
+        proc = FFMPEG_PROCESSES.pop(session_id, None)
+        if proc:
+            try:
+                proc.terminate()
+            except Exception as e:
+                logger.warning(f"Error stopping FFmpeg for session {session_id}: {e}")
+        ring.close()
+        reader.join(timeout=5)
+        logger.info(f"🎧 Live recording stopped for session {session_id}.")
+
+def chunk_audiostream_by_silence(session_id: str):
+    global FFMPEG_PROCESSES
+    mic_device = _get_mic_device()
     record_file = os.path.join(CHUNKS_DIR, f"live_input_{session_id}.wav")
     process = subprocess.Popen(
         [
@@ -139,7 +312,6 @@ def chunk_audiostream_by_silence(session_id: str):
     FFMPEG_PROCESSES[session_id] = process
     logger.info(f"🎙️ Recording from {mic_device} (session={session_id}) ... use /stop-mic to stop.")
     current_time, chunk_index = 0.0, 0
-    MAX_DURATION = 45 * 60
     try:
         while True:
             if current_time >= MAX_DURATION:
@@ -197,6 +369,9 @@ def chunk_audiostream_by_silence(session_id: str):
 
 def chunk_by_silence(input, session_id: str):
     if input.source_type == AudioSource.MICROPHONE:
-        yield from chunk_audiostream_by_silence(session_id)
+        if LIVE_CAPTURE_MODE == "pipe":
+            yield from stream_audiostream_by_silence(session_id)
+        else:
+            yield from chunk_audiostream_by_silence(session_id)
     else:
         yield from chunk_audio_by_silence(input.audio_filename)
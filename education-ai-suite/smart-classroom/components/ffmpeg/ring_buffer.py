@@ -0,0 +1,83 @@
+import threading
+import numpy as np
+
+
+class PcmRingBuffer:
+    """
+    Bounded single-producer / single-consumer ring buffer of float32 PCM samples.
+
+    The producer blocks while the buffer is full, so memory stays fixed no matter
+    how long the capture runs. close() marks end of stream (or aborts the producer).
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._capacity = capacity
+        self._start = 0
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def available(self) -> int:
+        with self._cond:
+            return self._size
+
+    def write(self, samples) -> int:
+        """Appends samples, blocking while full. Returns the number of samples written."""
+        written = 0
+        with self._cond:
+            while written < len(samples):
+                while self._size == self._capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    break
+
+                n = min(len(samples) - written, self._capacity - self._size)
+                tail = (self._start + self._size) % self._capacity
+                first = min(n, self._capacity - tail)
+                self._buf[tail:tail + first] = samples[written:written + first]
+                self._buf[:n - first] = samples[written + first:written + n]
+
+                self._size += n
+                written += n
+                self._cond.notify_all()
+        return written
+
+    def wait_for(self, n: int, timeout: float = None) -> int:
+        """Blocks until at least n samples are buffered or the stream is closed."""
+        n = min(n, self._capacity)
+        with self._cond:
+            self._cond.wait_for(lambda: self._size >= n or self._closed, timeout=timeout)
+            return self._size
+
+    def peek(self, n: int) -> np.ndarray:
+        """Returns a contiguous copy of up to n of the oldest buffered samples."""
+        with self._cond:
+            n = min(n, self._size)
+            first = min(n, self._capacity - self._start)
+            out = np.empty(n, dtype=np.float32)
+            out[:first] = self._buf[self._start:self._start + first]
+            out[first:] = self._buf[:n - first]
+            return out
+
+    def consume(self, n: int):
+        """Drops the n oldest samples, freeing space for the producer."""
+        with self._cond:
+            n = min(n, self._size)
+            self._start = (self._start + n) % self._capacity
+            self._size -= n
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
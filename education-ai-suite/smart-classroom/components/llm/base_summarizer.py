@@ -2,5 +2,5 @@ class BaseSummarizer:
     def __init__(self, model_name=..., device="CPU", revision=None):
        raise NotImplementedError
 
-    def generate(self, prompt: str) -> str:
+    def generate(self, prompt: str, max_new_tokens=None) -> str:
         raise NotImplementedError
\ No newline at end of file
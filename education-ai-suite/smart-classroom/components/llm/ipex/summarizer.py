@@ -1,12 +1,15 @@
 from components.llm.base_summarizer import BaseSummarizer
 import torch
 import threading
-from utils.locks import audio_pipeline_lock
 from utils.config_loader import config
 from utils import ensure_model
 from transformers import TextIteratorStreamer
+from utils.prefix_cache import PromptPrefixCache
+from utils.detokenizer import StreamingDetokenizer
+import copy
 import logging
 import os
+import time
 logger = logging.getLogger(__name__)
 try:
     from ipex_llm.transformers import AutoModelForCausalLM
@@ -16,6 +19,40 @@ except ImportError as e:
         raise e
     AutoModelForCausalLM = None
 
+class CountingTextIteratorStreamer(TextIteratorStreamer):
+    """TextIteratorStreamer that counts generated tokens and detokenizes incrementally."""
+
+    def __init__(self, tokenizer, skip_special_tokens=True, skip_prompt=True):
+        super().__init__(tokenizer, skip_special_tokens=skip_special_tokens, skip_prompt=skip_prompt)
+        self._detokenizer = StreamingDetokenizer(tokenizer, skip_special_tokens)
+        self.total_tokens = 0
+        self.first_token_time = None
+        self.prefill_time = None
+        self.prefix_cache_enabled = False
+        self.prefix_cache_hit = None
+        self.cached_prefix_tokens = 0
+
+    def put(self, value):
+        if len(value.shape) > 1:
+            if value.shape[0] > 1:
+                raise ValueError("CountingTextIteratorStreamer only supports batch size 1")
+            value = value[0]
+
+        if self.skip_prompt and self.next_tokens_are_prompt:
+            self.next_tokens_are_prompt = False
+            return
+
+        if self.first_token_time is None:
+            self.first_token_time = time.perf_counter()
+        self.total_tokens += len(value)
+
+        text = self._detokenizer.put(value.tolist())
+        if text:
+            self.on_finalized_text(text)
+
+    def end(self):
+        self.on_finalized_text(self._detokenizer.flush(), stream_end=True)
+
 class Summarizer(BaseSummarizer):
     def __init__(self, model_name, device="xpu", temperature=0.7):
         if config.models.summarizer.model_hub is not None:
@@ -77,14 +114,21 @@ class Summarizer(BaseSummarizer):
         self.model = self.model.eval().to(self.device)
 
         self.temperature = temperature
+        # Sessions are scheduled per device by utils.job_scheduler; this only guards the shared model
+        self._generate_lock = threading.Lock()
 
         self.tokenizer = AutoTokenizer.from_pretrained(
             model_name,
             trust_remote_code=True
         )
 
-    def generate(self, prompt: str, stream: bool = True):
-        max_new_tokens = config.models.summarizer.max_new_tokens or 1024
+        # KV caches of recently prefilled prompts, reused for prompts sharing their prefix
+        # (fixed system prompts, a transcript summarized again)
+        prefix_config = config.models.summarizer.prefix_cache
+        self.prefix_cache = PromptPrefixCache(prefix_config.max_entries, prefix_config.min_prefix_tokens) if prefix_config.enabled else None
+
+    def generate(self, prompt: str, stream: bool = True, max_new_tokens=None):
+        max_new_tokens = max_new_tokens or config.models.summarizer.max_new_tokens or 1024
 
         with torch.inference_mode():
             model_inputs = self.tokenizer(prompt, return_tensors="pt").to(self.device)
@@ -108,33 +152,59 @@ class Summarizer(BaseSummarizer):
                     logger.error(f"Error during generation: {e}")
                     return None
             else:
-                class CountingTextIteratorStreamer(TextIteratorStreamer):
-                    def __init__(self, tokenizer, skip_special_tokens=True, skip_prompt=True):
-                        super().__init__(tokenizer, skip_special_tokens=skip_special_tokens, skip_prompt=skip_prompt)
-                        self.total_tokens = 0
-
-                    def put(self, value):
-                        self.total_tokens += 1
-                        super().put(value)
-
                 streamer = CountingTextIteratorStreamer(self.tokenizer, skip_special_tokens=True, skip_prompt=True)
 
+                prompt_ids, past_key_values = None, None
+                if self.prefix_cache is not None:
+                    streamer.prefix_cache_enabled = True
+                    prompt_ids = model_inputs.input_ids[0].tolist()
+                    cached_tokens, cached_kv = self.prefix_cache.match(prompt_ids)
+                    if cached_kv is not None and hasattr(cached_kv, "crop"):
+                        # generate() needs at least one uncached token to produce logits from
+                        cached_tokens = min(cached_tokens, len(prompt_ids) - 1)
+                        past_key_values = copy.deepcopy(cached_kv)
+                        past_key_values.crop(cached_tokens)
+                    else:
+                        cached_tokens = 0
+                    streamer.prefix_cache_hit = cached_tokens > 0
+                    streamer.cached_prefix_tokens = cached_tokens
+
                 def run_generation():
                     try:
-                        audio_pipeline_lock.acquire()
+                        self._generate_lock.acquire()
                         gen_kwargs = dict(
                             input_ids=model_inputs.input_ids,
                             max_new_tokens=max_new_tokens,
                             temperature=self.temperature,
                             streamer=streamer
                         )
+                        if prompt_ids is not None:
+                            gen_kwargs["return_dict_in_generate"] = True
 
                         torch.xpu.empty_cache()
                         torch.xpu.synchronize()
 
-                        self.model.generate(**gen_kwargs)
+                        start = time.perf_counter()
+                        try:
+                            output = self.model.generate(**gen_kwargs, past_key_values=past_key_values) if past_key_values is not None else self.model.generate(**gen_kwargs)
+                        except Exception as e:
+                            if past_key_values is None or streamer.total_tokens > 0:
+                                raise
+                            logger.warning(f"Generation with cached prefix failed, retrying without it: {e}")
+                            self.prefix_cache.clear()
+                            streamer.prefix_cache_hit, streamer.cached_prefix_tokens = False, 0
+                            streamer.total_tokens = 0
+                            streamer.next_tokens_are_prompt = True
+                            output = self.model.generate(**gen_kwargs)
+
+                        if streamer.first_token_time is not None:
+                            streamer.prefill_time = streamer.first_token_time - start
+                        kv = getattr(output, "past_key_values", None)
+                        if prompt_ids is not None and kv is not None and hasattr(kv, "crop"):
+                            kv.crop(len(prompt_ids))
+                            self.prefix_cache.put(prompt_ids, kv)
                     finally:
-                        audio_pipeline_lock.release()
+                        self._generate_lock.release()
                         streamer.end()
 
                 threading.Thread(target=run_generation, daemon=True).start()
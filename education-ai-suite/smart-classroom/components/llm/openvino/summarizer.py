@@ -5,7 +5,7 @@ import logging, threading
 from utils import ensure_model
 from utils.config_loader import config
 from utils.ov_genai_util import YieldingTextStreamer
-from utils.locks import audio_pipeline_lock
+import time
 logger = logging.getLogger(__name__)
 
 class Summarizer(BaseSummarizer):
@@ -13,22 +13,60 @@ class Summarizer(BaseSummarizer):
         self.model_name = model_name
         self.device = device
         self.temperature = temperature
+        # Sessions are scheduled per device by utils.job_scheduler; this only guards the shared pipeline
+        self._generate_lock = threading.Lock()
         logger.info(f"Loading Model: model name={self.model_name}, model path={ensure_model.get_model_path()}, device={self.device}")
         self.tokenizer = AutoTokenizer.from_pretrained(ensure_model.get_model_path())
-        self.model = ov_genai.LLMPipeline(ensure_model.get_model_path(), device=device)
 
-    def generate(self, prompt):
+        pipeline_kwargs = {}
+        draft_config = config.models.summarizer.draft_model
+        self.num_assistant_tokens = None
+        if draft_config.enabled:
+            # Assisted generation: the draft model proposes num_assistant_tokens per step, the main model verifies them in one pass
+            draft_device = draft_config.device or device
+            logger.info(f"Loading Draft Model: model name={draft_config.name}, model path={ensure_model.get_draft_model_path()}, device={draft_device}")
+            pipeline_kwargs["draft_model"] = ov_genai.draft_model(ensure_model.get_draft_model_path(), draft_device)
+            self.num_assistant_tokens = draft_config.num_assistant_tokens
+
+        prefix_config = config.models.summarizer.prefix_cache
+        self.prefix_caching = prefix_config.enabled
+        if self.prefix_caching:
+            # KV blocks of shared prompt prefixes (system prompts, repeated transcripts) are kept
+            # by the paged-attention scheduler and reused instead of being prefilled again
+            scheduler_config = ov_genai.SchedulerConfig()
+            scheduler_config.enable_prefix_caching = True
+            scheduler_config.cache_size = prefix_config.cache_size_gb
+            self.model = ov_genai.LLMPipeline(ensure_model.get_model_path(), device=device, scheduler_config=scheduler_config, **pipeline_kwargs)
+        else:
+            self.model = ov_genai.LLMPipeline(ensure_model.get_model_path(), device=device, **pipeline_kwargs)
+
+    def generate(self, prompt, max_new_tokens=None):
         streamer = YieldingTextStreamer(self.tokenizer)
+        # The scheduler does not report how much of the prompt it reused, only the prefill time shows it
+        streamer.prefix_cache_enabled = self.prefix_caching
+
+        generation_kwargs = {}
+        if self.num_assistant_tokens:
+            generation_kwargs["num_assistant_tokens"] = self.num_assistant_tokens
 
         def run_generation():
             try:
-                audio_pipeline_lock.acquire()
-                self.model.generate(
+                self._generate_lock.acquire()
+                start = time.perf_counter()
+                result = self.model.generate(
                     prompt,
                     streamer=streamer,
-                    max_new_tokens=config.models.summarizer.max_new_tokens,
+                    max_new_tokens=max_new_tokens or config.models.summarizer.max_new_tokens,
                     temperature=self.temperature,
+                    **generation_kwargs,
                 )
+                perf_metrics = getattr(result, "perf_metrics", None)
+                if perf_metrics is not None:
+                    streamer.prefill_time = perf_metrics.get_ttft().mean / 1000
+                elif streamer.first_token_time is not None:
+                    streamer.prefill_time = streamer.first_token_time - start
+                if self.num_assistant_tokens:
+                    self._record_draft_acceptance(result, streamer)
                 
             except Exception as e:
                 error_msg = "Summary generation failed. Please ensure sufficient free resources are available to run this process."
@@ -37,8 +75,17 @@ class Summarizer(BaseSummarizer):
                     error_msg = "Summary generation failed. Insufficient GPU resources available to run this process."
                 streamer._queue.put(f"[ERROR]: {error_msg}")
             finally:
-                audio_pipeline_lock.release()
+                self._generate_lock.release()
                 streamer.end()
 
         threading.Thread(target=run_generation, daemon=True).start()
         return streamer
+
+    @staticmethod
+    def _record_draft_acceptance(result, streamer):
+        # Speculative decoding reports per-model metrics: tokens proposed by the draft model vs. accepted by the main model
+        sd_metrics = getattr(result, "extended_perf_metrics", None)
+        if sd_metrics is None or not hasattr(sd_metrics, "get_num_accepted_tokens"):
+            return
+        streamer.draft_tokens = sd_metrics.draft_model_metrics.get_num_generated_tokens()
+        streamer.accepted_draft_tokens = sd_metrics.get_num_accepted_tokens()
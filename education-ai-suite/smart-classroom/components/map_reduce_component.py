@@ -0,0 +1,191 @@
+from components.base_component import PipelineComponent
+from utils.runtime_config_loader import RuntimeConfig
+from utils.config_loader import config
+from utils.storage_manager import StorageManager
+from utils.job_scheduler import job_scheduler, SchedulerFullError
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging, os, re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAX_CHARS = config.models.summarizer.map_reduce.segment_max_chars
+MAP_WORKERS = max(1, config.models.summarizer.map_reduce.map_workers or 1)
+
+# One background worker per process for summaries started while transcription is running
+_incremental_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="incremental-map")
+
+
+def _split(texts, max_chars):
+    # Returns (complete_segments, open_texts, number of texts that went into complete segments)
+    segments, current, size, consumed = [], [], 0, 0
+    for index, text in enumerate(texts):
+        text = (text or "").strip()
+        if not text:
+            continue
+        if current and size + len(text) > max_chars:
+            segments.append(" ".join(current))
+            current, size, consumed = [], 0, index
+        current.append(text)
+        size += len(text) + 1
+    if not current:
+        consumed = len(texts)
+    return segments, current, consumed
+
+
+def split_segments(texts, max_chars=SEGMENT_MAX_CHARS):
+    """
+    Greedily groups consecutive ASR chunk texts into segments of at most `max_chars`
+    (a single oversized chunk forms its own segment). Returns (complete_segments, open_segment):
+    the open segment may still grow while transcription is running.
+    """
+    segments, current, _ = _split(texts, max_chars)
+    return segments, (" ".join(current) if current else None)
+
+
+class MapReduceSummarizerComponent(PipelineComponent):
+    """
+    Hierarchical summarization for long transcripts: summarize segments (map), then stream a
+    final summary over the segment summaries (reduce) through the regular SummarizerComponent.
+    Segment summaries are cached on disk keyed by a hash of their text and prompt configuration.
+    """
+
+    def __init__(self, session_id, summarizer_component):
+        self.session_id = session_id
+        self.summarizer_component = summarizer_component
+        self.model = summarizer_component.summarizer
+
+        project_config = RuntimeConfig.get_section("Project")
+        self.project_path = os.path.join(project_config.get("location"), project_config.get("name"), self.session_id)
+        self.cache_dir = os.path.join(project_config.get("location"), project_config.get("name"), "summary_cache")
+        self._ready_cursor = 0  # texts before this index are in segments already queued by summarize_ready_segments
+
+    def _get_map_message(self, segment):
+        lang_prompt = vars(config.models.summarizer.map_reduce.map_prompt)
+        return [
+            {"role": "system", "content": f"{lang_prompt.get(config.models.summarizer.language)}"},
+            {"role": "user", "content": f"{segment}"}
+        ]
+
+    def _cache_key(self, segment):
+        lang_prompt = vars(config.models.summarizer.map_reduce.map_prompt)
+        key = "\n".join([
+            self.summarizer_component.model_name,
+            config.models.summarizer.language,
+            str(lang_prompt.get(config.models.summarizer.language)),
+            segment
+        ])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, segment):
+        return os.path.join(self.cache_dir, f"{self._cache_key(segment)}.md")
+
+    def _read_cache(self, segment):
+        path = self._cache_path(segment)
+        if os.path.exists(path):
+            return StorageManager.read_text_file(path)
+        return None
+
+    def _write_cache(self, segment, summary):
+        path = self._cache_path(segment)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        StorageManager.save(tmp_path, summary, append=False)
+        os.replace(tmp_path, path)
+
+    def _summarize_segment(self, segment):
+        cached = self._read_cache(segment)
+        if cached is not None:
+            return cached, True
+
+        prompt = self.model.tokenizer.apply_chat_template(self._get_map_message(segment), tokenize=False, add_generation_prompt=True)
+        summary = ""
+        for token in self.model.generate(prompt):
+            if token.startswith("[ERROR]:"):
+                raise RuntimeError(token)
+            summary += token
+        summary = summary.strip()
+        self._write_cache(segment, summary)
+        return summary, False
+
+    def load_chunk_texts(self):
+        """Chunk texts in order from transcription_chunks.jsonl, falling back to sentences of transcription.txt."""
+        chunks_path = os.path.join(self.project_path, "transcription_chunks.jsonl")
+        StorageManager.flush(chunks_path)
+        if os.path.exists(chunks_path):
+            with open(chunks_path, "r", encoding="utf-8") as f:
+                chunks = [json.loads(line) for line in f if line.strip()]
+            if chunks:
+                return [c.get("text") for c in sorted(chunks, key=lambda c: c["chunk_index"])]
+
+        transcript = StorageManager.read_text_file(os.path.join(self.project_path, "transcription.txt"))
+        return re.split(r"(?<=[.!?。！？])\s*", transcript or "")
+
+    def summarize_ready_segments(self, texts):
+        """
+        Queues map summaries for segments that can no longer change, so they are cached by the
+        time the final summary is requested. Safe to call after every transcribed chunk: only the
+        texts after the last complete segment are looked at, and each segment is queued once.
+        """
+        segments, _, consumed = _split(texts[self._ready_cursor:], SEGMENT_MAX_CHARS)
+        self._ready_cursor += consumed
+        pending = [s for s in segments if not os.path.exists(self._cache_path(s))]
+        if pending:
+            _incremental_executor.submit(self._map_quietly, pending)
+
+    def _map_quietly(self, segments):
+        # Background job of the session on the summarizer device, so it waits while that device
+        # runs live transcription or interactive jobs instead of competing with them
+        try:
+            job = job_scheduler.submit(self.session_id, "summary_map", config.models.summarizer.device, ordered=False)
+        except SchedulerFullError as e:
+            logger.info(f"Skipping incremental segment summaries, they will run on /summarize: {e}")
+            return
+        try:
+            job_scheduler.wait(job)
+            for segment in segments:
+                self._summarize_segment(segment)
+        except Exception as e:
+            logger.warning(f"Incremental segment summary failed, it will be retried on /summarize: {e}")
+        finally:
+            job_scheduler.finish(job)
+
+    def process(self, texts):
+        segments, open_segment = split_segments(texts)
+        if open_segment:
+            segments.append(open_segment)
+
+        if len(segments) <= 1:
+            # Short transcript: a single pass is cheaper than map + reduce
+            yield from self.summarizer_component.process(segments[0] if segments else "")
+            return
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=MAP_WORKERS, thread_name_prefix="summary-map") as executor:
+                results = list(executor.map(self._summarize_segment, segments))
+        except Exception as e:
+            logger.error(f"Map step of the summary failed: {e}")
+            message = str(e)
+            yield message if message.startswith("[ERROR]:") else f"[ERROR]: Summary generation failed. {message}"
+            return
+        map_time = time.perf_counter() - start
+        cache_hits = sum(1 for _, hit in results if hit)
+        logger.info(f"Map step: {len(segments)} segments, {cache_hits} from cache, {map_time:.2f}s")
+
+        project_config = RuntimeConfig.get_section("Project")
+        StorageManager.record_metrics(
+            project_config.get("location"),
+            project_config.get("name"),
+            self.session_id,
+            {
+                "performance.map_segments": len(segments),
+                "performance.map_cache_hits": cache_hits,
+                "performance.map_time": round(map_time, 4),
+            }
+        )
+
+        reduce_input = "\n\n".join(summary for summary, _ in results if summary)
+        yield from self.summarizer_component.process(reduce_input)
@@ -2,6 +2,7 @@ from components.base_component import PipelineComponent
 from utils.runtime_config_loader import RuntimeConfig
 from utils.config_loader import config
 from utils.storage_manager import StorageManager
+from utils.generation_metrics import prefix_cache_metrics, speculative_metrics
 import logging, os
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,17 @@ class MindmapComponent(PipelineComponent):
             mindmap_streamer = self.model.generate(mindmap_prompt)
             full_mindmap = "".join(token for token in mindmap_streamer)
             StorageManager.save(mindmap_path, full_mindmap, append=False)
+            generation_metrics = {
+                **prefix_cache_metrics(mindmap_streamer, "mindmap"),
+                **speculative_metrics(mindmap_streamer, "mindmap"),
+            }
+            if generation_metrics:
+                StorageManager.record_metrics(
+                    project_config.get("location"),
+                    project_config.get("name"),
+                    self.session_id,
+                    generation_metrics
+                )
             logger.info("Mindmap generation completed successfully.")
             return full_mindmap
 
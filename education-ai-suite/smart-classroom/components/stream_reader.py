@@ -12,4 +12,4 @@ class AudioStreamReader(PipelineComponent):
             input = input_data["input"]
            
             for chunk in chunk_by_silence(input,self.session_id):
-                yield chunk  # contains chunk_path, start_time, end_time, etc.
\ No newline at end of file
+                yield chunk  # contains audio (or chunk_path), start_time, end_time, etc.
\ No newline at end of file
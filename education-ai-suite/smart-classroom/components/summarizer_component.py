@@ -1,44 +1,55 @@
 from components.base_component import PipelineComponent
-from components.llm.openvino.summarizer import Summarizer as OvSummarizer
-from components.llm.ipex.summarizer import Summarizer as IpexSummarizer
 from utils.runtime_config_loader import RuntimeConfig
 from utils.config_loader import config
 from utils.storage_manager import StorageManager
+from utils.generation_metrics import prefix_cache_metrics, speculative_metrics
 import logging, os
 import time
+import threading
 
 logger = logging.getLogger(__name__)
 
 class SummarizerComponent(PipelineComponent):
     _model = None
     _config = None
+    _load_lock = threading.Lock()
+    # Imported on first load only; see utils/preload_models.py for the timed startup import
+    PROVIDER_MODULES = {
+        "openvino": "components.llm.openvino.summarizer",
+        "ipex": "components.llm.ipex.summarizer",
+    }
+
+    @staticmethod
+    def _load_model(provider, model_name, device, temperature):
+        # Provider modules pull in openvino_genai / torch / ipex_llm, so only the configured one is imported
+        if provider == "openvino":
+            from components.llm.openvino.summarizer import Summarizer as OvSummarizer
+            return OvSummarizer(
+                model_name=model_name,
+                device=device,
+                temperature=temperature,
+                revision=None
+            )
+        elif provider == "ipex":
+            from components.llm.ipex.summarizer import Summarizer as IpexSummarizer
+            return IpexSummarizer(
+                model_name=model_name,
+                device=device.lower(),
+                temperature=temperature
+            )
+        raise ValueError(f"Unsupported summarizer provider: {provider}")
 
     def __init__(self, session_id, provider, model_name, device, temperature=0.7):
         self.session_id = session_id
         provider = provider.lower()
         config = (provider, model_name, device) 
 
-        # Reload only if config changed
-        if SummarizerComponent._model is None or SummarizerComponent._config != config:
-            if provider == "openvino":
-                SummarizerComponent._model = OvSummarizer(
-                    model_name=model_name,
-                    device=device,
-                    temperature=temperature,
-                    revision=None
-                )
-            elif provider == "ipex":
-                SummarizerComponent._model = IpexSummarizer(
-                    model_name=model_name,
-                    device=device.lower(),
-                    temperature=temperature
-                )
-            else:
-                raise ValueError(f"Unsupported summarizer provider: {provider}")
-
-            SummarizerComponent._config = config
-
-        self.summarizer = SummarizerComponent._model
+        # Reload only if config changed; requests arriving during startup preload wait for it
+        with SummarizerComponent._load_lock:
+            if SummarizerComponent._model is None or SummarizerComponent._config != config:
+                SummarizerComponent._model = SummarizerComponent._load_model(provider, model_name, device, temperature)
+                SummarizerComponent._config = config
+            self.summarizer = SummarizerComponent._model
         self.model_name = model_name
         self.provider = provider
 
@@ -52,6 +63,12 @@ class SummarizerComponent(PipelineComponent):
                 {"role": "user", "content": f"{input}"}
             ]
     
+    def _draft_model_name(self):
+        num_assistant_tokens = getattr(self.summarizer, "num_assistant_tokens", None)
+        if not num_assistant_tokens:
+            return "--"
+        return f"{config.models.summarizer.draft_model.name} (assistant tokens: {num_assistant_tokens})"
+
     def process(self, input):
         project_config = RuntimeConfig.get_section("Project")
         project_path = os.path.join(project_config.get("location"), project_config.get("name"), self.session_id)
@@ -71,12 +88,13 @@ class SummarizerComponent(PipelineComponent):
                 yield token
         finally:
             end = time.perf_counter()
+            StorageManager.close(os.path.join(project_path, "summary.md"))
             total_tokens = streamer.total_tokens if streamer is not None else -1
             summarization_time = end - start
             ttft = (first_token_time - start) if first_token_time else -1
             tps = (total_tokens / summarization_time) if summarization_time > 0 else -1
 
-            # Get performance metrics and configurations from CSV using StorageManager helper
+            # Get performance metrics and configurations using StorageManager helper
             performance_data = StorageManager.read_performance_metrics(
                 project_config.get("location"),
                 project_config.get("name"),
@@ -88,16 +106,22 @@ class SummarizerComponent(PipelineComponent):
             end_to_end_time = asr_transcription_time + summarization_time
 
 
-            # Update CSV with new summarization performance data
-            StorageManager.update_csv(
-                path=os.path.join(project_path, "performance_metrics.csv"),
-                new_data={
+            # Record summarization performance data in the session metrics store
+            StorageManager.record_metrics(
+                project_config.get("location"),
+                project_config.get("name"),
+                self.session_id,
+                {
                     "configuration.summarizer_model": f"{self.provider}/{self.model_name}",
+                    "configuration.summarizer_draft_model": self._draft_model_name(),
                     "performance.summarizer_time": round(summarization_time, 4),
                     "performance.ttft": f"{round(ttft, 4)}s",
+                    "performance.ttft_sec": round(ttft, 4),
                     "performance.tps": round(tps, 4),
                     "performance.total_tokens": total_tokens,
                     "performance.end_to_end_time": f"{round(end_to_end_time, 4)}s",
+                    **prefix_cache_metrics(streamer, "summary"),
+                    **speculative_metrics(streamer, "summary"),
                 }
             )
             
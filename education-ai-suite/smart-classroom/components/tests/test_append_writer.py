@@ -0,0 +1,45 @@
+import unittest
+import tempfile
+import threading
+import os
+from utils.append_writer import AppendWriterService
+
+class TestAppendWriterService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session", "summary.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_writes_are_buffered_until_close(self):
+        writer = AppendWriterService(flush_bytes=1 << 20, flush_interval=60)
+        for token in ["Hello", " ", "world"]:
+            writer.write(self.path, token)
+        self.assertFalse(os.path.exists(self.path))
+        writer.close(self.path)
+        self.assertEqual(self._read(), "Hello world")
+
+    def test_size_triggered_flush(self):
+        writer = AppendWriterService(flush_bytes=8, flush_interval=60)
+        writer.write(self.path, "0123456789")
+        for _ in range(50):
+            if os.path.exists(self.path):
+                break
+            threading.Event().wait(0.02)
+        self.assertEqual(self._read(), "0123456789")
+
+    def test_order_is_preserved_across_flushes(self):
+        writer = AppendWriterService(flush_bytes=16, flush_interval=0.01)
+        tokens = [f"{i}," for i in range(1000)]
+        for token in tokens:
+            writer.write(self.path, token)
+        writer.close(self.path)
+        self.assertEqual(self._read(), "".join(tokens))
+
+if __name__ == "__main__":
+    unittest.main()
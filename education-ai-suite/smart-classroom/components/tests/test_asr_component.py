@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from components import asr_component
+from components.asr_component import ASRComponent
+
+def chunks(count):
+    for i in range(count):
+        yield {"chunk_index": i, "chunk_path": f"chunk_{i}.wav"}
+
+def slow_consumer_get(q, stop_event, _get=asr_component._get):
+    # Lets the stages fill the prepared queue before the consumer takes each batch
+    if threading.current_thread() is threading.main_thread():
+        time.sleep(0.3)
+    return _get(q, stop_event)
+
+class TestPipelinedBatches(unittest.TestCase):
+    def make_component(self, prepare, batch_size):
+        component = ASRComponent.__new__(ASRComponent)
+        component.session_id = "s1"
+        component.batch_size = batch_size
+        component.cache = None
+        component.asr = SimpleNamespace(prepare=prepare, supports_array_input=False)
+        return component
+
+    def test_batches_keep_chunk_order(self):
+        component = self.make_component(lambda path: path, batch_size=2)
+        with mock.patch.object(asr_component, "_get", side_effect=slow_consumer_get):
+            batches = list(component._pipelined_batches(chunks(5)))
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual([data["chunk_index"] for batch in batches for data, _ in batch], list(range(5)))
+
+    def test_prepare_error_behind_a_batch_is_raised(self):
+        def prepare(path):
+            if path == "chunk_1.wav":
+                raise RuntimeError("prepare failed")
+            return path
+
+        component = self.make_component(prepare, batch_size=2)
+        seen = []
+        with mock.patch.object(asr_component, "QUEUE_SIZE", 4), \
+                mock.patch.object(asr_component, "_get", side_effect=slow_consumer_get):
+            with self.assertRaisesRegex(RuntimeError, "prepare failed"):
+                for batch in component._pipelined_batches(chunks(4)):
+                    seen.extend(data["chunk_index"] for data, _ in batch)
+        self.assertEqual(seen, [0])
+
+if __name__ == "__main__":
+    unittest.main()
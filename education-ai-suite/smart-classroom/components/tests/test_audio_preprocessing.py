@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from components.ffmpeg.audio_preprocessing import (
+    SAMPLE_RATE, detect_silences_pcm, get_closest_silence, write_chunk_wav
+)
+from components.ffmpeg.ring_buffer import PcmRingBuffer
+import threading
+import wave
+import os
+
+def _tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+class TestAudioPreprocessing(unittest.TestCase):
+    def test_detect_silences_pcm(self):
+        audio = np.concatenate([_tone(2), _silence(1), _tone(2), _silence(0.1), _tone(1)])
+        silences = detect_silences_pcm(audio)
+        # Only the 1s gap is longer than the configured minimum silence duration
+        self.assertEqual(len(silences), 1)
+        self.assertAlmostEqual(silences[0]["start"], 2.0, delta=0.02)
+        self.assertAlmostEqual(silences[0]["end"], 3.0, delta=0.02)
+        self.assertEqual(get_closest_silence(silences, 2.5), 2.5)
+
+    def test_detect_silences_pcm_offset(self):
+        audio = np.concatenate([_tone(1), _silence(1)])
+        silences = detect_silences_pcm(audio, offset=10.0)
+        self.assertAlmostEqual(silences[0]["start"], 11.0, delta=0.02)
+
+    def test_write_chunk_wav(self):
+        path = write_chunk_wav(_tone(1), chunk_index=0)
+        try:
+            with wave.open(path, "rb") as f:
+                self.assertEqual(f.getframerate(), SAMPLE_RATE)
+                self.assertEqual(f.getnchannels(), 1)
+                self.assertEqual(f.getnframes(), SAMPLE_RATE)
+        finally:
+            os.remove(path)
+
+class TestPcmRingBuffer(unittest.TestCase):
+    def test_wraparound(self):
+        ring = PcmRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.float32))
+        ring.consume(4)
+        ring.write(np.arange(6, 12, dtype=np.float32))
+        self.assertEqual(ring.available(), 8)
+        np.testing.assert_array_equal(ring.peek(8), np.arange(4, 12, dtype=np.float32))
+
+    def test_blocking_writer_drains_after_close(self):
+        ring = PcmRingBuffer(4)
+        samples = np.arange(10, dtype=np.float32)
+        writer = threading.Thread(target=lambda: (ring.write(samples), ring.close()))
+        writer.start()
+        received = []
+        while ring.wait_for(4, timeout=1) > 0:
+            chunk = ring.peek(4)
+            received.extend(chunk.tolist())
+            ring.consume(len(chunk))
+        writer.join(timeout=1)
+        self.assertEqual(received, samples.tolist())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from utils.audio_util import save_audio_file
+
+
+def upload(name, data):
+    return SimpleNamespace(filename=name, file=io.BytesIO(data))
+
+
+class TestSaveAudioFile(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        patcher = patch("utils.audio_util.RuntimeConfig.get_section", return_value={"location": self.dir.name, "name": "p"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.dir.cleanup)
+        self.audio_dir = os.path.join(self.dir.name, "p", "audio")
+
+    def test_streams_file_and_detects_duplicates(self):
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        name, path, sha, duplicate = save_audio_file(upload("lecture.wav", data))
+        self.assertFalse(duplicate)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+        name2, path2, sha2, duplicate2 = save_audio_file(upload("lecture_copy.wav", data))
+        self.assertTrue(duplicate2)
+        self.assertEqual((name2, path2, sha2), (name, path, sha))
+        self.assertFalse(os.path.exists(os.path.join(self.audio_dir, "lecture_copy.wav")))
+        self.assertFalse([f for f in os.listdir(self.audio_dir) if f.endswith(".part")])
+
+    def test_too_large_upload_leaves_nothing_behind(self):
+        with patch("utils.audio_util.config.audio_util.max_size_mb", 1):
+            with self.assertRaises(HTTPException):
+                save_audio_file(upload("big.wav", b"x" * (2 * 1024 * 1024)))
+        self.assertEqual([f for f in os.listdir(self.audio_dir) if not f.endswith(".json")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
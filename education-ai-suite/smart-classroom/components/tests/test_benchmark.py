@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from evaluation import benchmark
+from evaluation.benchmark import DEFAULT_MATRIX, aggregate, compare_reports, expand_cases, resolve_fixtures
+
+
+def report(*cases):
+    return {"results": [{"id": case_id, "metrics": metrics} for case_id, metrics in cases]}
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_expand_cases_is_stable(self):
+        matrix = {
+            "asr": {"models": [{"provider": "openvino", "name": "whisper-tiny", "device": "CPU"}],
+                    "audio_lengths_sec": [30, 120], "chunk_durations_sec": [15]},
+            "summarizer": {"models": [{"provider": "openvino", "name": "tiny-llm", "device": "CPU"}],
+                           "weight_formats": ["int4"], "prompt_tokens": [512], "max_new_tokens": 16},
+        }
+        ids = [case["id"] for case in expand_cases(matrix)]
+        self.assertEqual(ids, [
+            "asr/openvino/whisper-tiny/CPU/audio=30s/chunk=15s",
+            "asr/openvino/whisper-tiny/CPU/audio=120s/chunk=15s",
+            "summarizer/openvino/tiny-llm/int4/CPU/prompt=512",
+        ])
+
+    def test_draft_model_cases_get_their_own_id(self):
+        draft = {"name": "tiny-draft", "weight_format": "int4", "num_assistant_tokens": 5}
+        matrix = {
+            "summarizer": {"models": [{"provider": "openvino", "name": "tiny-llm", "device": "CPU"},
+                                      {"provider": "openvino", "name": "tiny-llm", "device": "CPU", "draft_model": draft}],
+                           "weight_formats": ["int8"], "prompt_tokens": [512]},
+        }
+        cases = expand_cases(matrix)
+        self.assertEqual([case["id"] for case in cases], [
+            "summarizer/openvino/tiny-llm/int8/CPU/prompt=512",
+            "summarizer/openvino/tiny-llm/int8/CPU/prompt=512/draft=tiny-draft:int4:k=5",
+        ])
+        self.assertEqual(cases[1]["draft_model"], draft)
+
+    def test_aggregate_uses_median_of_successful_runs(self):
+        runs = [{"rtf": 0.3}, {"rtf": 0.1}, {"error": "boom"}, {"rtf": 0.2}]
+        self.assertEqual(aggregate(runs), {"rtf": 0.2})
+        self.assertEqual(aggregate([{"error": "boom"}]), {"error": "boom"})
+
+    def test_compare_flags_regressions_by_direction(self):
+        baseline = report(("a", {"rtf": 0.20, "tps": 50.0}), ("gone", {"rtf": 1.0}))
+        current = report(("a", {"rtf": 0.25, "tps": 40.0}), ("b", {"rtf": 0.1}))
+        rows = compare_reports(current, baseline, {"rtf": 0.10, "tps": 0.30})
+        status = {(row[0], row[1]): row[5] for row in rows}
+        self.assertEqual(status[("a", "rtf")], "REGRESSION")
+        self.assertEqual(status[("a", "tps")], "ok")  # 20% slower, within the 30% threshold
+        self.assertEqual(status[("b", "-")], "new")
+        self.assertEqual(status[("gone", "-")], "missing")
+
+    def test_default_matrix_runs_with_bundled_fixture(self):
+        with open(DEFAULT_MATRIX, "r", encoding="utf-8") as f:
+            matrix = yaml.safe_load(f)
+        fixtures = resolve_fixtures(matrix, DEFAULT_MATRIX)
+        self.assertTrue(os.path.isfile(fixtures["audio_file"]))
+        self.assertTrue(all(case["device"] == "CPU" and "7B" not in case["id"] for case in expand_cases(matrix)))
+
+
+    def run_compare(self, current, baseline, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, data in (("report.json", current), ("baseline.json", baseline)):
+                paths.append(os.path.join(tmp, name))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+            argv = ["benchmark.py", "--compare", paths[0], "--baseline", paths[1], *args]
+            with mock.patch("sys.argv", argv), mock.patch("builtins.print"):
+                try:
+                    benchmark.main()
+                except SystemExit as e:
+                    return e.code
+        return 0
+
+    def test_failed_or_missing_cases_fail_the_check(self):
+        baseline = report(("asr/a", {"rtf": 0.2}), ("asr/b", {"rtf": 0.2}))
+        self.assertEqual(self.run_compare(report(("asr/a", {"rtf": 0.2}), ("asr/b", {"rtf": 0.2})), baseline), 0)
+        self.assertEqual(self.run_compare(report(("asr/a", {"rtf": 0.2}), ("asr/b", {"error": "load failed"})), baseline), 1)
+        self.assertEqual(self.run_compare(report(("asr/a", {"rtf": 0.2})), baseline), 1)
+        # cases outside --filter were not run, so they are not missing
+        self.assertEqual(self.run_compare(report(("asr/a", {"rtf": 0.2})), baseline, "--filter", "asr/a"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
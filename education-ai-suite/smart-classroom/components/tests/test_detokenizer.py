@@ -0,0 +1,42 @@
+import unittest
+from utils.detokenizer import StreamingDetokenizer
+
+class ByteTokenizer:
+    """Byte-level tokenizer: every token id is one UTF-8 byte, plus special token 256."""
+    def encode(self, text):
+        return list(text.encode("utf-8"))
+
+    def decode(self, tokens, skip_special_tokens=True):
+        data = bytes(t for t in tokens if t < 256)
+        return data.decode("utf-8", errors="replace")
+
+class TestStreamingDetokenizer(unittest.TestCase):
+    def _stream(self, text):
+        tokenizer = ByteTokenizer()
+        detokenizer = StreamingDetokenizer(tokenizer)
+        pieces = [detokenizer.put(t) for t in tokenizer.encode(text)]
+        pieces.append(detokenizer.flush())
+        return [p for p in pieces if p]
+
+    def test_output_matches_full_decode(self):
+        text = "The lecture covered photosynthesis, 光合作用 and the Calvin cycle.\nNext topic"
+        self.assertEqual("".join(self._stream(text)), text)
+
+    def test_never_emits_partial_multibyte_characters(self):
+        for piece in self._stream("课堂总结 ok 😀 done"):
+            self.assertNotIn("�", piece)
+
+    def test_emits_on_word_boundaries(self):
+        self.assertEqual(self._stream("hello world again"), ["hello ", "world ", "again"])
+
+    def test_cjk_is_emitted_per_character(self):
+        self.assertEqual(self._stream("你好"), ["你", "好"])
+
+    def test_special_tokens_are_skipped(self):
+        tokenizer = ByteTokenizer()
+        detokenizer = StreamingDetokenizer(tokenizer)
+        text = "".join(detokenizer.put(t) for t in tokenizer.encode("a b ") + [256]) + detokenizer.flush()
+        self.assertEqual(text, "a b ")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from types import SimpleNamespace
+
+from utils.generation_metrics import prefix_cache_metrics, speculative_metrics
+
+
+def streamer(**fields):
+    defaults = dict(total_tokens=0, first_token_time=None, last_token_time=None, draft_tokens=None, accepted_draft_tokens=0)
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+class TestSpeculativeMetrics(unittest.TestCase):
+    def test_effective_tps_counts_decode_phase_only(self):
+        metrics = speculative_metrics(streamer(total_tokens=11, first_token_time=1.0, last_token_time=3.0), "summary")
+        self.assertEqual(metrics, {"performance.summary_effective_tps": 5.0})
+
+    def test_acceptance_rate_with_draft_model(self):
+        metrics = speculative_metrics(
+            streamer(total_tokens=101, first_token_time=0.0, last_token_time=2.0, draft_tokens=120, accepted_draft_tokens=90),
+            "mindmap"
+        )
+        self.assertEqual(metrics["performance.mindmap_effective_tps"], 50.0)
+        self.assertEqual(metrics["performance.mindmap_draft_acceptance_rate"], 0.75)
+        self.assertEqual(metrics["performance.mindmap_accepted_draft_tokens"], 90)
+
+    def test_streamers_without_timing_report_nothing(self):
+        self.assertEqual(speculative_metrics(None, "summary"), {})
+        self.assertEqual(speculative_metrics(SimpleNamespace(total_tokens=3), "summary"), {})
+
+
+class TestPrefixCacheMetrics(unittest.TestCase):
+    def test_hit_with_prefill_time(self):
+        metrics = prefix_cache_metrics(
+            SimpleNamespace(prefix_cache_enabled=True, prefix_cache_hit=True, cached_prefix_tokens=64, prefill_time=0.12345), "mindmap"
+        )
+        self.assertEqual(metrics, {
+            "performance.mindmap_prefix_cache_hit": 1,
+            "performance.mindmap_cached_prefix_tokens": 64,
+            "performance.mindmap_prefill_time": 0.1235,
+        })
+
+    def test_unknown_reuse_reports_prefill_time_only(self):
+        metrics = prefix_cache_metrics(
+            SimpleNamespace(prefix_cache_enabled=True, prefix_cache_hit=None, cached_prefix_tokens=0, prefill_time=0.5), "summary"
+        )
+        self.assertEqual(metrics, {"performance.summary_prefill_time": 0.5})
+
+    def test_streamers_without_prefix_cache_report_nothing(self):
+        self.assertEqual(prefix_cache_metrics(None, "summary"), {})
+        self.assertEqual(prefix_cache_metrics(streamer(), "summary"), {})
+        self.assertEqual(prefix_cache_metrics(SimpleNamespace(prefix_cache_enabled=False, prefill_time=0.5), "summary"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import threading
+from utils.job_scheduler import JobScheduler, SchedulerFullError, RUNNING, QUEUED
+
+def make_scheduler(max_queue=8):
+    return JobScheduler(
+        priorities={"transcription": 0, "summary": 1, "mindmap": 2},
+        memory_mb={},
+        default_duration_sec={"transcription": 100, "summary": 10, "mindmap": 5},
+        max_queue=max_queue,
+    )
+
+class TestJobScheduler(unittest.TestCase):
+    def test_different_devices_run_concurrently(self):
+        scheduler = make_scheduler()
+        asr = scheduler.submit("s1", "transcription", "CPU")
+        llm = scheduler.submit("s2", "summary", "GPU.0")
+        self.assertEqual((asr.state, llm.state), (RUNNING, RUNNING))
+
+    def test_same_device_is_queued_by_priority_with_eta(self):
+        scheduler = make_scheduler()
+        running = scheduler.submit("s1", "summary", "GPU")
+        mindmap = scheduler.submit("s2", "mindmap", "GPU")
+        summary = scheduler.submit("s3", "summary", "GPU")
+        status = {j["job_id"]: j for j in scheduler.status()}
+        self.assertEqual(status[summary.id]["queue_position"], 1)
+        self.assertEqual(status[mindmap.id]["queue_position"], 2)
+        self.assertAlmostEqual(status[mindmap.id]["eta_sec"], 20, delta=1)
+
+        scheduler.finish(running)
+        self.assertEqual((summary.state, mindmap.state), (RUNNING, QUEUED))
+
+    def test_session_jobs_run_in_order(self):
+        scheduler = make_scheduler()
+        transcription = scheduler.submit("s1", "transcription", "CPU")
+        summary = scheduler.submit("s1", "summary", "GPU")
+        self.assertEqual(summary.state, QUEUED)
+        scheduler.finish(transcription)
+        self.assertEqual(summary.state, RUNNING)
+
+    def test_background_job_does_not_wait_for_its_session(self):
+        scheduler = make_scheduler()
+        transcription = scheduler.submit("s1", "transcription", "CPU")
+        background = scheduler.submit("s1", "summary_map", "GPU", ordered=False)
+        self.assertEqual(background.state, RUNNING)
+        # ...but it still waits for its device, behind interactive jobs
+        summary = scheduler.submit("s2", "summary", "GPU")
+        cpu_background = scheduler.submit("s1", "summary_map", "CPU", ordered=False)
+        self.assertEqual((summary.state, cpu_background.state), (QUEUED, QUEUED))
+        scheduler.finish(transcription)
+        self.assertEqual(cpu_background.state, RUNNING)
+
+    def test_admission_control_rejects_when_queue_full(self):
+        scheduler = make_scheduler(max_queue=1)
+        scheduler.submit("s1", "summary", "GPU")
+        scheduler.submit("s2", "summary", "GPU")
+        with self.assertRaises(SchedulerFullError):
+            scheduler.submit("s3", "summary", "GPU")
+
+    def test_wait_unblocks_when_device_frees(self):
+        scheduler = make_scheduler()
+        first = scheduler.submit("s1", "summary", "GPU")
+        second = scheduler.submit("s2", "summary", "GPU")
+        threading.Timer(0.05, scheduler.finish, args=(first,)).start()
+        self.assertTrue(scheduler.wait(second, timeout=2))
+        self.assertFalse(scheduler.wait(scheduler.submit("s3", "summary", "GPU"), timeout=0.05))
+
+if __name__ == "__main__":
+    unittest.main()
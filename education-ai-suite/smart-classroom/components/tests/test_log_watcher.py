@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from components.va.log_watcher import LogFollower, PipelineLogWatcher, PipelineState
+
+
+class TestLogFollower(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.dir.name) / "front.log"
+        self.log_file.write_text("")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def append(self, text):
+        with open(self.log_file, "a") as f:
+            f.write(text)
+
+    def test_reads_only_appended_complete_lines(self):
+        follower = LogFollower(self.log_file)
+        self.append("Setting pipeline to PAUSED ...\nRedistribute")
+        self.assertEqual(follower.read_lines(), (["Setting pipeline to PAUSED ..."], False))
+        self.append(" latency...\n")
+        self.assertEqual(follower.read_lines(), (["Redistribute latency..."], False))
+        self.assertEqual(follower.read_lines(), ([], False))
+        self.append("Freeing pipeline")
+        self.assertEqual(follower.read_lines(final=True), (["Freeing pipeline"], False))
+
+    def test_truncation_and_rotation_restart_from_beginning(self):
+        follower = LogFollower(self.log_file)
+        self.append("line one\nline two\n")
+        follower.read_lines()
+
+        self.log_file.write_text("new\n")
+        self.assertEqual(follower.read_lines(), (["new"], True))
+
+        rotated = Path(self.dir.name) / "front.log.1"
+        os.replace(self.log_file, rotated)
+        self.log_file.write_text("after rotation, long enough to pass the old offset\n")
+        self.assertEqual(follower.read_lines(), (["after rotation, long enough to pass the old offset"], True))
+
+
+class TestPipelineLogWatcher(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.dir.name) / "front.log"
+        self.log_file.write_text("")
+        self.watcher = PipelineLogWatcher(poll_interval=0.05)
+
+    def tearDown(self):
+        self.watcher.unwatch("front")
+        self.dir.cleanup()
+
+    def test_publishes_state_events(self):
+        self.watcher.watch("front", self.log_file)
+        with open(self.log_file, "a") as f:
+            f.write("Redistribute latency...\n")
+            f.write("ERROR: from element /GstPipeline:pipeline0/GstRTSPSrc:rtspsrc0: Could not open resource\n")
+
+        state = self.watcher.wait("front", lambda s: s.error_count > 0, timeout=2)
+        self.assertTrue(state.initialized)
+        self.assertIn("Could not open resource", state.last_error)
+        self.assertEqual(self.watcher.next_event("front", timeout=1).state, PipelineState.INITIALIZED)
+        self.assertEqual(self.watcher.next_event("front", timeout=1).state, PipelineState.ERROR)
+
+        with open(self.log_file, "a") as f:
+            f.write('Got EOS from element "pipeline0".')
+        self.watcher.poll("front", final=True)
+        self.assertTrue(self.watcher.state("front").eos)
+
+    def test_watching_a_new_log_resets_state(self):
+        self.watcher.watch("front", self.log_file)
+        self.log_file.write_text("ERROR: from element x\n")
+        self.watcher.poll("front")
+        self.assertEqual(self.watcher.state("front").error_count, 1)
+
+        restarted = Path(self.dir.name) / "front_2.log"
+        restarted.write_text("")
+        self.watcher.watch("front", restarted)
+        self.assertEqual(self.watcher.state("front").error_count, 0)
+        self.assertIsNone(self.watcher.next_event("front", timeout=0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
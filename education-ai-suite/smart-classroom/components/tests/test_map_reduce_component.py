@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from components import map_reduce_component
+from components.map_reduce_component import MapReduceSummarizerComponent, split_segments
+
+class TestSplitSegments(unittest.TestCase):
+    def test_groups_whole_chunks(self):
+        segments, open_segment = split_segments(["aaaa", "bbbb", "cccc", None, "dd"], max_chars=10)
+        self.assertEqual(segments, ["aaaa bbbb"])
+        self.assertEqual(open_segment, "cccc dd")
+
+    def test_oversized_chunk_is_own_segment(self):
+        segments, open_segment = split_segments(["x" * 20, "y"], max_chars=10)
+        self.assertEqual(segments, ["x" * 20])
+        self.assertEqual(open_segment, "y")
+
+    def test_complete_segments_are_stable_while_transcribing(self):
+        texts = [f"chunk{i}" for i in range(20)]
+        final, _ = split_segments(texts, max_chars=30)
+        for n in range(1, len(texts)):
+            partial, _ = split_segments(texts[:n], max_chars=30)
+            self.assertEqual(partial, final[:len(partial)])
+
+class TestSummarizeReadySegments(unittest.TestCase):
+    def make_component(self, cache_dir):
+        component = MapReduceSummarizerComponent.__new__(MapReduceSummarizerComponent)
+        component.session_id = "s1"
+        component.summarizer_component = SimpleNamespace(model_name="m")
+        component.cache_dir = cache_dir
+        component._ready_cursor = 0
+        return component
+
+    def test_each_complete_segment_is_queued_once(self):
+        texts = [f"chunk{i}" for i in range(20)]
+        final, _ = split_segments(texts, max_chars=30)
+        submitted = []
+        executor = SimpleNamespace(submit=lambda fn, segments: submitted.extend(segments))
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(map_reduce_component, "_incremental_executor", executor), \
+                mock.patch.object(map_reduce_component, "SEGMENT_MAX_CHARS", 30):
+            component = self.make_component(cache_dir)
+            for n in range(1, len(texts) + 1):
+                component.summarize_ready_segments(texts[:n])
+        self.assertEqual(submitted, final)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from monitoring.metrics_buffer import CsvLogTail, MetricRingBuffer, MetricsMonitor, MetricsMonitorRegistry
+
+
+class TestMetricRingBuffer(unittest.TestCase):
+    def test_keeps_latest_samples_in_order(self):
+        buffer = MetricRingBuffer(capacity=3, width=1)
+        for n in range(5):
+            buffer.append(f"t{n}", [float(n)])
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.last(), [["t2", 2.0], ["t3", 3.0], ["t4", 4.0]])
+        self.assertEqual(buffer.last(2), [["t3", 3.0], ["t4", 4.0]])
+
+    def test_downsample_averages_windows(self):
+        buffer = MetricRingBuffer(capacity=10, width=2)
+        for n in range(6):
+            buffer.append(f"t{n}", [float(n), 10.0])
+        self.assertEqual(buffer.downsample(3), [["t1", 0.5, 10.0], ["t3", 2.5, 10.0], ["t5", 4.5, 10.0]])
+        self.assertEqual(buffer.downsample(10, last=2), [["t4", 4.0, 10.0], ["t5", 5.0, 10.0]])
+
+
+class TestCsvLogTail(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "cpu_utilization.csv")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, text, mode="a"):
+        with open(self.path, mode) as f:
+            f.write(text)
+
+    def test_reads_only_new_complete_lines(self):
+        tail = CsvLogTail(self.path, [1])
+        self.write("timestamp,total_cpu_utilization\nt0,1.5\nt1,2")
+        self.assertEqual(tail.read_new(), ([["t0", 1.5]], False))
+        self.write(".5\n")
+        self.assertEqual(tail.read_new(), ([["t1", 2.5]], False))
+        self.assertEqual(tail.read_new(), ([], False))
+
+    def test_recreated_file_is_read_from_start(self):
+        tail = CsvLogTail(self.path, [1])
+        self.write("timestamp,total_cpu_utilization\nt0,1.0\nt1,2.0\n")
+        tail.read_new()
+        self.write("timestamp,total_cpu_utilization\nt9,9.0\n", mode="w")
+        self.assertEqual(tail.read_new(), ([["t9", 9.0]], True))
+
+    def test_replaced_file_is_read_from_start_even_when_larger(self):
+        tail = CsvLogTail(self.path, [1])
+        self.write("timestamp,total_cpu_utilization\nt0,1.0\n")
+        tail.read_new()
+        replacement = os.path.join(self.dir.name, "next.csv")
+        with open(replacement, "w") as f:
+            f.write("timestamp,total_cpu_utilization\nt5,5.0\nt6,6.0\nt7,7.0\n")
+        os.replace(replacement, self.path)
+        self.assertEqual(tail.read_new(), ([["t5", 5.0], ["t6", 6.0], ["t7", 7.0]], True))
+
+    def test_monitor_snapshot(self):
+        self.write("timestamp,total_cpu_utilization\nt0,1.0\nt1,3.0\n")
+        monitor = MetricsMonitor(self.dir.name, capacity=100)
+        snapshot = monitor.snapshot()
+        self.assertEqual(snapshot["cpu_utilization"], [["t0", 1.0], ["t1", 3.0]])
+        self.assertEqual(snapshot["memory"], [])
+        self.write("t2,5.0\n")
+        self.assertEqual(monitor.snapshot(points=1)["cpu_utilization"], [["t2", 3.0]])
+
+
+class TestMetricsMonitorRegistry(unittest.TestCase):
+    def test_keeps_most_recently_used_sessions(self):
+        with tempfile.TemporaryDirectory() as root:
+            sessions = [os.path.join(root, f"s{n}", "utilization_logs") for n in range(3)]
+            registry = MetricsMonitorRegistry(capacity=10, max_monitors=2)
+            first = registry.get(sessions[0])
+            registry.get(sessions[1])
+            self.assertIs(registry.get(sessions[0]), first)
+            registry.get(sessions[2])  # evicts s1, the least recently used
+            self.assertEqual(len(registry), 2)
+            self.assertIs(registry.get(sessions[0]), first)
+
+            registry.evict(sessions[0])
+            self.assertEqual(len(registry), 1)
+            self.assertIsNot(registry.get(sessions[0]), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
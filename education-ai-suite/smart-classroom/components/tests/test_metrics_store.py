@@ -0,0 +1,35 @@
+import unittest
+import tempfile
+import os
+from utils.metrics_store import MetricsStore
+
+class TestMetricsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = MetricsStore(os.path.join(self.tmp.name, "metrics.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_latest_is_nested_and_typed(self):
+        self.store.record("s1", {"configuration.asr_model": "openvino/whisper-base", "performance.transcription_time": 1.5})
+        self.store.record("s1", {"performance.transcription_time": 2.0, "performance.total_tokens": 12})
+        self.store.record("s2", {"performance.transcription_time": 9.0})
+        self.assertEqual(self.store.latest("s1"), {
+            "configuration": {"asr_model": "openvino/whisper-base"},
+            "performance": {"transcription_time": 2, "total_tokens": 12},
+        })
+        self.assertEqual(self.store.latest("missing"), {})
+
+    def test_series_across_sessions(self):
+        for i, session in enumerate(["s1", "s2", "s3"]):
+            self.store.record(session, {"performance.tps": 10.5 + i}, ts=100 + i)
+        series = self.store.series("performance.tps", session_ids=["s1", "s3"])
+        self.assertEqual([(p["session_id"], p["value"]) for p in series], [("s1", 10.5), ("s3", 12.5)])
+        self.assertEqual(len(self.store.series("performance.tps", since=101)), 2)
+        self.assertEqual(self.store.series("performance.tps", limit=1)[0]["session_id"], "s3")
+        self.assertEqual(self.store.sessions(), ["s1", "s2", "s3"])
+
+if __name__ == "__main__":
+    unittest.main()
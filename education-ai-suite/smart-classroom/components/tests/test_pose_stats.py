@@ -0,0 +1,111 @@
+import itertools
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from components.va.pose_stats import PoseStatsAnalyzer, iou_matrix, linear_sum_assignment, match_boxes
+
+
+def box(x_min, y_min, x_max, y_max):
+    return {"x_min": x_min, "y_min": y_min, "x_max": x_max, "y_max": y_max}
+
+
+def frame(*objects):
+    return {"objects": [{"id": obj_id, "detection": {"label": label, "bounding_box": bbox}} for obj_id, label, bbox in objects]}
+
+
+class TestAssignment(unittest.TestCase):
+    def test_iou_matrix(self):
+        iou = iou_matrix([[0, 0, 2, 2], [10, 10, 11, 11]], [[1, 1, 3, 3], [0, 0, 2, 2]])
+        np.testing.assert_allclose(iou, [[1 / 7, 1.0], [0.0, 0.0]])
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for rows, cols in [(3, 3), (2, 5), (5, 2), (4, 4)]:
+            cost = rng.random((rows, cols))
+            r, c = linear_sum_assignment(cost)
+            self.assertEqual(len(r), min(rows, cols))
+            best = min(
+                sum(cost[i, j] for i, j in zip(range(rows), perm)) if rows <= cols
+                else sum(cost[i, j] for i, j in zip(perm, range(cols)))
+                for perm in itertools.permutations(range(max(rows, cols)), min(rows, cols))
+            )
+            self.assertAlmostEqual(cost[r, c].sum(), best)
+
+    def test_optimal_instead_of_greedy_match(self):
+        tracked = np.array([[0, 0, 10, 10], [6, 0, 16, 10]])
+        # the first detection overlaps the first track best, but taking it would leave the
+        # second detection without a match; the optimal pairing keeps both tracks
+        detected = np.array([[2, 0, 12, 10], [-2, 0, 8, 10]])
+        self.assertEqual(sorted(match_boxes(tracked, detected)), [(0, 1), (1, 0)])
+
+
+class TestPoseStatsAnalyzer(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        self.analyzer = PoseStatsAnalyzer(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def append(self, *frames, raw=""):
+        with open(self.path, "a") as f:
+            for fr in frames:
+                f.write(json.dumps(fr) + "\n")
+            f.write(raw)
+
+    def test_counts_stand_and_raise_incrementally(self):
+        sitting = frame((0, "sit", box(0, 0, 10, 10)), (0, "sit", box(50, 0, 60, 10)))
+        self.append(sitting, sitting)
+        self.assertEqual(self.analyzer.update(), 2)
+        self.assertEqual(self.analyzer.stats()["student_count"], 2)
+
+        raising = frame((0, "sit_raise_up", box(0, 0, 10, 10)), (0, "sit", box(50, 0, 60, 10)), (7, "stand", box(100, 0, 110, 30)))
+        self.append(*[raising] * 4)
+        self.analyzer.update()
+        stats = self.analyzer.stats()
+        self.assertEqual(stats["raise_up_count"], 1)
+        self.assertEqual(stats["stand_count"], 1)
+        self.assertEqual(stats["stand_reid"], [{"student_id": 7, "count": 1}])
+        self.assertEqual(stats["student_count"], 3)
+
+        # student 7 sits down for more than a second, then stands up again
+        self.append(*[sitting] * 20, frame((7, "stand", box(100, 0, 110, 30))))
+        self.analyzer.update()
+        self.assertEqual(self.analyzer.stats()["stand_reid"], [{"student_id": 7, "count": 2}])
+
+    def test_incomplete_line_is_kept_for_next_read(self):
+        line = json.dumps(frame((3, "stand", box(0, 0, 10, 10))))
+        self.append(raw=line[:10])
+        self.assertEqual(self.analyzer.update(), 0)
+        self.append(raw=line[10:] + "\n")
+        self.assertEqual(self.analyzer.update(), 1)
+        self.assertEqual(self.analyzer.stats()["stand_count"], 1)
+
+    def test_truncated_file_resets(self):
+        self.append(*[frame((3, "stand", box(0, 0, 10, 10)))] * 3)
+        self.analyzer.update()
+        open(self.path, "w").close()
+        self.append(frame((0, "sit", box(0, 0, 10, 10))))
+        self.analyzer.update()
+        self.assertEqual(self.analyzer.stats(), {"student_count": 1, "stand_count": 0, "raise_up_count": 0, "stand_reid": []})
+
+    def test_recreated_file_resets_even_when_larger(self):
+        self.append(frame((3, "stand", box(0, 0, 10, 10))))
+        self.analyzer.update()
+        # the pipeline restarts and its new output outgrows the old offset before the next poll
+        with open(self.path + ".new", "w") as f:
+            for _ in range(5):
+                f.write(json.dumps(frame((0, "sit", box(0, 0, 10, 10)))) + "\n")
+        os.replace(self.path + ".new", self.path)
+        self.assertEqual(self.analyzer.update(), 5)
+        self.assertEqual(self.analyzer.frame_count, 5)
+        self.assertEqual(self.analyzer.stats()["stand_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
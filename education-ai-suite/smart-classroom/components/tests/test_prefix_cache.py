@@ -0,0 +1,27 @@
+import unittest
+from utils.prefix_cache import PromptPrefixCache
+
+SYSTEM = list(range(100))
+
+class TestPromptPrefixCache(unittest.TestCase):
+    def test_shared_system_prompt_is_a_hit(self):
+        cache = PromptPrefixCache(max_entries=2, min_prefix_tokens=32)
+        self.assertEqual(cache.match(SYSTEM + [1000, 1001]), (0, None))
+        cache.put(SYSTEM + [1000, 1001], payload="kv")
+        self.assertEqual(cache.match(SYSTEM + [2000]), (100, "kv"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_short_prefix_is_a_miss(self):
+        cache = PromptPrefixCache(min_prefix_tokens=32)
+        cache.put(list(range(10)) + [7])
+        self.assertEqual(cache.match(list(range(10)) + [8]), (0, None))
+
+    def test_lru_eviction(self):
+        cache = PromptPrefixCache(max_entries=1, min_prefix_tokens=1)
+        cache.put([1, 2, 3], "a")
+        cache.put([4, 5, 6], "b")
+        self.assertEqual(cache.match([1, 2, 3]), (0, None))
+        self.assertEqual(cache.match([4, 5, 9]), (2, "b"))
+
+if __name__ == "__main__":
+    unittest.main()
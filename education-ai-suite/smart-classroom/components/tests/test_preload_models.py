@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from utils import preload_models
+
+
+class TestPreloadModels(unittest.TestCase):
+    def test_models_load_in_parallel_and_report_timings(self):
+        barrier = threading.Barrier(2, timeout=5)
+        warmed = []
+
+        def load():
+            # both loaders must be running at once to pass the barrier
+            barrier.wait()
+            return object()
+
+        with patch.object(preload_models, "_import_asr", lambda: None), \
+                patch.object(preload_models, "_import_summarizer", lambda: None), \
+                patch.object(preload_models, "_load_asr", load), \
+                patch.object(preload_models, "_load_summarizer", load), \
+                patch.object(preload_models, "_warmup_asr", lambda c: warmed.append("asr")), \
+                patch.object(preload_models, "_warmup_summarizer", lambda c: warmed.append("summarizer")):
+            preload_models.preload_models()
+
+        status = preload_models.get_startup_status()
+        self.assertEqual(status["state"], "ready")
+        self.assertEqual(sorted(warmed), ["asr", "summarizer"])
+        for fields in status["models"].values():
+            self.assertEqual(fields["state"], "ready")
+            for key in ("import_sec", "load_sec", "warmup_sec"):
+                self.assertGreaterEqual(fields[key], 0)
+
+    def test_failed_model_is_reported(self):
+        def failing_load():
+            raise RuntimeError("device not found")
+
+        with patch.object(preload_models, "_import_asr", lambda: None), \
+                patch.object(preload_models, "_import_summarizer", lambda: None), \
+                patch.object(preload_models, "_load_asr", lambda: object()), \
+                patch.object(preload_models, "_load_summarizer", failing_load), \
+                patch.object(preload_models, "_warmup_asr", lambda c: None):
+            preload_models.preload_models()
+
+        status = preload_models.get_startup_status()
+        self.assertEqual(status["state"], "failed")
+        self.assertEqual(status["models"]["asr"]["state"], "ready")
+        self.assertEqual(status["models"]["summarizer"]["state"], "failed")
+        self.assertIn("device not found", status["models"]["summarizer"]["error"])
+        self.assertNotIn("load_sec", status["models"]["summarizer"])
+
+    def test_background_preload_exposes_loading_state(self):
+        release = threading.Event()
+
+        with patch.object(preload_models, "_import_asr", lambda: None), \
+                patch.object(preload_models, "_import_summarizer", lambda: None), \
+                patch.object(preload_models, "_load_asr", lambda: release.wait(5)), \
+                patch.object(preload_models, "_load_summarizer", lambda: object()), \
+                patch.object(preload_models, "_warmup_asr", lambda c: None), \
+                patch.object(preload_models, "_warmup_summarizer", lambda c: None):
+            thread = preload_models.start_preload_models()
+            deadline = time.monotonic() + 5
+            while preload_models.get_startup_status()["state"] != "loading" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(preload_models.get_startup_status()["state"], "loading")
+            release.set()
+            thread.join(timeout=5)
+
+        self.assertEqual(preload_models.get_startup_status()["state"], "ready")
+
+
+if __name__ == "__main__":
+    unittest.main()
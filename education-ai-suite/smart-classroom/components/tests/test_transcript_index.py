@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from utils.transcript_index import TranscriptIndex
+
+
+class TestTranscriptIndex(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.index = TranscriptIndex(os.path.join(self.dir.name, "transcripts.db"))
+
+    def tearDown(self):
+        self.index.close()
+        self.dir.cleanup()
+
+    def test_hits_are_ranked_and_carry_time_offsets(self):
+        self.index.add("s1", 0, 0.0, 15.0, "Today we start with photosynthesis in plants.", speaker="teacher")
+        self.index.add("s1", 1, 15.0, 30.5, "Photosynthesis turns light into chemical energy, photosynthesis again.")
+        self.index.add("s2", 0, 0.0, 12.25, "Newton's laws of motion.")
+        self.assertTrue(self.index.flush(timeout=5))
+
+        hits = self.index.search("photosynthesis")
+        self.assertEqual([(h["session_id"], h["chunk_index"]) for h in hits], [("s1", 1), ("s1", 0)])
+        self.assertEqual((hits[0]["start_ms"], hits[0]["end_ms"]), (15000, 30500))
+        self.assertEqual(hits[1]["speaker"], "teacher")
+        self.assertIn("<mark>", hits[0]["snippet"])
+        self.assertGreater(hits[0]["score"], hits[1]["score"])
+
+        self.assertEqual([h["session_id"] for h in self.index.search("laws motion")], ["s2"])
+        self.assertEqual(self.index.search("photosynthesis", session_ids=["s2"]), [])
+
+    def test_reset_session_replaces_previous_transcript(self):
+        self.index.add("s1", 0, 0.0, 10.0, "old lecture about gravity")
+        self.index.reset_session("s1")
+        self.index.add("s1", 0, 0.0, 10.0, "new lecture about magnetism")
+        self.index.flush(timeout=5)
+
+        self.assertEqual(self.index.search("gravity"), [])
+        self.assertEqual(len(self.index.search("magnetism")), 1)
+
+    def test_query_syntax_is_taken_literally(self):
+        self.index.add("s1", 0, 0.0, 5.0, "What is NOT allowed in the lab?")
+        self.index.flush(timeout=5)
+
+        self.assertEqual(len(self.index.search('NOT "allowed')), 1)
+        self.assertEqual(self.index.search("   "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
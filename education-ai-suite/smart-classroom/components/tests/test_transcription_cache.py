@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from utils.transcription_cache import TranscriptionCache, audio_fingerprint
+
+SIGNATURE = {"provider": "openvino", "model": "whisper-base", "temperature": 0.0}
+
+
+class TestTranscriptionCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.dir.name, "transcription_cache.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_fingerprint_depends_on_audio_and_model(self):
+        audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+        key = audio_fingerprint(audio, SIGNATURE)
+        self.assertEqual(key, audio_fingerprint(audio.copy(), dict(SIGNATURE)))
+        self.assertNotEqual(key, audio_fingerprint(audio[:-1], SIGNATURE))
+        self.assertNotEqual(key, audio_fingerprint(audio, {**SIGNATURE, "model": "whisper-small"}))
+
+    def test_entries_persist_across_instances(self):
+        cache = TranscriptionCache(self.db_path, max_bytes=1 << 20)
+        cache.put("k1", "hello class")
+        cache.close()
+
+        cache = TranscriptionCache(self.db_path, max_bytes=1 << 20)
+        self.assertEqual(cache.get("k1"), "hello class")
+        self.assertIsNone(cache.get("k2"))
+        cache.close()
+
+    def test_size_based_eviction_keeps_recently_used(self):
+        cache = TranscriptionCache(self.db_path, max_bytes=25)  # two 10 byte entries fit
+        cache.put("a", "x" * 9)
+        cache.put("b", "y" * 9)
+        cache.get("a")  # a is now more recent than b
+        cache.put("c", "z" * 9)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "x" * 9)
+        self.assertEqual(cache.get("c"), "z" * 9)
+        self.assertLessEqual(cache.stats()["size_bytes"], 25)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import logging
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from components.va import va_pipeline_service
+from components.va.log_watcher import PipelineLogWatcher
+from components.va.va_pipeline_service import PipelineOptions, VideoAnalyticsPipelineService
+
+
+def fake_popen(*lines):
+    """Popen stand-in that writes (delay, line) pairs to the pipeline log like gst-launch would."""
+    def popen(command, stdout, **kwargs):
+        def write():
+            for delay, line in lines:
+                time.sleep(delay)
+                stdout.write(line + "\n")
+        threading.Thread(target=write, daemon=True).start()
+        return SimpleNamespace(pid=1234)
+    return popen
+
+
+class TestLaunchPipeline(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        service = VideoAnalyticsPipelineService.__new__(VideoAnalyticsPipelineService)
+        service.logger = logging.getLogger("test")
+        service.pipelines, service.pipeline_logs, service.pipeline_log_handles = {}, {}, {}
+        service.log_watcher = PipelineLogWatcher(poll_interval=0.05)
+        service.startup_timeout, service.post_init_grace = 2.0, 0.5
+        self.service = service
+
+    def tearDown(self):
+        self.service.log_watcher.unwatch("front")
+        for handle in self.service.pipeline_log_handles.values():
+            handle.close()
+        self.dir.cleanup()
+
+    def launch(self, *lines):
+        with mock.patch.object(va_pipeline_service.subprocess, "Popen", side_effect=fake_popen(*lines)):
+            return self.service._launch_pipeline_internal("front", PipelineOptions(output_dir=self.dir.name), ["gst-launch-1.0"])
+
+    def test_initialized_pipeline_launches(self):
+        self.assertTrue(self.launch((0.05, "Redistribute latency...")))
+
+    def test_error_right_after_initialization_fails_the_launch(self):
+        self.assertFalse(self.launch((0.05, "Redistribute latency..."), (0.2, "ERROR: from element /GstPipeline:pipeline0/GstGvaDetect")))
+
+
+if __name__ == "__main__":
+    unittest.main()
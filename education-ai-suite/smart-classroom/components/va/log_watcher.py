@@ -0,0 +1,195 @@
+import os
+import queue
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineState(Enum):
+    """Pipeline states detected in gst-launch logs"""
+
+    INITIALIZED = "initialized"  # latency redistributed, pipeline is playing
+    ERROR = "error"  # an element posted an error
+    EOS = "eos"  # pipeline reached end of stream (normal exit)
+    LOG_RESET = "log_reset"  # log file was rotated or truncated
+
+
+# substring -> state, matched per log line
+LOG_PATTERNS = [
+    ("Redistribute latency", PipelineState.INITIALIZED),
+    ("ERROR: from element", PipelineState.ERROR),
+    ('Got EOS from element "pipeline0".', PipelineState.EOS),
+]
+
+
+@dataclass
+class PipelineStateEvent:
+    """Structured event published when a state pattern shows up in a pipeline log"""
+
+    pipeline_name: str
+    state: PipelineState
+    line: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class PipelineLogState:
+    """Accumulated health of a pipeline since its current log file was opened"""
+
+    initialized: bool = False
+    eos: bool = False
+    error_count: int = 0
+    last_error: Optional[str] = None
+
+
+class LogFollower:
+    """
+    Reads a growing log file from the last read offset, returning complete lines only.
+    A replaced file (rotation) or a file shorter than the offset (truncation) is re-read from the start.
+    """
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self._offset = 0
+        self._partial = b""
+        self._identity = None
+
+    def read_lines(self, final: bool = False) -> Tuple[List[str], bool]:
+        """Returns (new lines, reset). With final=True an unterminated last line is returned too."""
+        try:
+            stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            return [], False
+
+        identity = (stat.st_dev, stat.st_ino)
+        reset = (self._identity is not None and identity != self._identity) or stat.st_size < self._offset
+        if reset:
+            self._offset, self._partial = 0, b""
+        self._identity = identity
+
+        data = b""
+        if stat.st_size > self._offset:
+            with open(self.log_file, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(stat.st_size - self._offset)
+            self._offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if final and self._partial:
+            lines.append(self._partial)
+            self._partial = b""
+        return [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines], reset
+
+
+class PipelineLogWatcher:
+    """
+    Follows the logs of all pipelines of a service from one background thread.
+
+    Only bytes appended since the previous poll are scanned for LOG_PATTERNS. Matches update
+    the pipeline's PipelineLogState and are published as PipelineStateEvent on the pipeline's
+    event queue, which the service's monitor thread consumes.
+    """
+
+    def __init__(self, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self._followers: Dict[str, LogFollower] = {}
+        self._states: Dict[str, PipelineLogState] = {}
+        self._events: Dict[str, "queue.Queue[PipelineStateEvent]"] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, pipeline_name: str, log_file: Path):
+        """Starts following a (new) log file for the pipeline; previous state and events are dropped."""
+        with self._cond:
+            self._followers[pipeline_name] = LogFollower(log_file)
+            self._states[pipeline_name] = PipelineLogState()
+            self._events[pipeline_name] = queue.Queue()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="va-log-watcher")
+                self._thread.start()
+
+    def unwatch(self, pipeline_name: str):
+        with self._cond:
+            self._followers.pop(pipeline_name, None)
+            self._states.pop(pipeline_name, None)
+            self._events.pop(pipeline_name, None)
+            self._cond.notify_all()
+
+    def state(self, pipeline_name: str) -> PipelineLogState:
+        with self._cond:
+            return self._states.get(pipeline_name, PipelineLogState())
+
+    def poll(self, pipeline_name: str, final: bool = False):
+        """Scans the new bytes of a pipeline log now (the background thread does this periodically)."""
+        with self._cond:
+            follower = self._followers.get(pipeline_name)
+            if follower is None:
+                return
+            try:
+                lines, reset = follower.read_lines(final)
+            except OSError as e:
+                logger.warning(f"Failed to read log file {follower.log_file}: {e}")
+                return
+
+            state = self._states[pipeline_name]
+            events = []
+            if reset:
+                self._states[pipeline_name] = state = PipelineLogState()
+                events.append(PipelineStateEvent(pipeline_name, PipelineState.LOG_RESET, str(follower.log_file)))
+            for line in lines:
+                for pattern, matched in LOG_PATTERNS:
+                    if pattern in line:
+                        events.append(PipelineStateEvent(pipeline_name, matched, line.strip()))
+
+            for event in events:
+                if event.state == PipelineState.INITIALIZED:
+                    state.initialized = True
+                elif event.state == PipelineState.ERROR:
+                    state.error_count += 1
+                    state.last_error = event.line
+                elif event.state == PipelineState.EOS:
+                    state.eos = True
+                self._events[pipeline_name].put(event)
+            if events:
+                self._cond.notify_all()
+
+    def next_event(self, pipeline_name: str, timeout: float) -> Optional[PipelineStateEvent]:
+        """Next published event of the pipeline, or None after timeout."""
+        with self._cond:
+            events = self._events.get(pipeline_name)
+        if events is None:
+            time.sleep(timeout)
+            return None
+        try:
+            return events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def wait(self, pipeline_name: str, predicate: Callable[[PipelineLogState], bool], timeout: float) -> PipelineLogState:
+        """Blocks until predicate(state) holds or timeout expires, and returns the state."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while pipeline_name in self._states and not predicate(self._states[pipeline_name]):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(min(remaining, self.poll_interval))
+            return self._states.get(pipeline_name, PipelineLogState())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                names = list(self._followers)
+                if not names:
+                    self._thread = None
+                    return
+            for name in names:
+                self.poll(name)
+            time.sleep(self.poll_interval)
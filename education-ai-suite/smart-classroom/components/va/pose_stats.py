@@ -0,0 +1,283 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Minimum frames to confirm state change (at 15 FPS, 3 frames = 0.2 seconds)
+MIN_FRAMES_FOR_TRANSITION = 3
+IOU_THRESHOLD = 0.3  # IoU threshold for matching objects without ID
+STALE_FRAMES = 30  # unidentified objects not seen for 2 seconds at 15 FPS are dropped
+ABSENCE_THRESHOLD = 15  # frames (1 second at 15 FPS) before a student ID counts as sat down
+# Student count is averaged at 60s, 120s, 180s (assuming 15 FPS)
+STUDENT_COUNT_FRAMES = (900, 1800, 2700)
+
+RAISING_LABELS = ("sit_raise_up", "stand_raise_up")
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of two (N, 4) / (M, 4) arrays of [x_min, y_min, x_max, y_max] boxes."""
+    boxes_a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    a, b = boxes_a[:, None, :], boxes_b[None, :, :]
+
+    width = np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0])
+    height = np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1])
+    # touching boxes (zero width or height) overlap with zero area, as before
+    intersection = np.where((width >= 0) & (height >= 0), width * height, 0.0)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(union != 0, intersection / union, 0.0)
+
+
+def linear_sum_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-cost assignment (Hungarian algorithm with potentials, O(n^2 m)).
+
+    Same contract as scipy.optimize.linear_sum_assignment for rectangular matrices:
+    returns (row_ind, col_ind) with min(N, M) pairs, sorted by row.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)  # p[j]: row (1-based) assigned to column j, 0 = free
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improved = free & (reduced < minv[1:])
+            minv[1:][improved] = reduced[improved]
+            way[1:][improved] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[~used] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def match_boxes(tracked: np.ndarray, detected: np.ndarray, threshold: float = IOU_THRESHOLD) -> List[Tuple[int, int]]:
+    """One-to-one matching of detections to tracked boxes maximizing total IoU, pairs below threshold dropped."""
+    if len(tracked) == 0 or len(detected) == 0:
+        return []
+    iou = iou_matrix(tracked, detected)
+    # pairs below the threshold can never match, so they must not pull the assignment
+    rows, cols = linear_sum_assignment(-np.where(iou >= threshold, iou, 0.0))
+    return [(int(r), int(c)) for r, c in zip(rows, cols) if iou[r, c] >= threshold]
+
+
+class PoseStatsAnalyzer:
+    """
+    Incremental pose statistics over a gvametapublish json-lines file (front_posture.txt).
+
+    The file is tailed from the last read offset, so each call only parses the frames
+    appended since the previous one and the counters are live while the class is running.
+    A file that is replaced or shrinks (pipeline restarted with a new output) resets the statistics.
+    """
+
+    def __init__(self, posture_file):
+        self.posture_file = Path(posture_file)
+        self._lock = threading.Lock()
+        self._identity = None
+        self._reset()
+
+    def _reset(self):
+        self._offset = 0
+        self._partial = b""
+        self.frame_count = 0
+        self._last_person_count = 0
+        self._sampled_person_counts: Dict[int, int] = {}
+
+        # Student IDs are only assigned while standing, so a new (or returning) ID is a stand event
+        self._student_states: Dict[int, dict] = {}  # {student_id: {"last_seen_frame", "is_raising", "raise_buffer"}}
+        self._student_stand_counts: Dict[int, int] = {}
+        self._student_raise_counts: Dict[int, int] = {}
+
+        # Objects without IDs are tracked by box overlap (raising only)
+        self._track_boxes = np.empty((0, 4))
+        self._track_states = np.empty((0, 4), dtype=np.int64)  # is_raising, raise_buffer, raise_count, last_seen_frame
+        self._raise_count_no_id = 0
+
+    def update(self) -> int:
+        """Parses frames appended since the last call. Returns the number of new frames."""
+        with self._lock:
+            try:
+                stat = os.stat(self.posture_file)
+            except OSError:
+                return 0
+            size = stat.st_size
+            # a recreated file may already have grown past the old offset, so compare identities too
+            identity = (stat.st_dev, stat.st_ino)
+            if (self._identity is not None and identity != self._identity) or size < self._offset:
+                logger.info(f"{self.posture_file} was replaced or truncated, restarting pose statistics")
+                self._reset()
+            self._identity = identity
+            if size == self._offset:
+                return 0
+
+            with open(self.posture_file, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            self._offset += len(data)
+
+            lines = (self._partial + data).split(b"\n")
+            # the last element is an incomplete line still being written (or empty)
+            self._partial = lines.pop()
+
+            new_frames = 0
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    frame = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._process_frame(frame)
+                new_frames += 1
+            return new_frames
+
+    def _process_frame(self, frame: dict):
+        frame_idx = self.frame_count
+        self.frame_count += 1
+
+        seen_student_ids = set()
+        person_count = 0
+        untracked_boxes, untracked_raising = [], []
+        for obj in frame.get("objects", []):
+            detection = obj.get("detection", {})
+            bbox = detection.get("bounding_box", {})
+            # Skip invalid detections (zero bounding box)
+            if bbox.get("x_max", 0) == 0:
+                continue
+            person_count += 1
+            label = detection.get("label", "")
+            is_raising = label in RAISING_LABELS
+
+            student_id = obj.get("id", 0)
+            if student_id > 0:
+                seen_student_ids.add(student_id)
+                self._update_student(student_id, is_raising, frame_idx)
+            else:
+                untracked_boxes.append([bbox.get("x_min", 0), bbox.get("y_min", 0), bbox.get("x_max", 0), bbox.get("y_max", 0)])
+                untracked_raising.append(is_raising)
+
+        self._last_person_count = person_count
+        if frame_idx in STUDENT_COUNT_FRAMES:
+            self._sampled_person_counts[frame_idx] = self._last_person_count
+
+        self._update_untracked(np.asarray(untracked_boxes, dtype=np.float64).reshape(-1, 4),
+                               np.asarray(untracked_raising, dtype=bool), frame_idx)
+
+        # Students not seen for a while sat down; their next appearance is a new stand event
+        for student_id in list(self._student_states):
+            if student_id not in seen_student_ids and frame_idx - self._student_states[student_id]["last_seen_frame"] >= ABSENCE_THRESHOLD:
+                del self._student_states[student_id]
+
+    def _update_student(self, student_id: int, is_raising: bool, frame_idx: int):
+        state = self._student_states.get(student_id)
+        if state is None:
+            self._student_states[student_id] = {"last_seen_frame": frame_idx, "is_raising": is_raising, "raise_buffer": 0}
+            self._student_stand_counts[student_id] = self._student_stand_counts.get(student_id, 0) + 1
+            self._student_raise_counts.setdefault(student_id, 0)
+            return
+
+        state["last_seen_frame"] = frame_idx
+        if is_raising != state["is_raising"]:
+            state["raise_buffer"] += 1
+            if state["raise_buffer"] >= MIN_FRAMES_FOR_TRANSITION:
+                if is_raising:
+                    self._student_raise_counts[student_id] += 1
+                state["is_raising"] = is_raising
+                state["raise_buffer"] = 0
+        else:
+            state["raise_buffer"] = 0
+
+    def _update_untracked(self, boxes: np.ndarray, raising: np.ndarray, frame_idx: int):
+        matches = match_boxes(self._track_boxes, boxes)
+        if matches:
+            track_idx, det_idx = (np.array(idx) for idx in zip(*matches))
+            states = self._track_states[track_idx]
+            now_raising = raising[det_idx]
+
+            changed = now_raising != states[:, 0].astype(bool)
+            buffer = np.where(changed, states[:, 1] + 1, 0)
+            confirmed = buffer >= MIN_FRAMES_FOR_TRANSITION
+            raised = confirmed & now_raising
+
+            states[:, 0] = np.where(confirmed, now_raising, states[:, 0])
+            states[:, 1] = np.where(confirmed, 0, buffer)
+            states[:, 2] += raised
+            states[:, 3] = frame_idx
+            self._track_states[track_idx] = states
+            self._track_boxes[track_idx] = boxes[det_idx]
+            self._raise_count_no_id += int(raised.sum())
+
+        unmatched = np.ones(len(boxes), dtype=bool)
+        unmatched[[d for _, d in matches]] = False
+        if unmatched.any():
+            new_states = np.zeros((int(unmatched.sum()), 4), dtype=np.int64)
+            new_states[:, 0] = raising[unmatched]
+            new_states[:, 3] = frame_idx
+            self._track_boxes = np.vstack([self._track_boxes, boxes[unmatched]])
+            self._track_states = np.vstack([self._track_states, new_states])
+
+        alive = frame_idx - self._track_states[:, 3] < STALE_FRAMES
+        self._track_boxes, self._track_states = self._track_boxes[alive], self._track_states[alive]
+
+    def _student_count(self) -> int:
+        if self.frame_count < max(STUDENT_COUNT_FRAMES):
+            return self._last_person_count
+        counts = [self._sampled_person_counts[idx] for idx in STUDENT_COUNT_FRAMES if idx in self._sampled_person_counts]
+        return int(sum(counts) / len(counts)) if counts else 0
+
+    def stats(self) -> Dict:
+        """Current statistics in the /class-statistics response format."""
+        with self._lock:
+            return {
+                "student_count": self._student_count() if self.frame_count else 0,
+                "stand_count": sum(self._student_stand_counts.values()),
+                "raise_up_count": sum(self._student_raise_counts.values()) + self._raise_count_no_id,
+                "stand_reid": [
+                    {"student_id": sid, "count": count}
+                    for sid, count in sorted(self._student_stand_counts.items())
+                    if count > 0
+                ],
+            }
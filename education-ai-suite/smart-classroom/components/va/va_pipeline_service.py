@@ -13,6 +13,8 @@ import atexit
 import json
 import threading
 from utils.config_loader import config
+from components.va.pose_stats import PoseStatsAnalyzer
+from components.va.log_watcher import PipelineLogWatcher, PipelineState, PipelineStateEvent
 
 
 class PipelineName(Enum):
@@ -76,6 +78,17 @@ class VideoAnalyticsPipelineService:
         self.pipeline_retry_counts: Dict[str, int] = {}
         self.max_retries = 10
 
+        # Launch waits up to startup_timeout seconds for initialization, then post_init_grace
+        # seconds more, since elements often fail right after the pipeline initialized
+        self.startup_timeout = 5.0
+        self.post_init_grace = 2.0
+
+        # Follows pipeline logs and publishes state events to the monitor threads
+        self.log_watcher = PipelineLogWatcher()
+
+        # Incremental pose statistics per posture file of a running pipeline
+        self.pose_stats_analyzers: Dict[str, PoseStatsAnalyzer] = {}
+
         # Register cleanup handler
         atexit.register(self._cleanup)
 
@@ -149,40 +162,24 @@ class VideoAnalyticsPipelineService:
             "protocols=udp"
         ]
 
-    def _check_redistribute_latency(self, log_file: Path) -> bool:
-        """Check if 'Redistribute latency' appears in log file"""
-        try:
-            with open(log_file, "r") as f:
-                content = f.read()
-                return "Redistribute latency" in content
-        except Exception as e:
-            self.logger.warning(f"Failed to check log file: {e}")
-            return False
-
-    def _check_error(self, log_file: Path) -> bool:
-        """Check if 'ERROR' appears in log file"""
-        try:
-            with open(log_file, "r") as f:
-                content = f.read()
-                return "ERROR: from element" in content
-        except Exception as e:
-            self.logger.warning(f"Failed to check log file: {e}")
-            return False
-
-    def _check_normal_exit(self, log_file: Path) -> bool:
-        """Check if pipeline exited normally (has EOS message)"""
-        try:
-            with open(log_file, "r") as f:
-                content = f.read()
-                return 'Got EOS from element "pipeline0".' in content
-        except Exception as e:
-            self.logger.warning(f"Failed to check log file: {e}")
-            return False
+    def _handle_log_event(self, event: PipelineStateEvent):
+        """Log a pipeline state event published by the log watcher"""
+        if event.state == PipelineState.ERROR:
+            self.logger.error(f"Pipeline '{event.pipeline_name}' reported an error: {event.line}")
+        elif event.state == PipelineState.LOG_RESET:
+            self.logger.warning(f"Log of pipeline '{event.pipeline_name}' was rotated or truncated, following from start")
+        elif event.state == PipelineState.EOS:
+            self.logger.info(f"Pipeline '{event.pipeline_name}' reached end of stream")
+        else:
+            self.logger.debug(f"Pipeline '{event.pipeline_name}' state: {event.state.value}")
 
     def _monitor_pipeline(self, pipeline_name: str):
         """
         Monitor pipeline process and restart if it exits unexpectedly
 
+        Reacts to state events published by the log watcher; whether an exit was normal
+        is decided from the EOS event instead of re-reading the log.
+
         Args:
             pipeline_name: Name of the pipeline to monitor
         """
@@ -195,12 +192,18 @@ class VideoAnalyticsPipelineService:
 
             process = self.pipelines[pipeline_name]
 
+            # Wait for the next log event, checking the process at least every 2 seconds
+            event = self.log_watcher.next_event(pipeline_name, timeout=2)
+            if event is not None:
+                self._handle_log_event(event)
+
             # Check process status
             if process.poll() is not None:
-                # Process has exited
-                log_file = self.pipeline_logs.get(pipeline_name)
+                # Process has exited, pick up its last log lines
+                self.log_watcher.poll(pipeline_name, final=True)
+                log_state = self.log_watcher.state(pipeline_name)
 
-                if log_file and self._check_normal_exit(log_file):
+                if log_state.eos:
                     # Normal exit with EOS
                     self.logger.info(
                         f"Pipeline '{pipeline_name}' exited normally (EOS received)"
@@ -212,7 +215,8 @@ class VideoAnalyticsPipelineService:
 
                     if retry_count < self.max_retries:
                         self.logger.warning(
-                            f"Pipeline '{pipeline_name}' exited unexpectedly. "
+                            f"Pipeline '{pipeline_name}' exited unexpectedly"
+                            f"{f' after error: {log_state.last_error}' if log_state.last_error else ''}. "
                             f"Restarting... (attempt {retry_count + 1}/{self.max_retries})"
                         )
 
@@ -245,9 +249,6 @@ class VideoAnalyticsPipelineService:
                         )
                         break
 
-            # Check every 2 seconds
-            time.sleep(2)
-
         self.logger.info(f"Monitor thread for pipeline '{pipeline_name}' stopped")
 
     def _launch_pipeline_internal(
@@ -296,15 +297,21 @@ class VideoAnalyticsPipelineService:
             )
             self.logger.info(f"  Log file: {log_file}")
 
-            # Check for "Redistribute latency" in log file
-            time.sleep(5)
-            self.pipeline_log_handles[pipeline_name].flush()
-            if self._check_redistribute_latency(log_file):
+            # Follow the new log; wait for "Redistribute latency" or an error
+            self.log_watcher.watch(pipeline_name, log_file)
+            log_state = self.log_watcher.wait(
+                pipeline_name, lambda state: state.initialized or state.error_count > 0, timeout=self.startup_timeout
+            )
+            if log_state.initialized and not log_state.error_count:
+                log_state = self.log_watcher.wait(
+                    pipeline_name, lambda state: state.error_count > 0, timeout=self.post_init_grace
+                )
+            if log_state.initialized:
                 self.logger.info("Pipeline initialized successfully")
             else:
                 self.logger.warning("Pipeline may not have initialized properly")
-            if self._check_error(log_file):
-                self.logger.error("Errors detected in pipeline log")
+            if log_state.error_count:
+                self.logger.error(f"Errors detected in pipeline log: {log_state.last_error}")
                 return False
 
             return True
@@ -665,6 +672,7 @@ class VideoAnalyticsPipelineService:
         if process.poll() is not None:
             self.logger.info(f"Pipeline '{pipeline_name}' is not running")
             del self.pipelines[pipeline_name]
+            self._drop_pose_stats(pipeline_name)
             return True
 
         try:
@@ -702,6 +710,7 @@ class VideoAnalyticsPipelineService:
                 del self.monitor_threads[pipeline_name]
 
             # Clean up associated data
+            self.log_watcher.unwatch(pipeline_name)
             if pipeline_name in self.pipeline_logs:
                 del self.pipeline_logs[pipeline_name]
             if pipeline_name in self.pipeline_log_handles:
@@ -711,6 +720,7 @@ class VideoAnalyticsPipelineService:
                 except:
                     pass
                 del self.pipeline_log_handles[pipeline_name]
+            self._drop_pose_stats(pipeline_name)
             if pipeline_name in self.pipeline_output_files:
                 del self.pipeline_output_files[pipeline_name]
             if pipeline_name in self.pipeline_params:
@@ -871,6 +881,10 @@ class VideoAnalyticsPipelineService:
         # Add log file info
         if pipeline_name in self.pipeline_logs:
             status["log_file"] = str(self.pipeline_logs[pipeline_name])
+            log_state = self.log_watcher.state(pipeline_name)
+            status["initialized"] = log_state.initialized
+            status["error_count"] = log_state.error_count
+            status["last_error"] = log_state.last_error
 
         # Add output files info
         if pipeline_name in self.pipeline_output_files:
@@ -918,13 +932,28 @@ class VideoAnalyticsPipelineService:
                     pass
             self.pipeline_log_handles.clear()
 
+    def _live_output_files(self) -> set:
+        return {
+            str(Path(f).resolve())
+            for name, files in self.pipeline_output_files.items()
+            if self.is_pipeline_running(name)
+            for f in files
+        }
+
+    def _drop_pose_stats(self, pipeline_name: str):
+        for f in self.pipeline_output_files.get(pipeline_name, []):
+            self.pose_stats_analyzers.pop(str(Path(f).resolve()), None)
+
     def get_pose_stats(self, front_posture_file: str = "outputs/front_posture.txt") -> Dict:
         """
-        Analyze front_posture.txt and generate pose statistics based on pose transitions
-        
+        Analyze front_posture.txt and generate pose statistics based on pose transitions.
+
+        The file is read incrementally: only frames appended since the previous call are
+        parsed, so the statistics can be polled during class at constant cost.
+
         Args:
             front_posture_file: Path to front_posture.txt file
-            
+
         Returns:
             Dictionary with statistics:
             - student_count: Average person count
@@ -944,254 +973,20 @@ class VideoAnalyticsPipelineService:
             }
 
         try:
-            # Read all lines
-            with open(posture_file, "r") as f:
-                lines = f.readlines()
-
-            if not lines:
-                self.logger.warning("Front posture file is empty")
-                return {
-                    "student_count": 0,
-                    "stand_count": 0,
-                    "raise_up_count": 0,
-                    "stand_reid": []
-                }
-
-            # Parse JSON objects
-            frames = []
-            for line in lines:
-                line = line.strip()
-                if line:
-                    try:
-                        obj = json.loads(line)
-                        frames.append(obj)
-                    except json.JSONDecodeError:
-                        continue
-
-            if not frames:
+            key = str(posture_file.resolve())
+            analyzer = self.pose_stats_analyzers.get(key)
+            if analyzer is None:
+                analyzer = PoseStatsAnalyzer(posture_file)
+                # only files still being written are followed; a finished file is parsed once
+                if key in self._live_output_files():
+                    self.pose_stats_analyzers[key] = analyzer
+
+            new_frames = analyzer.update()
+            if analyzer.frame_count == 0:
                 self.logger.warning("No valid JSON frames found")
-                return {
-                    "student_count": 0,
-                    "stand_count": 0,
-                    "raise_up_count": 0,
-                    "stand_reid": []
-                }
-
-            # Helper function to calculate IoU (Intersection over Union) between two bounding boxes
-            def calculate_iou(bbox1, bbox2):
-                """Calculate IoU between two bounding boxes"""
-                x1_min = bbox1.get("x_min", 0)
-                y1_min = bbox1.get("y_min", 0)
-                x1_max = bbox1.get("x_max", 0)
-                y1_max = bbox1.get("y_max", 0)
-
-                x2_min = bbox2.get("x_min", 0)
-                y2_min = bbox2.get("y_min", 0)
-                x2_max = bbox2.get("x_max", 0)
-                y2_max = bbox2.get("y_max", 0)
-
-                # Calculate intersection
-                x_left = max(x1_min, x2_min)
-                y_top = max(y1_min, y2_min)
-                x_right = min(x1_max, x2_max)
-                y_bottom = min(y1_max, y2_max)
-
-                if x_right < x_left or y_bottom < y_top:
-                    return 0.0
-
-                intersection = (x_right - x_left) * (y_bottom - y_top)
-
-                # Calculate union
-                area1 = (x1_max - x1_min) * (y1_max - y1_min)
-                area2 = (x2_max - x2_min) * (y2_max - y2_min)
-                union = area1 + area2 - intersection
-
-                if union == 0:
-                    return 0.0
-
-                return intersection / union
-
-            # Calculate statistics
-
-            # 1. Student count at 60s, 120s, 180s (average)
-            # Assuming 15 FPS: 60s = 900 frames, 120s = 1800 frames, 180s = 2700 frames
-            target_frames = [900, 1800, 2700]
-            person_counts = []
-
-            if len(frames) < max(target_frames):
-                target_frames = [ len(frames) - 1 ]
-
-            for target_idx in target_frames:
-                if target_idx < len(frames):
-                    frame = frames[target_idx]
-                    objects = frame.get("objects", [])
-                    # Count objects with non-zero bounding box
-                    count = sum(1 for obj in objects 
-                              if obj.get("detection", {}).get("bounding_box", {}).get("x_max", 0) > 0)
-                    person_counts.append(count)
-
-            # Average student count
-            student_count = int(sum(person_counts) / len(person_counts)) if person_counts else 0
-
-            # 2. Track pose transitions with robustness
-            # Minimum frames to confirm state change (at 15 FPS, 3 frames = 0.2 seconds)
-            MIN_FRAMES_FOR_TRANSITION = 3
-            IOU_THRESHOLD = 0.3  # IoU threshold for matching objects without ID
-
-            # State tracking for students with IDs
-            # Note: IDs are only assigned when students are in "stand" or "stand_raise_up" poses
-            # So we track when a student ID first appears (stand up event)
-            student_states = {}  # {student_id: {"last_seen_frame": int, "is_raising": bool, "raise_buffer": int}}
-            student_stand_counts = {}
-            student_raise_counts = {}
-
-            # State tracking for objects without IDs (using ROI matching)
-            unidentified_objects = []  # [{bbox, is_raising, raise_buffer, raise_count}]
-            total_raise_count_no_id = 0
-
-            for frame_idx, frame in enumerate(frames):
-                objects = frame.get("objects", [])
-
-                # Track which student IDs were seen this frame
-                seen_student_ids = set()
-
-                # Track which unidentified objects were matched this frame
-                matched_unidentified = set()
-
-                for obj in objects:
-                    detection = obj.get("detection", {})
-                    label = detection.get("label", "")
-                    student_id = obj.get("id", 0)
-                    bbox = detection.get("bounding_box", {})
-
-                    # Skip invalid detections (zero bounding box)
-                    if bbox.get("x_max", 0) == 0:
-                        continue
-
-                    # Determine current pose state
-                    is_standing = label in ["stand", "stand_raise_up"]
-                    is_raising = label in ["sit_raise_up", "stand_raise_up"]
-
-                    # Handle students with IDs (they are standing)
-                    if student_id > 0:
-                        seen_student_ids.add(student_id)
-
-                        # First time seeing this student ID (or reappearing after absence) - just stood up
-                        if student_id not in student_states:
-                            student_states[student_id] = {
-                                "last_seen_frame": frame_idx,
-                                "is_raising": is_raising,
-                                "raise_buffer": 0
-                            }
-                            # Increment stand count or initialize to 1 if first time
-                            if student_id not in student_stand_counts:
-                                student_stand_counts[student_id] = 1
-                            else:
-                                student_stand_counts[student_id] += 1
-
-                            # Initialize raise count if needed
-                            if student_id not in student_raise_counts:
-                                student_raise_counts[student_id] = 0
-                        else:
-                            # Update last seen frame
-                            state = student_states[student_id]
-                            state["last_seen_frame"] = frame_idx
-
-                            # Raising state transition with buffer
-                            if is_raising != state["is_raising"]:
-                                state["raise_buffer"] += 1
-                                if state["raise_buffer"] >= MIN_FRAMES_FOR_TRANSITION:
-                                    # Confirmed transition
-                                    if is_raising:  # Transition to raising
-                                        student_raise_counts[student_id] += 1
-                                    state["is_raising"] = is_raising
-                                    state["raise_buffer"] = 0
-                            else:
-                                state["raise_buffer"] = 0
-
-                    # Handle students without IDs (only track raising)
-                    else:
-                        # Try to match with existing unidentified objects using IoU
-                        best_match_idx = -1
-                        best_iou = 0
-
-                        for idx, unid_obj in enumerate(unidentified_objects):
-                            if idx in matched_unidentified:
-                                continue
-                            iou = calculate_iou(bbox, unid_obj["bbox"])
-                            if iou > best_iou and iou >= IOU_THRESHOLD:
-                                best_iou = iou
-                                best_match_idx = idx
-
-                        if best_match_idx >= 0:
-                            # Matched existing object
-                            unid_obj = unidentified_objects[best_match_idx]
-                            matched_unidentified.add(best_match_idx)
-
-                            # Update bbox
-                            unid_obj["bbox"] = bbox
-
-                            # Raising state transition with buffer
-                            if is_raising != unid_obj["is_raising"]:
-                                unid_obj["raise_buffer"] += 1
-                                if unid_obj["raise_buffer"] >= MIN_FRAMES_FOR_TRANSITION:
-                                    # Confirmed transition
-                                    if is_raising:  # Transition to raising
-                                        unid_obj["raise_count"] += 1
-                                        total_raise_count_no_id += 1
-                                    unid_obj["is_raising"] = is_raising
-                                    unid_obj["raise_buffer"] = 0
-                            else:
-                                unid_obj["raise_buffer"] = 0
-
-                            unid_obj["last_seen_frame"] = frame_idx
-
-                        else:
-                            # New unidentified object
-                            unidentified_objects.append({
-                                "bbox": bbox,
-                                "is_raising": is_raising,
-                                "raise_buffer": 0,
-                                "raise_count": 0,
-                                "last_seen_frame": frame_idx
-                            })
-
-                # Remove stale unidentified objects (not seen for 30 frames = 2 seconds at 15 FPS)
-                unidentified_objects = [
-                    obj for obj in unidentified_objects
-                    if frame_idx - obj["last_seen_frame"] < 30
-                ]
-
-                # Check for student IDs that disappeared (sat down)
-                # Mark them as absent so if they reappear later, we count it as a new stand event
-                ABSENCE_THRESHOLD = 15  # frames (1 second at 15 FPS)
-                for student_id in list(student_states.keys()):
-                    if student_id not in seen_student_ids:
-                        state = student_states[student_id]
-                        # If student hasn't been seen for a while, mark them as absent
-                        if frame_idx - state["last_seen_frame"] >= ABSENCE_THRESHOLD:
-                            # Remove from tracking - next appearance will be counted as new stand event
-                            del student_states[student_id]
-
-            # 3. Calculate total counts
-            stand_count = sum(student_stand_counts.values())
-            raise_up_count = sum(student_raise_counts.values()) + total_raise_count_no_id
-
-            # 4. Format student ID list (only students with stand transitions)
-            stand_reid = [
-                {"student_id": sid, "count": count}
-                for sid, count in sorted(student_stand_counts.items())
-                if count > 0
-            ]
-
-            stats = {
-                "student_count": student_count,
-                "stand_count": stand_count,
-                "raise_up_count": raise_up_count,
-                "stand_reid": stand_reid
-            }
 
-            self.logger.info(f"Pose statistics: {stats}")
+            stats = analyzer.stats()
+            self.logger.info(f"Pose statistics ({analyzer.frame_count} frames, {new_frames} new): {stats}")
             return stats
 
         except Exception as e:
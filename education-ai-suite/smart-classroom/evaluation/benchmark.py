@@ -0,0 +1,444 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import psutil
+import yaml
+
+# Ensure the parent directory is in sys.path for direct script execution
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.config_loader import config
+
+RESULT_MARKER = "BENCHMARK_RESULT "
+DEFAULT_MATRIX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_matrix.yaml")
+# Metrics where a larger value is better; all others regress when they grow
+HIGHER_IS_BETTER = {"tps", "acceptance_rate"}
+# Comparison statuses that fail the regression check: slower, or no longer runs at all
+GATE_FAILURES = {"REGRESSION", "failed", "missing"}
+
+SAMPLE_TRANSCRIPT = {
+    "en": "Today we discussed how plants convert light energy into chemical energy through photosynthesis. "
+          "The light dependent reactions take place in the thylakoid membranes and produce ATP and NADPH, "
+          "which the Calvin cycle then uses in the stroma to fix carbon dioxide into sugars. ",
+    "zh": "今天我们讨论了植物如何通过光合作用将光能转化为化学能。光反应发生在类囊体膜上，产生ATP和NADPH，"
+          "随后卡尔文循环在基质中利用它们把二氧化碳固定为糖类。",
+}
+
+
+def expand_cases(matrix):
+    """Cartesian product of the matrix axes, in a stable order."""
+    cases = []
+    asr = matrix.get("asr") or {}
+    for model in asr.get("models", []):
+        for audio_sec in asr.get("audio_lengths_sec", []):
+            for chunk_sec in asr.get("chunk_durations_sec", []):
+                case = dict(kind="asr", audio_sec=audio_sec, chunk_duration_sec=chunk_sec, **model)
+                case["id"] = f"asr/{model['provider']}/{model['name']}/{model['device']}/audio={audio_sec}s/chunk={chunk_sec}s"
+                cases.append(case)
+
+    summarizer = matrix.get("summarizer") or {}
+    for model in summarizer.get("models", []):
+        for weight_format in summarizer.get("weight_formats", []):
+            for prompt_tokens in summarizer.get("prompt_tokens", []):
+                case = dict(kind="summarizer", weight_format=weight_format, prompt_tokens=prompt_tokens,
+                            max_new_tokens=summarizer.get("max_new_tokens", 128), **model)
+                case["id"] = f"summarizer/{model['provider']}/{model['name']}/{weight_format}/{model['device']}/prompt={prompt_tokens}"
+                if model.get("draft_model"):
+                    draft = model["draft_model"]
+                    case["id"] += f"/draft={draft['name']}:{draft['weight_format']}:k={draft['num_assistant_tokens']}"
+                cases.append(case)
+    return cases
+
+
+def resolve_fixtures(matrix, matrix_path):
+    """Fixture settings of the matrix, with relative file paths resolved against the matrix file."""
+    fixtures = dict(matrix.get("fixtures") or {})
+    audio_file = fixtures.get("audio_file")
+    if audio_file and not os.path.isabs(audio_file):
+        fixtures["audio_file"] = os.path.join(os.path.dirname(os.path.abspath(matrix_path)), audio_file)
+    return fixtures
+
+
+class PeakRssSampler:
+    """Samples the RSS of this process (and its children) in the background and keeps the maximum."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, rss, getattr(process.memory_info(), "peak_wset", 0))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def apply_case_config(case):
+    """Points the loaded config at the case's model, before any component module is imported."""
+    if case["kind"] == "asr":
+        section = config.models.asr
+        config.audio_preprocessing.chunk_duration_sec = case["chunk_duration_sec"]
+        config.audio_preprocessing.search_window_sec = min(config.audio_preprocessing.search_window_sec, case["chunk_duration_sec"])
+    else:
+        section = config.models.summarizer
+        section.weight_format = case["weight_format"]
+        section.max_new_tokens = case["max_new_tokens"]
+        # repeated runs of the same prompt must not be served from the prefix cache
+        section.prefix_cache.enabled = False
+        draft = case.get("draft_model")
+        section.draft_model.enabled = bool(draft)
+        if draft:
+            section.draft_model.name = draft["name"]
+            section.draft_model.weight_format = draft["weight_format"]
+            section.draft_model.device = draft.get("device")
+            section.draft_model.num_assistant_tokens = draft["num_assistant_tokens"]
+    section.provider = case["provider"]
+    section.name = case["name"]
+    section.device = case["device"]
+
+
+def write_fixture_audio(audio_file, audio_sec, path):
+    """Tiles (or trims) the fixture recording to exactly audio_sec seconds of 16 kHz mono audio."""
+    from components.ffmpeg.audio_preprocessing import SAMPLE_RATE, decode_audio
+
+    audio = np.resize(decode_audio(audio_file), int(audio_sec * SAMPLE_RATE))
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+
+
+def load_asr_model(case):
+    from utils import ensure_model
+
+    provider, name = case["provider"].lower(), case["name"].lower()
+    if provider == "openvino" and "whisper" in name:
+        from components.asr.openvino.whisper import Whisper
+        ensure_model._download_openvino_model(f"openai/{case['name']}", ensure_model.get_asr_model_path(), None)
+        return Whisper(name, case["device"], None, config.models.asr.threads_limit)
+    if provider == "openai" and "whisper" in name:
+        from components.asr.openai.whisper import Whisper
+        return Whisper(name, case["device"], None)
+    if provider == "funasr" and "paraformer" in name:
+        from components.asr.funasr.paraformer import Paraformer
+        return Paraformer(name, case["device"].lower(), None)
+    raise ValueError(f"Unsupported ASR provider/model: {provider}/{name}")
+
+
+def run_asr_case(case, fixtures):
+    from components.ffmpeg.audio_preprocessing import chunk_audio_by_silence, write_chunk_wav
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = os.path.join(tmp, "fixture.wav")
+        write_fixture_audio(fixtures["audio_file"], case["audio_sec"], audio_path)
+
+        start = time.perf_counter()
+        model = load_asr_model(case)
+        load_sec = time.perf_counter() - start
+
+        stages = {"chunking_sec": 0.0, "feature_extraction_sec": 0.0, "decode_sec": 0.0}
+        chunks, characters = 0, 0
+        start = time.perf_counter()
+        # chunking covers decoding the input and silence detection, as in the pipeline
+        for chunk in chunk_audio_by_silence(audio_path):
+            now = time.perf_counter()
+            stages["chunking_sec"] += now - start
+
+            audio = chunk["audio"]
+            if not model.supports_array_input:
+                audio = write_chunk_wav(audio, chunk["chunk_index"])
+            prepared = model.prepare(audio)
+            prepared_at = time.perf_counter()
+            stages["feature_extraction_sec"] += prepared_at - now
+
+            text = model.transcribe(prepared, temperature=0.0)
+            start = time.perf_counter()
+            stages["decode_sec"] += start - prepared_at
+            chunks += 1
+            characters += len(text or "")
+            if isinstance(audio, str):
+                os.remove(audio)
+
+    processing_sec = sum(stages.values())
+    return {
+        "load_sec": load_sec,
+        **stages,
+        "rtf": processing_sec / case["audio_sec"],
+        "chunks": chunks,
+        "output_chars": characters,
+    }
+
+
+def load_summarizer(case):
+    from utils import ensure_model
+
+    temperature = 0.0  # greedy decoding keeps the generated length reproducible
+    if case["provider"] == "openvino":
+        from components.llm.openvino.summarizer import Summarizer
+        ensure_model._download_openvino_model(case["name"], ensure_model.get_model_path(), case["weight_format"])
+        if case.get("draft_model"):
+            draft = case["draft_model"]
+            ensure_model._download_openvino_model(draft["name"], ensure_model.get_draft_model_path(), draft["weight_format"])
+        return Summarizer(case["name"], case["device"], temperature=temperature)
+    if case["provider"] == "ipex":
+        from components.llm.ipex.summarizer import Summarizer
+        return Summarizer(case["name"], case["device"].lower(), temperature=temperature)
+    raise ValueError(f"Unsupported summarizer provider: {case['provider']}")
+
+
+def build_prompt(tokenizer, prompt_tokens, language):
+    """Chat prompt whose transcript is the sample text repeated to prompt_tokens tokens."""
+    sample = SAMPLE_TRANSCRIPT[language]
+    token_ids = tokenizer.encode(sample, add_special_tokens=False)
+    transcript_ids = (token_ids * (prompt_tokens // len(token_ids) + 1))[:prompt_tokens]
+    transcript = tokenizer.decode(transcript_ids, skip_special_tokens=True)
+    system_prompt = getattr(config.models.summarizer.system_prompt, language)
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": transcript},
+    ]
+    return tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+
+
+def run_summarizer_case(case, fixtures):
+    start = time.perf_counter()
+    model = load_summarizer(case)
+    load_sec = time.perf_counter() - start
+
+    prompt = build_prompt(model.tokenizer, case["prompt_tokens"], fixtures.get("language", "en"))
+    start = time.perf_counter()
+    streamer = model.generate(prompt)
+    text = "".join(token for token in streamer)
+    end = time.perf_counter()
+    if text.startswith("[ERROR]"):
+        raise RuntimeError(text)
+
+    first_token = streamer.first_token_time or end
+    ttft_sec = streamer.prefill_time if streamer.prefill_time is not None else first_token - start
+    decode_sec = end - first_token
+    tokens = streamer.total_tokens
+    metrics = {
+        "load_sec": load_sec,
+        "ttft_sec": ttft_sec,
+        "decode_sec": decode_sec,
+        "tps": (tokens - 1) / decode_sec if tokens > 1 and decode_sec > 0 else 0.0,
+        "generated_tokens": tokens,
+        "total_sec": end - start,
+    }
+    if getattr(streamer, "draft_tokens", None):
+        metrics["acceptance_rate"] = streamer.accepted_draft_tokens / streamer.draft_tokens
+    return metrics
+
+
+def run_case(case, fixtures):
+    """Runs one case in the current (fresh) process and returns its metrics."""
+    apply_case_config(case)
+    with PeakRssSampler() as sampler:
+        if case["kind"] == "asr":
+            metrics = run_asr_case(case, fixtures)
+        else:
+            metrics = run_summarizer_case(case, fixtures)
+    metrics["peak_rss_mb"] = sampler.peak / (1024 * 1024)
+    return metrics
+
+
+def run_case_isolated(case, fixtures, timeout):
+    """Runs a case in a child process, so model caches and peak RSS never leak between cases."""
+    command = [sys.executable, os.path.abspath(__file__), "--run_case", json.dumps({"case": case, "fixtures": fixtures})]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    tail = (result.stderr or result.stdout).strip().splitlines()[-5:]
+    return {"error": f"exit code {result.returncode}: " + " | ".join(tail)}
+
+
+def aggregate(runs):
+    """Median of every numeric metric over the successful runs."""
+    ok = [run for run in runs if "error" not in run]
+    if not ok:
+        return {"error": runs[-1]["error"] if runs else "no runs"}
+    return {key: statistics.median(run[key] for run in ok) for key in ok[0] if isinstance(ok[0][key], (int, float))}
+
+
+def environment_info(matrix_path):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10).stdout.strip()
+    except Exception:
+        commit = ""
+    with open(matrix_path, "rb") as f:
+        matrix_hash = hashlib.sha256(f.read()).hexdigest()[:12]
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "matrix": os.path.basename(matrix_path),
+        "matrix_sha256": matrix_hash,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": psutil.cpu_count(logical=True),
+        "memory_gb": round(psutil.virtual_memory().total / 1024 ** 3, 1),
+        "python": platform.python_version(),
+        "cpu_affinity": psutil.Process().cpu_affinity() if hasattr(psutil.Process, "cpu_affinity") else None,
+    }
+
+
+def compare_reports(report, baseline, thresholds):
+    """
+    Compares every metric with a threshold against the baseline case with the same id.
+    Returns rows of (case_id, metric, baseline, current, relative change, status).
+    """
+    baseline_cases = {case["id"]: case for case in baseline.get("results", [])}
+    rows = []
+    for case in report.get("results", []):
+        previous = baseline_cases.get(case["id"])
+        if previous is None:
+            rows.append((case["id"], "-", None, None, None, "new"))
+            continue
+        if "error" in case["metrics"]:
+            rows.append((case["id"], "-", None, None, None, "failed"))
+            continue
+        for metric, threshold in thresholds.items():
+            old, new = previous["metrics"].get(metric), case["metrics"].get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            status = "REGRESSION" if worse > threshold else ("improved" if worse < -threshold else "ok")
+            rows.append((case["id"], metric, old, new, change, status))
+    for case_id in baseline_cases.keys() - {case["id"] for case in report.get("results", [])}:
+        rows.append((case_id, "-", None, None, None, "missing"))
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'case':<70} {'metric':<24} {'baseline':>10} {'current':>10} {'change':>8}  status")
+    for case_id, metric, old, new, change, status in rows:
+        if change is None:
+            print(f"{case_id:<70} {metric:<24} {'':>10} {'':>10} {'':>8}  {status}")
+        else:
+            print(f"{case_id:<70} {metric:<24} {old:>10.3f} {new:>10.3f} {change:>+8.1%}  {status}")
+
+
+def select_cases(cases, only=None, text=""):
+    """Cases (or report results) whose id belongs to the --only part and contains the --filter text."""
+    return [case for case in cases if (not only or case["id"].startswith(f"{only}/")) and text in case["id"]]
+
+
+def parse_thresholds(matrix, overrides):
+    thresholds = dict(matrix.get("thresholds") or {})
+    for item in overrides or []:
+        metric, value = item.split("=", 1)
+        thresholds[metric.strip()] = float(value)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducible ASR / summarizer benchmark over a fixed matrix")
+    parser.add_argument("--matrix", default=DEFAULT_MATRIX, help="benchmark matrix yaml")
+    parser.add_argument("--audio_file", help="fixture audio (overrides fixtures.audio_file in the matrix)")
+    parser.add_argument("--output", default="benchmark_report.json", help="machine-readable report to write")
+    parser.add_argument("--baseline", help="report to compare against; exits with 1 on a regression, failed or missing case")
+    parser.add_argument("--compare", help="only compare this existing report with --baseline, do not run")
+    parser.add_argument("--threshold", action="append", help="override a regression threshold, e.g. --threshold ttft_sec=0.05")
+    parser.add_argument("--only", choices=["asr", "summarizer"], help="run only one part of the matrix")
+    parser.add_argument("--filter", default="", help="run only cases whose id contains this text")
+    parser.add_argument("--repeat", type=int, help="runs per case (overrides the matrix)")
+    parser.add_argument("--timeout", type=int, default=3600, help="seconds allowed per run")
+    parser.add_argument("--cpu_cores", type=str, default="", help="Comma-separated list of CPU core indices to bind (inherited by the runs)")
+    parser.add_argument("--run_case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        payload = json.loads(args.run_case)
+        print(RESULT_MARKER + json.dumps(run_case(payload["case"], payload["fixtures"])), flush=True)
+        return
+
+    with open(args.matrix, "r", encoding="utf-8") as f:
+        matrix = yaml.safe_load(f)
+    thresholds = parse_thresholds(matrix, args.threshold)
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare needs --baseline")
+        report = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report["results"] = select_cases(report.get("results", []), args.only, args.filter)
+    else:
+        if args.cpu_cores.strip():
+            psutil.Process().cpu_affinity([int(x) for x in args.cpu_cores.split(",") if x.strip()])
+
+        fixtures = resolve_fixtures(matrix, args.matrix)
+        if args.audio_file:
+            fixtures["audio_file"] = args.audio_file
+        cases = select_cases(expand_cases(matrix), args.only, args.filter)
+        if any(c["kind"] == "asr" for c in cases):
+            if not fixtures.get("audio_file") or not os.path.exists(fixtures["audio_file"]):
+                parser.error("ASR cases need a fixture recording: set fixtures.audio_file or pass --audio_file")
+            fixtures["audio_file"] = os.path.abspath(fixtures["audio_file"])
+
+        repeat = args.repeat or matrix.get("repeat", 1)
+        results = []
+        for index, case in enumerate(cases, 1):
+            print(f"[{index}/{len(cases)}] {case['id']}", flush=True)
+            runs = [run_case_isolated(case, fixtures, args.timeout) for _ in range(repeat)]
+            metrics = aggregate(runs)
+            print("    " + (metrics["error"] if "error" in metrics else
+                            ", ".join(f"{k}={v:.3f}" for k, v in metrics.items())), flush=True)
+            results.append({"id": case["id"], "case": case, "runs": len(runs), "metrics": metrics})
+
+        report = {"environment": environment_info(args.matrix), "thresholds": thresholds, "results": results}
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Report saved to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        # baseline cases outside --only/--filter were not run, so they are not missing
+        baseline["results"] = select_cases(baseline.get("results", []), args.only, args.filter)
+        rows = compare_reports(report, baseline, thresholds)
+        print_comparison(rows)
+        failures = [row for row in rows if row[5] in GATE_FAILURES]
+        if failures:
+            print(f"Regression check failed: {len(failures)} regressed, failed or missing results")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+# Ensure the parent directory is in sys.path for direct script execution
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from transformers import AutoTokenizer
+
+from utils.config_loader import config
+from utils.detokenizer import StreamingDetokenizer
+from utils.ensure_model import get_model_path
+
+
+SAMPLE_TEXT = {
+    "en": "Today we discussed how plants convert light energy into chemical energy through photosynthesis. ",
+    "zh": "今天我们讨论了植物如何通过光合作用将光能转化为化学能，并介绍了卡尔文循环的主要步骤。",
+}
+
+
+def full_history_decode(tokenizer, token_ids):
+    """Previous streamer behaviour: decode the whole output for every new token."""
+    cache, printed = [], 0
+    for token_id in token_ids:
+        cache.append(token_id)
+        text = tokenizer.decode(cache, skip_special_tokens=True)
+        new_text, printed = text[printed:], len(text)
+        yield new_text
+
+
+def incremental_decode(tokenizer, token_ids):
+    detokenizer = StreamingDetokenizer(tokenizer)
+    for token_id in token_ids:
+        yield detokenizer.put(token_id)
+    detokenizer.flush()
+
+
+def per_token_cost(decoder, tokenizer, token_ids, buckets):
+    """Average per-token decode time (microseconds) for each consecutive bucket of tokens."""
+    timings = []
+    start = time.perf_counter()
+    for _ in decoder(tokenizer, token_ids):
+        now = time.perf_counter()
+        timings.append(now - start)
+        start = now
+    size = max(1, len(timings) // buckets)
+    return [sum(timings[i:i + size]) / len(timings[i:i + size]) * 1e6 for i in range(0, size * buckets, size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-token detokenization cost: full-history decode vs StreamingDetokenizer")
+    parser.add_argument("--tokenizer", default=None, help="tokenizer path or hub id (default: configured summarizer model)")
+    parser.add_argument("--tokens", type=int, default=config.models.summarizer.max_new_tokens, help="number of generated tokens to simulate")
+    parser.add_argument("--language", default=config.models.summarizer.language, choices=["en", "zh"])
+    parser.add_argument("--buckets", type=int, default=8)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer or get_model_path(), trust_remote_code=True)
+    text = SAMPLE_TEXT[args.language]
+    token_ids = tokenizer.encode(text * (args.tokens // max(1, len(tokenizer.encode(text))) + 1), add_special_tokens=False)[:args.tokens]
+
+    print(f"Tokens: {len(token_ids)}, buckets of {len(token_ids) // args.buckets} tokens, cost in us/token")
+    for name, decoder in (("full-history", full_history_decode), ("incremental", incremental_decode)):
+        costs = per_token_cost(decoder, tokenizer, token_ids, args.buckets)
+        print(f"{name:>13}: " + "  ".join(f"{c:8.1f}" for c in costs) + f"   (last/first = {costs[-1] / costs[0]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
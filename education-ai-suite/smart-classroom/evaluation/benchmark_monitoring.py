@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ensure the parent directory is in sys.path for direct script execution
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from monitoring.metrics_buffer import LOG_FILES, MetricsMonitor
+
+
+def full_reparse(metrics_logs):
+    """Previous /metrics behaviour: re-read every CSV from the start on each poll."""
+    result = {}
+    for key, (file_name, indices) in LOG_FILES.items():
+        file_path = os.path.join(metrics_logs, file_name)
+        if not os.path.exists(file_path):
+            result[key] = []
+            continue
+        with open(file_path, "r") as f:
+            lines = f.readlines()
+        result[key] = [[v[0]] + [float(v[i]) for i in indices] for v in (line.strip().split(",") for line in lines[1:])]
+    return result
+
+
+def append_samples(metrics_logs, start, first_sample, count, interval):
+    """Appends `count` collector rows to every CSV, as the collectors would over count * interval seconds."""
+    for file_name, indices in LOG_FILES.values():
+        file_path = os.path.join(metrics_logs, file_name)
+        with open(file_path, "a") as f:
+            if first_sample == 0:
+                f.write("timestamp," + ",".join(f"value_{i}" for i in indices) + "\n")
+            for n in range(first_sample, first_sample + count):
+                timestamp = (start + timedelta(seconds=n * interval)).strftime("%Y-%m-%dT%H:%M:%S")
+                f.write(timestamp + "," + ",".join(f"{(n * i) % 100:.1f}" for i in indices) + "\n")
+
+
+def time_polls(poll, polls):
+    start = time.perf_counter()
+    for _ in range(polls):
+        poll()
+    return (time.perf_counter() - start) / polls * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/metrics latency over a long session: full re-parse vs incremental ring buffers")
+    parser.add_argument("--hours", type=int, default=6, help="simulated session length")
+    parser.add_argument("--interval", type=float, default=2.0, help="collector interval in seconds")
+    parser.add_argument("--buffer_size", type=int, default=7200, help="samples kept per metric")
+    parser.add_argument("--last", type=int, default=300, help="samples requested per poll")
+    parser.add_argument("--points", type=int, default=None, help="downsample the requested samples to this many windows")
+    parser.add_argument("--polls", type=int, default=20, help="polls timed per checkpoint")
+    args = parser.parse_args()
+
+    samples_per_hour = int(3600 / args.interval)
+    start = datetime.now()
+    with tempfile.TemporaryDirectory() as metrics_logs:
+        monitor = MetricsMonitor(metrics_logs, args.buffer_size)
+        print(f"{'hour':>4} {'samples':>8} {'full re-parse ms':>17} {'incremental ms':>15}")
+        for hour in range(args.hours):
+            # the session runs while the dashboard keeps polling
+            step = max(1, samples_per_hour // args.polls)
+            for first in range(hour * samples_per_hour, (hour + 1) * samples_per_hour, step):
+                append_samples(metrics_logs, start, first, min(step, (hour + 1) * samples_per_hour - first), args.interval)
+                monitor.snapshot(args.last, args.points)
+
+            total = (hour + 1) * samples_per_hour
+            full_ms = time_polls(lambda: full_reparse(metrics_logs), args.polls)
+            incremental_ms = time_polls(lambda: monitor.snapshot(args.last, args.points), args.polls)
+            print(f"{hour + 1:>4} {total:>8} {full_ms:>17.2f} {incremental_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from fastapi import FastAPI
 from api.endpoints import register_routes
 from utils.runtime_config_loader import RuntimeConfig
 from utils.ensure_model import ensure_model
-from utils.preload_models import preload_models
+from utils.preload_models import preload_models, start_preload_models
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -16,6 +16,7 @@ from fastapi.staticfiles import StaticFiles
 from starlette.responses import FileResponse
 from pathlib import Path
 from components.va.media_service import MediaService
+from utils.config_loader import config
 
 
 logger = logging.getLogger(__name__)
@@ -28,7 +29,7 @@ app.add_middleware(
     allow_credentials=True,          # cookies/auth allowed
     allow_methods=["*"],             # allow all HTTP methods
     allow_headers=["*"],             # allow all headers
-    expose_headers=["x-session-id"]  # expose custom headers if needed
+    expose_headers=["x-session-id", "x-job-id", "x-queue-position", "x-queue-eta"]  # expose custom headers if needed
 )
 
 register_routes(app)
@@ -42,7 +43,10 @@ if __name__ == "__main__":
     system_check()
     RuntimeConfig.ensure_config_exists()
     ensure_model()
-    preload_models()
+    if config.startup.background:
+        start_preload_models()
+    else:
+        preload_models()
 
     media_service = MediaService()
     media_service.launch_server()
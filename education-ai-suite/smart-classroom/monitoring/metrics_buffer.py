@@ -0,0 +1,193 @@
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# metric key -> (csv file written by the collector, value columns)
+LOG_FILES = {
+    "cpu_utilization": ("cpu_utilization.csv", [1]),
+    "gpu_utilization": ("gpu_metrics.csv", [1, 2, 3, 4, 5, 6, 7, 8, 9]),
+    "memory": ("memory_metrics.csv", [1, 2, 3, 4]),
+    "power": ("power_metrics.csv", [1]),
+    "npu_utilization": ("npu_metrics.csv", [1]),
+}
+
+
+class MetricRingBuffer:
+    """Fixed-size buffer of (timestamp, values) samples; the oldest samples are overwritten."""
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = max(1, int(capacity))
+        self.width = width
+        self._values = np.zeros((self.capacity, width))
+        self._timestamps: List[Optional[str]] = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp: str, values: Sequence[float]):
+        self._values[self._next] = values
+        self._timestamps[self._next] = timestamp
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    def _indices(self, last: Optional[int]) -> np.ndarray:
+        n = self._size if last is None else max(0, min(int(last), self._size))
+        return (self._next - n + np.arange(n)) % self.capacity
+
+    def last(self, n: Optional[int] = None) -> List[list]:
+        """The last n samples (all buffered samples by default), oldest first, as [timestamp, *values]."""
+        idx = self._indices(n)
+        values = self._values[idx].tolist()
+        return [[self._timestamps[i]] + row for i, row in zip(idx.tolist(), values)]
+
+    def downsample(self, points: int, last: Optional[int] = None) -> List[list]:
+        """
+        Averages the last samples into at most `points` consecutive windows.
+        Each window is reported with the timestamp of its newest sample.
+        """
+        idx = self._indices(last)
+        if len(idx) <= points:
+            return self.last(len(idx))
+
+        windows = np.array_split(idx, points)
+        means = np.stack([self._values[w].mean(axis=0) for w in windows]).tolist()
+        return [[self._timestamps[int(w[-1])]] + row for w, row in zip(windows, means)]
+
+
+class CsvLogTail:
+    """
+    Follows a CSV file written by one of the collectors in monitoring/scripts.
+
+    Remembers the byte offset of the last complete line, so each read parses only newly
+    appended rows. A file that is replaced (another file at the path, as a new collector run
+    creates) or shrinks is re-read from the start.
+    """
+
+    def __init__(self, file_path: str, indices: Sequence[int]):
+        self.file_path = file_path
+        self.indices = list(indices)
+        self._offset = 0
+        self._partial = b""
+        self._identity = None
+
+    def read_new(self):
+        """Returns (rows, reset) where rows are [timestamp, *values] parsed since the last call."""
+        stat = os.stat(self.file_path)
+        size = stat.st_size
+        identity = (stat.st_dev, stat.st_ino)
+        reset = (self._identity is not None and identity != self._identity) or size < self._offset
+        if reset:
+            self._offset, self._partial = 0, b""
+        self._identity = identity
+        if size == self._offset:
+            return [], reset
+
+        with open(self.file_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        skip_header = self._offset == 0
+        self._offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if skip_header and lines:
+            lines = lines[1:]
+
+        rows = []
+        for line in lines:
+            values = line.decode("utf-8", errors="replace").strip().split(",")
+            if len(values) <= max(self.indices):
+                continue
+            try:
+                rows.append([values[0]] + [float(values[i]) for i in self.indices])
+            except ValueError:
+                logger.debug(f"Skipping malformed line in {self.file_path}: {line!r}")
+        return rows, reset
+
+
+class MetricsMonitor:
+    """Ring buffers of the utilization metrics of one logs directory, filled incrementally from the collector CSVs."""
+
+    def __init__(self, metrics_logs: str, capacity: int):
+        self.metrics_logs = metrics_logs
+        self._lock = threading.Lock()
+        self._tails: Dict[str, CsvLogTail] = {}
+        self._buffers: Dict[str, MetricRingBuffer] = {}
+        self._missing_logged = set()
+        for key, (file_name, indices) in LOG_FILES.items():
+            self._tails[key] = CsvLogTail(os.path.join(metrics_logs, file_name), indices)
+            self._buffers[key] = MetricRingBuffer(capacity, len(indices))
+
+    def refresh(self):
+        for key, tail in self._tails.items():
+            if not os.path.exists(tail.file_path):
+                if key not in self._missing_logged:
+                    logger.warning(f"Log file {tail.file_path} does not exist.")
+                    self._missing_logged.add(key)
+                continue
+            try:
+                rows, reset = tail.read_new()
+            except Exception as e:
+                logger.error(f"Error reading log file {tail.file_path}: {e}")
+                continue
+            buffer = self._buffers[key]
+            if reset:
+                buffer.clear()
+            for row in rows:
+                buffer.append(row[0], row[1:])
+
+    def snapshot(self, last: Optional[int] = None, points: Optional[int] = None) -> Dict[str, List[list]]:
+        """
+        Latest samples per metric. `last` limits the number of samples, `points` averages
+        them into at most that many windows (for charts over long sessions).
+        """
+        with self._lock:
+            self.refresh()
+            if points:
+                return {key: buffer.downsample(points, last) for key, buffer in self._buffers.items()}
+            return {key: buffer.last(last) for key, buffer in self._buffers.items()}
+
+
+class MetricsMonitorRegistry:
+    """
+    MetricsMonitor per logs directory, bounded to the `max_monitors` most recently used ones.
+    Every session has its own logs directory, so monitors of old sessions are evicted; asking
+    for an evicted directory again rebuilds its buffers from the CSVs on disk.
+    """
+
+    def __init__(self, capacity: int, max_monitors: int = 4):
+        self.capacity = capacity
+        self.max_monitors = max(1, int(max_monitors))
+        self._monitors: "OrderedDict[str, MetricsMonitor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, metrics_logs: str) -> MetricsMonitor:
+        key = os.path.abspath(metrics_logs)
+        with self._lock:
+            monitor = self._monitors.get(key)
+            if monitor is None:
+                monitor = self._monitors[key] = MetricsMonitor(metrics_logs, self.capacity)
+            self._monitors.move_to_end(key)
+            while len(self._monitors) > self.max_monitors:
+                self._monitors.popitem(last=False)
+            return monitor
+
+    def evict(self, metrics_logs: str):
+        with self._lock:
+            self._monitors.pop(os.path.abspath(metrics_logs), None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._monitors)
@@ -7,12 +7,16 @@ from monitoring.scripts.windows.collect_gpu import start_gpu_monitoring
 from monitoring.scripts.common.collect_memory import start_memory_monitoring
 from monitoring.scripts.windows.collect_power import start_power_monitoring
 from monitoring.scripts.windows.collect_npu import start_npu_monitoring
+from monitoring.metrics_buffer import MetricsMonitorRegistry
 import logging
 import platform
 
 logger = logging.getLogger(__name__)
 INTERVAL_SECONDS = config.monitoring.interval
 OUTPUT_DIR = config.monitoring.logs_dir
+# samples kept in memory per metric (4 hours at the default 2s interval)
+BUFFER_SIZE = config.monitoring.buffer_size
+MAX_MONITORS = config.monitoring.max_monitors
 monitoring_threads=[]
 os_name = platform.system()
 
@@ -24,48 +28,16 @@ collector_scripts = {
     "npu_collector": start_npu_monitoring if os_name == "Windows" else None
 }
 
-def read_log_file(file_path, indices):
-    try:
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-            data = []
-            for line in lines[1:]:  # Skip header
-                values = line.strip().split(",")
-                timestamp = values[0]
-                data_points = [float(values[i]) for i in indices]
-                data.append([timestamp] + data_points)
-            return data
-    except Exception as e:
-        logger.error(f"Error reading log file {file_path}: {e}")
-        return []
+_monitors = MetricsMonitorRegistry(BUFFER_SIZE, MAX_MONITORS)
+_active_logs = None
 
-def monitor_logs(metrics_logs):
-    latest_utilization = {
-        "cpu_utilization": [],
-        "gpu_utilization": [],
-        "memory": [],
-        "power": [],
-        "npu_utilization": []
-    }
-
-    log_files = {
-        "cpu_utilization": (os.path.join(metrics_logs, "cpu_utilization.csv"), [1]),
-        "gpu_utilization": (os.path.join(metrics_logs, "gpu_metrics.csv"), [1, 2, 3, 4, 5, 6,7,8,9]),
-        "memory": (os.path.join(metrics_logs, "memory_metrics.csv"), [1, 2, 3,4]),
-        "power": (os.path.join(metrics_logs, "power_metrics.csv"), [1]),
-        "npu_utilization": (os.path.join(metrics_logs, "npu_metrics.csv"), [1])
-    }
-
-    for key, (file_path, indices) in log_files.items():
-        if os.path.exists(file_path):
-            latest_utilization[key] = read_log_file(file_path, indices)
-        else:
-            logger.warning(f"Log file {file_path} does not exist.")
-    return latest_utilization
+def monitor_logs(metrics_logs, last=None, points=None):
+    return _monitors.get(metrics_logs).snapshot(last, points)
 
 def start_monitoring(metrics_logs="./logs"):
-    global stop_event
+    global stop_event, _active_logs
     stop_event = threading.Event()
+    _active_logs = metrics_logs
     logger.info("Starting monitoring processes")
     monitoring_threads=[]
     for k,v in collector_scripts.items():
@@ -82,9 +54,12 @@ def stop_monitoring():
     stop_event.set()
     for mt in monitoring_threads:
         mt.join()
+    # the samples stay in the CSVs; a later get_metrics() reloads them if needed
+    if _active_logs is not None:
+        _monitors.evict(_active_logs)
     logger.info("Stopped monitoring processes")
 
-def get_metrics(metrics_logs="./logs"):
-    latest_utilization = monitor_logs(metrics_logs)
+def get_metrics(metrics_logs="./logs", last=None, points=None):
+    latest_utilization = monitor_logs(metrics_logs, last, points)
     logger.info("Returning latest utilization metrics")
     return latest_utilization
\ No newline at end of file
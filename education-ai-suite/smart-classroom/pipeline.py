@@ -6,6 +6,7 @@ import logging, os
 from utils.session_manager import generate_session_id
 from components.summarizer_component import SummarizerComponent
 from components.mindmap_component import MindmapComponent
+from components.map_reduce_component import MapReduceSummarizerComponent
 from utils.runtime_config_loader import RuntimeConfig
 from utils.storage_manager import StorageManager
 from utils.markdown_cleaner import markdown_to_plain
@@ -36,6 +37,7 @@ class Pipeline:
             )
         
         self.mindmap_component.model = self.summarizer_pipeline[0].summarizer
+        self.map_reduce_enabled = config.models.summarizer.map_reduce.enabled
 
     def run_transcription(self, input):
         project_config = RuntimeConfig.get_section("Project")
@@ -44,8 +46,17 @@ class Pipeline:
         for component in self.transcription_pipeline:
             input_gen = component.process(input_gen)
 
+        # Start summarizing finished segments while the lecture is still being transcribed
+        incremental = None
+        if self.map_reduce_enabled and config.models.summarizer.map_reduce.incremental:
+            incremental = MapReduceSummarizerComponent(self.session_id, self.summarizer_pipeline[0])
+        chunk_texts = []
+
         try:
             for chunk_trancription in input_gen:
+                if incremental is not None:
+                    chunk_texts.append(chunk_trancription.get("text"))
+                    incremental.summarize_ready_segments(chunk_texts)
                 yield chunk_trancription
         finally:
             pass
@@ -68,8 +79,12 @@ class Pipeline:
             logger.error(f"An unexpected error occurred while accessing the transcription.")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred while accessing the transcription.")
         
-        for component in self.summarizer_pipeline:
-            input = component.process(input)
+        if self.map_reduce_enabled:
+            map_reduce = MapReduceSummarizerComponent(self.session_id, self.summarizer_pipeline[0])
+            input = map_reduce.process(map_reduce.load_chunk_texts())
+        else:
+            for component in self.summarizer_pipeline:
+                input = component.process(input)
 
         try:
             for token in input:
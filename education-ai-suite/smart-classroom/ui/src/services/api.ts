@@ -119,7 +119,7 @@ export async function startSession(req: StartSessionRequest): Promise<StartSessi
   return (await res.json()) as StartSessionResponse;});
 }
 
-export async function uploadAudio(file: File): Promise<{ filename: string; message: string; path: string }> {
+export async function uploadAudio(file: File): Promise<{ filename: string; message: string; path: string; sha256: string; duplicate: boolean }> {
   return safeApiCall(async () => {
   const form = new FormData();
   form.append('file', file);
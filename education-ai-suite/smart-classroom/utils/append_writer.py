@@ -0,0 +1,91 @@
+import os
+import threading
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class _PathBuffer:
+    def __init__(self):
+        self.parts: List[str] = []
+        self.size = 0
+        self.lock = threading.Lock()  # serializes flushes of this path
+
+
+class AppendWriterService:
+    """
+    Long-lived, per-path buffered text appender.
+
+    Writes are coalesced in memory and flushed by a single background thread when a
+    path's buffer reaches `flush_bytes`, every `flush_interval` seconds, or explicitly
+    through flush()/close(). Appends to the same path always land in call order.
+    """
+
+    def __init__(self, flush_bytes: int = 4096, flush_interval: float = 0.5):
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buffers: Dict[str, _PathBuffer] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="append-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush_all()
+
+    def write(self, path: str, data: str):
+        if not data:
+            return
+        with self._lock:
+            buffer = self._buffers.get(path)
+            if buffer is None:
+                buffer = self._buffers[path] = _PathBuffer()
+            buffer.parts.append(data)
+            buffer.size += len(data)
+            full = buffer.size >= self.flush_bytes
+            self._ensure_thread()
+        if full:
+            self._wakeup.set()
+
+    def flush(self, path: str):
+        with self._lock:
+            buffer = self._buffers.get(path)
+        if buffer is not None:
+            self._flush_buffer(path, buffer)
+
+    def flush_all(self):
+        with self._lock:
+            items = list(self._buffers.items())
+        for path, buffer in items:
+            self._flush_buffer(path, buffer)
+
+    def close(self, path: str):
+        """Flushes pending data for `path` and releases its buffer (end of stream/session)."""
+        self.flush(path)
+        with self._lock:
+            buffer = self._buffers.get(path)
+            if buffer is not None and not buffer.parts:
+                del self._buffers[path]
+
+    def _flush_buffer(self, path: str, buffer: _PathBuffer):
+        # Holding the per-path lock across swap + write keeps concurrent flushes ordered
+        with buffer.lock:
+            with self._lock:
+                parts, buffer.parts, buffer.size = buffer.parts, [], 0
+            if not parts:
+                return
+            try:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(parts))
+            except Exception as e:
+                logger.error(f"Failed to flush buffered writes to {path}: {e}")
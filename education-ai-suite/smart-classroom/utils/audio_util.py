@@ -1,4 +1,8 @@
 import os
+import json
+import hashlib
+import tempfile
+import threading
 import logging
 from fastapi import UploadFile, HTTPException
 from utils.config_loader import config
@@ -6,7 +10,17 @@ from utils.runtime_config_loader import RuntimeConfig
 
 logger = logging.getLogger(__name__)
 
+# sha256 -> file name of the uploads stored in a project's audio folder
+AUDIO_INDEX_FILE = "audio_index.json"
+_index_lock = threading.Lock()
+
 def save_audio_file(file: UploadFile):
+    """
+    Streams an upload into the project's audio folder.
+
+    Returns (filename, path, sha256, duplicate). When the same content was uploaded
+    before, the existing file is returned and the new copy is discarded.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     allowed_extensions = [ext.lower() for ext in config.audio_util.allowed_extensions]
@@ -25,25 +39,73 @@ def save_audio_file(file: UploadFile):
     if ext not in allowed_extensions:
         raise HTTPException(status_code=400, detail="Invalid file type")
 
-    contents = bytearray()
-    total_read = 0
-    chunk_size = config.audio_util.chunk_size 
+    file_path = os.path.join(project_path, file.filename)
+    content_hash, temp_path = _stream_to_temp_file(file, project_path, max_file_size_bytes)
 
-    while True:
-        chunk = file.file.read(chunk_size)
-        if not chunk:
-            break
-        total_read += len(chunk)
-        if total_read > max_file_size_bytes:
-            raise HTTPException(status_code=400, detail="File too large")
-        contents.extend(chunk)
+    with _index_lock:
+        index = _load_index(project_path)
+        existing = index.get(content_hash)
+        if existing and os.path.exists(os.path.join(project_path, existing)):
+            # Same bytes were uploaded before: keep the stored copy, drop the new one
+            os.remove(temp_path)
+            logger.info(f"Duplicate upload of {existing} (sha256={content_hash}), not stored again")
+            return existing, os.path.join(project_path, existing), content_hash, True
 
-    file.file.seek(0)
+        os.replace(temp_path, file_path)
+        # An overwritten file no longer has its previous content
+        index = {h: name for h, name in index.items() if name != file.filename}
+        index[content_hash] = file.filename
+        _save_index(project_path, index)
 
-    file_path = os.path.join(project_path, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    logger.info(f"File saved: {file_path} (sha256={content_hash})")
+
+    return file.filename, file_path, content_hash, False
+
+
+def _stream_to_temp_file(file: UploadFile, project_path: str, max_file_size_bytes: int):
+    """
+    Copies the upload to a temporary file next to its destination in fixed-size blocks,
+    hashing the bytes on the way, so the upload is never held in memory as a whole.
+    """
+    chunk_size = config.audio_util.chunk_size
+    digest = hashlib.sha256()
+    total_read = 0
+    fd, temp_path = tempfile.mkstemp(dir=project_path, prefix=".upload-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = file.file.read(chunk_size)
+                if not chunk:
+                    break
+                total_read += len(chunk)
+                if total_read > max_file_size_bytes:
+                    raise HTTPException(status_code=400, detail="File too large")
+                digest.update(chunk)
+                f.write(chunk)
+            # complete on disk before it is renamed into place and probed
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return digest.hexdigest(), temp_path
+
+
+def _load_index(project_path: str) -> dict:
+    index_path = os.path.join(project_path, AUDIO_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable audio index {index_path}: {e}")
+        return {}
 
-    logger.info(f"File saved: {file_path}")
 
-    return file.filename, file_path
+def _save_index(project_path: str, index: dict):
+    index_path = os.path.join(project_path, AUDIO_INDEX_FILE)
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(temp_path, index_path)
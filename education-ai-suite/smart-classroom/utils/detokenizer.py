@@ -0,0 +1,77 @@
+from typing import Iterable, List, Union
+
+
+def is_cjk(cp: int) -> bool:
+    return (
+        0x4E00 <= cp <= 0x9FFF or 0x3400 <= cp <= 0x4DBF or 0x20000 <= cp <= 0x2A6DF or
+        0x2A700 <= cp <= 0x2B73F or 0x2B740 <= cp <= 0x2B81F or 0x2B820 <= cp <= 0x2CEAF or
+        0xF900 <= cp <= 0xFAFF or 0x2F800 <= cp <= 0x2FA1F
+    )
+
+
+class StreamingDetokenizer:
+    """
+    Incremental detokenizer shared by the OpenVINO and IPEX streamers.
+
+    Each step decodes only the tokens since the last emitted text (plus the tokens of that
+    emission as left context), so per-token cost does not grow with the output length.
+    Text is held back while it ends in an incomplete multi-byte sequence (U+FFFD), and
+    released on word boundaries: after whitespace, after a CJK character, or before a
+    token that starts a new word.
+    """
+
+    def __init__(self, tokenizer, skip_special_tokens: bool = True):
+        self.tokenizer = tokenizer
+        self.skip_special_tokens = skip_special_tokens
+        self._tokens: List[int] = []
+        self._prefix_offset = 0  # start of the left-context window in _tokens
+        self._read_offset = 0    # tokens before this were already turned into text
+        self._pending = ""       # decoded text not yet released at a word boundary
+
+    def _decode(self, tokens) -> str:
+        return self.tokenizer.decode(tokens, skip_special_tokens=self.skip_special_tokens)
+
+    def _decode_delta(self) -> str:
+        prefix_text = self._decode(self._tokens[self._prefix_offset:self._read_offset])
+        new_text = self._decode(self._tokens[self._prefix_offset:])
+        if len(new_text) <= len(prefix_text) or new_text.endswith("�"):
+            return ""
+
+        # Drop tokens that can no longer influence decoding to keep the window small
+        self._tokens = self._tokens[self._read_offset:]
+        self._prefix_offset, self._read_offset = 0, len(self._tokens)
+        return new_text[len(prefix_text):]
+
+    def put(self, token_ids: Union[int, Iterable[int]]) -> str:
+        """Adds generated token(s) and returns text that is safe to emit (possibly empty)."""
+        if isinstance(token_ids, int):
+            self._tokens.append(token_ids)
+        else:
+            self._tokens.extend(int(t) for t in token_ids)
+
+        delta = self._decode_delta()
+        if not delta:
+            return ""
+
+        self._pending += delta
+        if self._is_safe_to_emit(self._pending):
+            text, self._pending = self._pending, ""
+            return text
+        if delta.startswith(" ") and len(self._pending) > len(delta):
+            # A new word started: everything before it is complete
+            text, self._pending = self._pending[:-len(delta)], delta
+            return text
+        return ""
+
+    def flush(self) -> str:
+        """Returns all remaining text at the end of generation and resets the state."""
+        tail = self._decode(self._tokens[self._prefix_offset:])
+        prefix_text = self._decode(self._tokens[self._prefix_offset:self._read_offset])
+        text = self._pending + tail[len(prefix_text):]
+        self._tokens, self._prefix_offset, self._read_offset, self._pending = [], 0, 0, ""
+        return text
+
+    @staticmethod
+    def _is_safe_to_emit(text: str) -> bool:
+        last_char = text[-1]
+        return is_cjk(ord(last_char)) or last_char.isspace()
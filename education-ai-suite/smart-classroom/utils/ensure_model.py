@@ -53,6 +53,9 @@ def ensure_model():
     if config.models.summarizer.provider == "openvino":
         output_dir = get_model_path()
         _download_openvino_model(config.models.summarizer.name, output_dir, config.models.summarizer.weight_format)
+        draft_config = config.models.summarizer.draft_model
+        if draft_config.enabled:
+            _download_openvino_model(draft_config.name, get_draft_model_path(), draft_config.weight_format)
     if config.models.asr.provider == "openvino":
         output_dir = get_asr_model_path()
         _download_openvino_model(f"openai/{config.models.asr.name}", output_dir, None)
@@ -64,6 +67,10 @@ def ensure_model():
 def get_model_path() -> str:
     return os.path.join(config.models.summarizer.models_base_path, config.models.summarizer.provider, f"{config.models.summarizer.name.replace('/', '_')}_{config.models.summarizer.weight_format}")
 
+def get_draft_model_path() -> str:
+    draft_config = config.models.summarizer.draft_model
+    return os.path.join(config.models.summarizer.models_base_path, config.models.summarizer.provider, f"{draft_config.name.replace('/', '_')}_{draft_config.weight_format}")
+
 def get_asr_model_path() -> str:
     return os.path.join(config.models.asr.models_base_path, config.models.asr.provider, f"{config.models.asr.name.replace('/', '_')}")
 
@@ -0,0 +1,26 @@
+def prefix_cache_metrics(streamer, stage):
+    # Reported by summarizers with a prompt-prefix cache, see components/llm/*/summarizer.py.
+    # Hit and reused tokens are only known where the summarizer reuses the KV cache itself (ipex)
+    if streamer is None or not getattr(streamer, "prefix_cache_enabled", False):
+        return {}
+    metrics = {}
+    if streamer.prefix_cache_hit is not None:
+        metrics[f"performance.{stage}_prefix_cache_hit"] = int(streamer.prefix_cache_hit)
+        metrics[f"performance.{stage}_cached_prefix_tokens"] = streamer.cached_prefix_tokens
+    if streamer.prefill_time is not None:
+        metrics[f"performance.{stage}_prefill_time"] = round(streamer.prefill_time, 4)
+    return metrics
+
+
+def speculative_metrics(streamer, stage):
+    # Decode-phase throughput (first to last token), comparable with and without a draft model
+    if streamer is None or getattr(streamer, "last_token_time", None) is None:
+        return {}
+    metrics = {}
+    decode_time = streamer.last_token_time - streamer.first_token_time
+    if streamer.total_tokens > 1 and decode_time > 0:
+        metrics[f"performance.{stage}_effective_tps"] = round((streamer.total_tokens - 1) / decode_time, 4)
+    if streamer.draft_tokens:
+        metrics[f"performance.{stage}_draft_acceptance_rate"] = round(streamer.accepted_draft_tokens / streamer.draft_tokens, 4)
+        metrics[f"performance.{stage}_accepted_draft_tokens"] = streamer.accepted_draft_tokens
+    return metrics
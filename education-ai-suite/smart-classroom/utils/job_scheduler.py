@@ -0,0 +1,184 @@
+import itertools
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import psutil
+
+from utils.config_loader import config
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE = "queued", "running", "done"
+
+
+class SchedulerFullError(Exception):
+    """Raised when a job is rejected by admission control (queue limit reached)."""
+
+
+def normalize_device(device: str) -> str:
+    # GPU.0 / GPU.1 / xpu:0 all compete for the same accelerator class
+    device = (device or "CPU").upper().replace(":", ".").split(".")[0]
+    return "GPU" if device == "XPU" else device
+
+
+class Job:
+    def __init__(self, seq: int, session_id: str, kind: str, device: str, priority: int, memory_mb: int,
+                 ordered: bool = True):
+        self.id = f"{kind}-{seq}"
+        self.seq = seq
+        self.session_id = session_id
+        self.kind = kind
+        self.device = device
+        self.priority = priority
+        self.memory_mb = memory_mb
+        self.ordered = ordered
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+
+    def sort_key(self):
+        return self.priority, self.seq
+
+
+class JobScheduler:
+    """
+    Queues transcription / summary / mindmap jobs per device.
+
+    - One job runs at a time per device (CPU, GPU, NPU), so ASR on the CPU for one session
+      can run while another session decodes on the GPU.
+    - Waiting jobs are ordered by priority, then submission order; jobs of the same session
+      always run in submission order, except background jobs submitted with ordered=False
+      (e.g. incremental segment summaries), which do not wait for the session's earlier jobs.
+    - Admission control: submit() rejects when the device queue is full, and a job only starts
+      when the configured working memory for its kind is available (unless the box is idle).
+    - Queue position and ETA come from moving averages of completed job durations.
+    """
+
+    def __init__(self, priorities: Dict[str, int], memory_mb: Dict[str, int], default_duration_sec: Dict[str, float],
+                 max_queue: int = 8, memory_poll_sec: float = 1.0):
+        self.priorities = priorities
+        self.memory_mb = memory_mb
+        self.max_queue = max_queue
+        self.memory_poll_sec = memory_poll_sec
+        self._expected = dict(default_duration_sec)
+        self._jobs: List[Job] = []
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls):
+        scheduler_config = config.scheduler
+        return cls(
+            priorities=vars(scheduler_config.priorities),
+            memory_mb=vars(scheduler_config.memory_mb),
+            default_duration_sec=vars(scheduler_config.default_duration_sec),
+            max_queue=scheduler_config.max_queue,
+        )
+
+    def submit(self, session_id: str, kind: str, device: str, ordered: bool = True) -> Job:
+        device = normalize_device(device)
+        with self._cond:
+            queued = [j for j in self._jobs if j.device == device and j.state == QUEUED]
+            if len(queued) >= self.max_queue:
+                raise SchedulerFullError(f"{device} queue is full ({self.max_queue} jobs waiting), try later")
+
+            job = Job(next(self._seq), session_id, kind, device,
+                      self.priorities.get(kind, 99), self.memory_mb.get(kind, 0), ordered)
+            self._jobs.append(job)
+            self._dispatch()
+            logger.info(f"Job {job.id} submitted (session={session_id}, device={device}, state={job.state})")
+            return job
+
+    def wait(self, job: Job, timeout: Optional[float] = None) -> bool:
+        """Blocks until the job is running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while job.state == QUEUED:
+                remaining = self.memory_poll_sec if deadline is None else min(self.memory_poll_sec, deadline - time.monotonic())
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+                self._dispatch()  # memory may have been freed outside the scheduler
+            return True
+
+    def finish(self, job: Job):
+        with self._cond:
+            if job.state == RUNNING and job.started_at is not None:
+                # exponential moving average of observed durations per job kind
+                duration = time.time() - job.started_at
+                previous = self._expected.get(job.kind, duration)
+                self._expected[job.kind] = 0.7 * previous + 0.3 * duration
+            job.state = DONE
+            if job in self._jobs:
+                self._jobs.remove(job)
+            self._dispatch()
+            self._cond.notify_all()
+
+    @contextmanager
+    def run(self, session_id: str, kind: str, device: str, ordered: bool = True):
+        job = self.submit(session_id, kind, device, ordered)
+        try:
+            self.wait(job)
+            yield job
+        finally:
+            self.finish(job)
+
+    def _eligible(self, job: Job, running_devices) -> bool:
+        if job.device in running_devices:
+            return False
+        # a session's jobs run in submission order (e.g. summary only after its transcription)
+        if job.ordered and any(j.session_id == job.session_id and j.seq < job.seq for j in self._jobs):
+            return False
+        if job.memory_mb and running_devices:
+            available_mb = psutil.virtual_memory().available / (1024 * 1024)
+            if available_mb < job.memory_mb:
+                return False
+        return True
+
+    def _dispatch(self):
+        running_devices = {j.device for j in self._jobs if j.state == RUNNING}
+        for job in sorted((j for j in self._jobs if j.state == QUEUED), key=Job.sort_key):
+            if self._eligible(job, running_devices):
+                job.state = RUNNING
+                job.started_at = time.time()
+                running_devices.add(job.device)
+                self._cond.notify_all()
+
+    def _remaining(self, job: Job, now: float) -> float:
+        expected = self._expected.get(job.kind, 0.0)
+        if job.state == RUNNING:
+            return max(0.0, expected - (now - job.started_at))
+        return expected
+
+    def status(self, session_id: Optional[str] = None) -> List[dict]:
+        """Queue position (0 = running) and ETA in seconds for the jobs of a session (or all jobs)."""
+        now = time.time()
+        with self._cond:
+            result = []
+            for job in self._jobs:
+                if session_id is not None and job.session_id != session_id:
+                    continue
+                same_device = [j for j in self._jobs if j.device == job.device]
+                running = [j for j in same_device if j.state == RUNNING]
+                if job.state == RUNNING:
+                    position, eta = 0, 0.0
+                else:
+                    ahead = [j for j in same_device if j.state == QUEUED and j.sort_key() < job.sort_key()]
+                    position = len(ahead) + 1
+                    eta = sum(self._remaining(j, now) for j in running + ahead)
+                result.append({
+                    "job_id": job.id,
+                    "session_id": job.session_id,
+                    "kind": job.kind,
+                    "device": job.device,
+                    "state": job.state,
+                    "queue_position": position,
+                    "eta_sec": round(eta, 1),
+                })
+            return result
+
+
+job_scheduler = JobScheduler.from_config()
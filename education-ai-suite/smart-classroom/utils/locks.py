@@ -1,4 +1,3 @@
 import threading 
 
-audio_pipeline_lock = threading.Lock()
 video_analytics_lock = threading.Lock()
\ No newline at end of file
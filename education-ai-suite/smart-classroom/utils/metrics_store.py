@@ -0,0 +1,129 @@
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MetricValue = Union[str, int, float]
+
+
+class MetricsStore:
+    """
+    Append-only, SQLite backed store for per-session performance measurements.
+
+    Every record() call inserts rows; nothing is ever rewritten. Numeric values are kept
+    as REAL so they can be aggregated, anything else (e.g. model names) as TEXT.
+    Metric names follow the "<group>.<name>" convention used by the API response.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value REAL,
+                text_value TEXT,
+                ts REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_session_name ON metrics (session_id, name, id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, id)")
+        self._conn.commit()
+
+    @staticmethod
+    def _split_value(value: MetricValue):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None, str(value)
+        return float(value), None
+
+    @staticmethod
+    def _join_value(value, text_value):
+        if value is None:
+            return text_value
+        return int(value) if float(value).is_integer() else value
+
+    def record(self, session_id: str, data: Dict[str, MetricValue], ts: Optional[float] = None):
+        ts = ts or time.time()
+        rows = [(session_id, name, *self._split_value(value), ts) for name, value in data.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO metrics (session_id, name, value, text_value, ts) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def latest(self, session_id: str) -> dict:
+        """Latest value of every metric of a session, nested by group like read_performance_metrics."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT name, value, text_value FROM metrics
+                WHERE id IN (SELECT MAX(id) FROM metrics WHERE session_id = ? GROUP BY name)
+                """,
+                (session_id,)
+            ).fetchall()
+
+        nested_data = {}
+        for name, value, text_value in rows:
+            val = self._join_value(value, text_value)
+            if "." in name:
+                group, subkey = name.split(".", 1)
+                nested_data.setdefault(group, {})[subkey] = val
+            else:
+                nested_data[name] = val
+        return nested_data
+
+    def series(self, name: str, session_ids: Optional[List[str]] = None, since: Optional[float] = None,
+               limit: int = 1000) -> List[dict]:
+        """Time series of one metric, optionally restricted to some sessions and a start time."""
+        query = "SELECT session_id, value, text_value, ts FROM metrics WHERE name = ?"
+        params: list = [name]
+        if session_ids:
+            query += f" AND session_id IN ({','.join('?' * len(session_ids))})"
+            params.extend(session_ids)
+        if since is not None:
+            query += " AND ts >= ?"
+            params.append(since)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {"session_id": session_id, "value": self._join_value(value, text_value), "timestamp": ts}
+            for session_id, value, text_value, ts in reversed(rows)
+        ]
+
+    def sessions(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT session_id FROM metrics GROUP BY session_id ORDER BY MIN(id)").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, MetricsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(project_location: str, project_name: str) -> MetricsStore:
+    """One shared store per project directory (sessions live below it)."""
+    db_path = os.path.abspath(os.path.join(project_location, project_name, "metrics.db"))
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = MetricsStore(db_path)
+        return _stores[db_path]
@@ -1,5 +1,7 @@
 import queue
+import time
 import openvino_genai as ov_genai
+from utils.detokenizer import StreamingDetokenizer
 
 class YieldingTextStreamer(ov_genai.StreamerBase):
     def __init__(self, tokenizer, skip_special_tokens=True):
@@ -8,39 +10,41 @@ class YieldingTextStreamer(ov_genai.StreamerBase):
         self.skip_special_tokens = skip_special_tokens
         self._queue = queue.Queue()
         self.total_tokens = 0
-        self._token_cache = []
-        self._print_len = 0
+        self._detokenizer = StreamingDetokenizer(tokenizer, skip_special_tokens)
+        # Filled in by the summarizer for prefix cache / prefill reporting
+        self.first_token_time = None
+        self.prefill_time = None
+        self.prefix_cache_enabled = False
+        self.prefix_cache_hit = None
+        self.cached_prefix_tokens = 0
+        # Filled in by the summarizer when a draft model is used (speculative decoding)
+        self.draft_tokens = None
+        self.accepted_draft_tokens = 0
+        self.last_token_time = None
 
     def put(self, token_id) -> bool:
-        self._token_cache.append(token_id)
+        if self.first_token_time is None:
+            self.first_token_time = time.perf_counter()
         self.total_tokens += 1
+        self.last_token_time = time.perf_counter()
 
-        text = self.tokenizer.decode(self._token_cache, skip_special_tokens=self.skip_special_tokens)
-        new_text = text[self._print_len:]
-        if not new_text:
-            return False
-
-        if self._is_safe_to_emit(new_text):
-            self._queue.put(new_text)
-            self._print_len = len(text)
-        else:
-            last_token_text = self.tokenizer.decode([token_id], skip_special_tokens=True)
-            if last_token_text.startswith(" "):
-                prev_chunk = text[self._print_len : len(text) - len(last_token_text)]
-                if prev_chunk:
-                    self._queue.put(prev_chunk)
-                    self._print_len += len(prev_chunk)
+        text = self._detokenizer.put(token_id)
+        if text:
+            self._queue.put(text)
         return False
 
+    def write(self, token):
+        # Newer GenAI releases call write(); speculative decoding hands over every token accepted in a step at once
+        for token_id in (token if isinstance(token, list) else [token]):
+            self.put(token_id)
+        status = getattr(ov_genai, "StreamingStatus", None)
+        return status.RUNNING if status is not None else False
+
     def end(self):
-        if self._token_cache:
-            text = self.tokenizer.decode(self._token_cache, skip_special_tokens=self.skip_special_tokens)
-            remaining = text[self._print_len:]
-            if remaining:
-                self._queue.put(remaining)
+        remaining = self._detokenizer.flush()
+        if remaining:
+            self._queue.put(remaining)
         self._queue.put(None)
-        self._token_cache.clear()
-        self._print_len = 0
 
     def __iter__(self):
         while True:
@@ -48,16 +52,3 @@ class YieldingTextStreamer(ov_genai.StreamerBase):
             if token is None:
                 break
             yield token
-        
-    def _is_safe_to_emit(self, text: str) -> bool:
-        last_char = text[-1]
-        cp = ord(last_char)
-        return self._is_cjk(cp) or last_char.isspace() or last_char == "\n"
-
-    @staticmethod
-    def _is_cjk(cp: int) -> bool:
-        return (
-            0x4E00 <= cp <= 0x9FFF or 0x3400 <= cp <= 0x4DBF or 0x20000 <= cp <= 0x2A6DF or
-            0x2A700 <= cp <= 0x2B73F or 0x2B740 <= cp <= 0x2B81F or 0x2B820 <= cp <= 0x2CEAF or
-            0xF900 <= cp <= 0xFAFF or 0x2F800 <= cp <= 0x2FA1F
-        )
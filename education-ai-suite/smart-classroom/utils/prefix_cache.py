@@ -0,0 +1,49 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple
+
+
+class PromptPrefixCache:
+    """
+    LRU of recently prefilled prompts (as token ids), with an optional payload per prompt
+    such as a KV cache. match() returns the longest token prefix a new prompt shares with
+    any cached prompt, which is the part of the prefill that can be skipped.
+    """
+
+    def __init__(self, max_entries: int = 4, min_prefix_tokens: int = 32):
+        self.max_entries = max(1, int(max_entries))
+        self.min_prefix_tokens = int(min_prefix_tokens)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(self, token_ids: Sequence[int]) -> Tuple[int, Optional[Any]]:
+        token_ids = tuple(token_ids)
+        best_len, best_key = 0, None
+        with self._lock:
+            for key in self._entries:
+                prefix_len = len(os.path.commonprefix([key, token_ids]))
+                if prefix_len > best_len:
+                    best_len, best_key = prefix_len, key
+
+            if best_key is None or best_len < self.min_prefix_tokens:
+                self.misses += 1
+                return 0, None
+
+            self.hits += 1
+            self._entries.move_to_end(best_key)
+            return best_len, self._entries[best_key]
+
+    def put(self, token_ids: Sequence[int], payload: Any = None):
+        with self._lock:
+            key = tuple(token_ids)
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,8 +1,159 @@
-from components.asr_component import ASRComponent
-from components.summarizer_component import SummarizerComponent
+import os
+import time
+import importlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 from utils.config_loader import config
 
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+_status_lock = threading.Lock()
+_status = {"state": "pending", "total_sec": None, "models": {}}
+
+
+def _set_model_status(model, **fields):
+    with _status_lock:
+        _status["models"].setdefault(model, {"state": "pending"}).update(fields)
+
+
+def get_startup_status():
+    """Snapshot of the startup phase: overall state plus per-model import/load/warm-up timings."""
+    with _status_lock:
+        return {
+            "state": _status["state"],
+            "total_sec": _status["total_sec"],
+            "models": {name: dict(fields) for name, fields in _status["models"].items()},
+        }
+
+
+def _warmup_asr(component):
+    # Low-level deterministic noise: exercises feature extraction and one decode without producing text
+    samples = int(SAMPLE_RATE * config.startup.warmup_audio_sec)
+    audio = (np.random.default_rng(0).standard_normal(samples) * 1e-3).astype(np.float32)
+    if component.asr.supports_array_input:
+        audio_input = audio
+    else:
+        from components.ffmpeg.audio_preprocessing import write_chunk_wav
+        audio_input = write_chunk_wav(audio, "warmup")
+    try:
+        component.asr.transcribe(component.asr.prepare(audio_input), temperature=component.temperature)
+    finally:
+        if isinstance(audio_input, str) and os.path.exists(audio_input):
+            os.remove(audio_input)
+
+
+def _warmup_summarizer(component):
+    messages = [{"role": "user", "content": "Hello"}]
+    prompt = component.summarizer.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+    # Drain the streamer so the warm-up generation has finished before the model is reported ready
+    for _ in component.summarizer.generate(prompt, max_new_tokens=config.startup.warmup_max_new_tokens):
+        pass
+
+
+def _import_asr():
+    from components.asr_component import ASRComponent
+    module = ASRComponent.PROVIDER_MODULES.get(config.models.asr.provider.lower())
+    if module:
+        importlib.import_module(module)
+
+
+def _import_summarizer():
+    from components.summarizer_component import SummarizerComponent
+    module = SummarizerComponent.PROVIDER_MODULES.get(config.models.summarizer.provider.lower())
+    if module:
+        importlib.import_module(module)
+
+
+def _load_asr():
+    from components.asr_component import ASRComponent
+    return ASRComponent(
+        session_id="startup",
+        provider=config.models.asr.provider,
+        model_name=config.models.asr.name,
+        device=config.models.asr.device,
+        temperature=config.models.asr.temperature
+    )
+
+
+def _load_summarizer():
+    from components.summarizer_component import SummarizerComponent
+    return SummarizerComponent(
+        session_id="startup",
+        provider=config.models.summarizer.provider,
+        model_name=config.models.summarizer.name,
+        temperature=config.models.summarizer.temperature,
+        device=config.models.summarizer.device
+    )
+
+
+def _preload(model, import_provider, load, warmup):
+    """Imports the provider, loads (and compiles) one model and runs its warm-up inference, timing each step."""
+    _set_model_status(model, state="loading")
+    try:
+        start = time.perf_counter()
+        import_provider()
+        imported = time.perf_counter()
+        _set_model_status(model, import_sec=round(imported - start, 3))
+        component = load()
+        loaded = time.perf_counter()
+        _set_model_status(model, load_sec=round(loaded - imported, 3))
+        if config.startup.warmup:
+            warmup(component)
+            _set_model_status(model, warmup_sec=round(time.perf_counter() - loaded, 3))
+        _set_model_status(model, state="ready")
+    except Exception as e:
+        logger.exception(f"Failed to preload {model} model: {e}")
+        _set_model_status(model, state="failed", error=str(e))
+
+
+def _log_breakdown(status):
+    logger.info("Startup timing breakdown:")
+    logger.info(f"{'model':<12}{'state':<8}{'import (s)':>12}{'load (s)':>10}{'warm-up (s)':>13}")
+    for name, fields in status["models"].items():
+        timings = [fields.get(key) for key in ("import_sec", "load_sec", "warmup_sec")]
+        cells = ["-" if value is None else f"{value:.2f}" for value in timings]
+        logger.info(f"{name:<12}{fields['state']:<8}{cells[0]:>12}{cells[1]:>10}{cells[2]:>13}")
+    logger.info(f"Startup finished in {status['total_sec']:.2f}s ({status['state']})")
+
+
 def preload_models():
-    # Preload default models
-    ASRComponent(session_id="startup", provider=config.models.asr.provider, model_name=config.models.asr.name,device=config.models.asr.device)
-    SummarizerComponent(session_id="startup", provider=config.models.summarizer.provider, model_name=config.models.summarizer.name, temperature=config.models.summarizer.temperature, device=config.models.summarizer.device)
+    """
+    Loads the configured ASR and summarizer models, in parallel when startup.parallel_load is set,
+    and warms each up with a short synthetic inference so the first request does not pay for
+    graph compilation. Progress is exposed through get_startup_status() (see /ready).
+    """
+    models = {
+        "asr": (_import_asr, _load_asr, _warmup_asr),
+        "summarizer": (_import_summarizer, _load_summarizer, _warmup_summarizer),
+    }
+    with _status_lock:
+        _status["state"] = "loading"
+        _status["models"] = {name: {"state": "pending"} for name in models}
+
+    start = time.perf_counter()
+    if config.startup.parallel_load:
+        with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="preload") as executor:
+            for name, steps in models.items():
+                executor.submit(_preload, name, *steps)
+    else:
+        for name, steps in models.items():
+            _preload(name, *steps)
+
+    with _status_lock:
+        failed = any(fields["state"] == "failed" for fields in _status["models"].values())
+        _status["state"] = "failed" if failed else "ready"
+        _status["total_sec"] = round(time.perf_counter() - start, 3)
+    _log_breakdown(get_startup_status())
+
+
+def start_preload_models():
+    """Runs preload_models() in the background so the server can answer /ready while models load."""
+    thread = threading.Thread(target=preload_models, name="preload-models", daemon=True)
+    thread.start()
+    return thread
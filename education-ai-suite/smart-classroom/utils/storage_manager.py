@@ -4,9 +4,17 @@ from threading import Thread
 from typing import Union, List, Dict, Tuple
 from pathlib import Path
 import logging
+from utils.config_loader import config
+from utils.append_writer import AppendWriterService
+from utils.metrics_store import get_metrics_store
 
 logger = logging.getLogger(__name__)
 
+_append_writer = AppendWriterService(
+    flush_bytes=config.storage.writer_flush_bytes,
+    flush_interval=config.storage.writer_flush_interval_sec
+)
+
 class StorageManager:
     @staticmethod
     def _ensure_dir(path: str):
@@ -42,11 +50,26 @@ class StorageManager:
 
     @staticmethod
     def save(path: str, data: Union[str, dict], append: bool = False):
+        # Pending buffered appends must land before a synchronous write to the same file
+        _append_writer.flush(path)
         StorageManager._write(path, data, append)
 
     @staticmethod
     def save_async(path: str, data: Union[str, dict], append: bool = False):
+        if append and isinstance(data, str):
+            # Streamed text appends are coalesced by the long-lived writer, in order
+            _append_writer.write(path, data)
+            return
         Thread(target=StorageManager._write, args=(path, data, append)).start()
+
+    @staticmethod
+    def flush(path: str):
+        _append_writer.flush(path)
+
+    @staticmethod
+    def close(path: str):
+        """Flushes buffered appends for `path`; call at the end of a stream/session."""
+        _append_writer.close(path)
         
     @staticmethod
     def save_csv(path: str, data: dict, headers: List[str], append: bool = True):
@@ -85,8 +108,26 @@ class StorageManager:
             writer.writeheader()
             writer.writerows(rows)
             
+    @staticmethod
+    def record_metrics(project_location: str, project_name: str, session_id: str, new_data: Dict[str, Union[str, int, float]]):
+        """Appends measurements for a session to the project's metrics store (no file rewrite)."""
+        get_metrics_store(project_location, project_name).record(session_id, new_data)
+
+    @staticmethod
+    def read_metrics_series(project_location: str, project_name: str, name: str, session_ids: List[str] = None,
+                            since: float = None, limit: int = 1000) -> list:
+        return get_metrics_store(project_location, project_name).series(name, session_ids, since, limit)
+
     @staticmethod
     def read_performance_metrics(project_location: str, project_name: str, session_id: str) -> dict:
+        nested_data = get_metrics_store(project_location, project_name).latest(session_id)
+        if nested_data:
+            return nested_data
+        # Sessions recorded before the metrics store existed only have the CSV
+        return StorageManager._read_performance_metrics_csv(project_location, project_name, session_id)
+
+    @staticmethod
+    def _read_performance_metrics_csv(project_location: str, project_name: str, session_id: str) -> dict:
         metrics_csv = os.path.join(project_location, project_name, session_id, "performance_metrics.csv")
 
         if not os.path.exists(metrics_csv):
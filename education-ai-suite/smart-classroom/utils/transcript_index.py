@@ -0,0 +1,163 @@
+import os
+import queue
+import sqlite3
+import threading
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_FLUSH = object()
+
+
+def _match_expression(query: str) -> str:
+    """Turns free text into an FTS5 query: every word must occur, FTS operators in the input are taken literally."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+class TranscriptIndex:
+    """
+    SQLite FTS5 index over the transcript chunks of all sessions of a project.
+
+    add() only enqueues the chunk; a background thread inserts queued chunks in batches,
+    so ASR never waits on the database. Rows keep the session id, chunk time range (ms)
+    and speaker, and search() returns them ranked by BM25.
+    """
+
+    def __init__(self, db_path: str, tokenizer: str = "unicode61", batch_size: int = 64):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                start_ms INTEGER NOT NULL,
+                end_ms INTEGER NOT NULL,
+                speaker TEXT,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunks_session ON chunks (session_id, chunk_index);
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                text, content='chunks', content_rowid='id', tokenize='{tokenizer}'
+            );
+            CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END;
+            """
+        )
+        self._conn.commit()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="transcript-index", daemon=True)
+        self._thread.start()
+
+    def reset_session(self, session_id: str):
+        """Drops the indexed chunks of a session that is transcribed again (applied in order with add())."""
+        self._queue.put(("reset", session_id))
+
+    def add(self, session_id: str, chunk_index: int, start_time: float, end_time: float, text: str,
+            speaker: Optional[str] = None):
+        """Queues one transcribed chunk; times are in seconds from the start of the session audio."""
+        if not text or not text.strip():
+            return
+        row = (session_id, chunk_index, int(round(start_time * 1000)), int(round(end_time * 1000)), speaker, text)
+        self._queue.put(("add", row))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until everything queued so far is searchable."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # take whatever else is already queued, one transaction per batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to update transcript index {self.db_path}: {e}")
+            for op, arg in batch:
+                if op is _FLUSH:
+                    arg.set()
+
+    def _apply(self, batch):
+        with self._lock:
+            for op, arg in batch:
+                if op == "add":
+                    self._conn.execute(
+                        "INSERT INTO chunks (session_id, chunk_index, start_ms, end_ms, speaker, text) VALUES (?, ?, ?, ?, ?, ?)",
+                        arg
+                    )
+                elif op == "reset":
+                    self._conn.execute("DELETE FROM chunks WHERE session_id = ?", (arg,))
+            self._conn.commit()
+
+    def search(self, query: str, session_ids: Optional[List[str]] = None, limit: int = 20) -> List[dict]:
+        """Chunks matching every word of `query`, best match first."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = """
+            SELECT c.session_id, c.chunk_index, c.start_ms, c.end_ms, c.speaker, c.text,
+                   snippet(chunks_fts, 0, '<mark>', '</mark>', '…', 16), bm25(chunks_fts)
+            FROM chunks_fts JOIN chunks c ON c.id = chunks_fts.rowid
+            WHERE chunks_fts MATCH ?
+        """
+        params: list = [expression]
+        if session_ids:
+            sql += f" AND c.session_id IN ({','.join('?' * len(session_ids))})"
+            params.extend(session_ids)
+        sql += " ORDER BY bm25(chunks_fts) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "session_id": session_id,
+                "chunk_index": chunk_index,
+                "start_ms": start_ms,
+                "end_ms": end_ms,
+                "speaker": speaker,
+                "text": text,
+                "snippet": snippet,
+                # bm25() is lower for better matches; expose it as a positive relevance score
+                "score": -rank,
+            }
+            for session_id, chunk_index, start_ms, end_ms, speaker, text, snippet, rank in rows
+        ]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[str, TranscriptIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_transcript_index(project_location: str, project_name: str, tokenizer: str = "unicode61") -> TranscriptIndex:
+    """One shared index per project directory, covering all of its sessions."""
+    db_path = os.path.abspath(os.path.join(project_location, project_name, "transcripts.db"))
+    with _indexes_lock:
+        if db_path not in _indexes:
+            _indexes[db_path] = TranscriptIndex(db_path, tokenizer)
+        return _indexes[db_path]
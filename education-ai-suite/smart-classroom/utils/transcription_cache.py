@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def audio_fingerprint(audio, model_signature: dict) -> str:
+    """
+    Content address of a chunk: SHA-256 over the model signature and the audio content.
+    In-memory chunks are hashed as their float32 PCM samples, paths by the file bytes.
+    """
+    digest = hashlib.sha256(json.dumps(model_signature, sort_keys=True).encode("utf-8"))
+    if isinstance(audio, str):
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+    Persistent (SQLite) map from audio fingerprint to transcribed text.
+
+    Entries remember when they were last used; once the stored text exceeds max_bytes the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int):
+        self.db_path = db_path
+        self.max_bytes = max(0, int(max_bytes))
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcriptions (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_transcriptions_last_used ON transcriptions (last_used)")
+        self._conn.commit()
+        self._size = self._total_size()
+        self._last_used = self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM transcriptions").fetchone()[0]
+
+    def _now(self) -> float:
+        # strictly increasing, so the LRU order is exact even within one clock tick
+        self._last_used = max(time.time(), self._last_used + 1e-6)
+        return self._last_used
+
+    def _total_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcriptions").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM transcriptions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE transcriptions SET last_used = ? WHERE key = ?", (self._now(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, text: str):
+        size = len(text.encode("utf-8")) + len(key)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM transcriptions WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcriptions (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, text, size, self._now())
+            )
+            self._size += size - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # keep the most recently used entries that fit into max_bytes
+        self._conn.execute(
+            """
+            DELETE FROM transcriptions WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS kept FROM transcriptions
+                ) WHERE kept > ?
+            )
+            """,
+            (self.max_bytes,)
+        )
+        evicted_from = self._size
+        self._size = self._total_size()
+        logger.debug(f"Transcription cache evicted {evicted_from - self._size} bytes")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM transcriptions").fetchone()[0]
+            return {"entries": entries, "size_bytes": self._size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, TranscriptionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_transcription_cache(project_location: str, max_bytes: int) -> TranscriptionCache:
+    """One cache per project location, shared by all projects and sessions below it."""
+    db_path = os.path.abspath(os.path.join(project_location, "transcription_cache.db"))
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = TranscriptionCache(db_path, max_bytes)
+        return _caches[db_path]
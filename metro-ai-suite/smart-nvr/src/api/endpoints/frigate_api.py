@@ -1,21 +1,21 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
-import requests
+import aiohttp
+import asyncio
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
 from typing import Dict
-from fastapi.responses import FileResponse
 from config import FRIGATE_BASE_URL
+from utils.http_client import http_client, HttpError
 
 
 class FrigateService:
     def __init__(self, base_url: str = FRIGATE_BASE_URL):
         self.base_url = base_url
 
-    def get_camera_names(self) -> Dict[str, list]:
+    async def get_camera_names(self) -> Dict[str, list]:
         """Get mapping of camera names to detected objects from Frigate"""
         try:
-            response = requests.get(f"{self.base_url}/api/config")
+            response = await http_client.get(f"{self.base_url}/api/config")
             response.raise_for_status()
             config = response.json()
             cameras = config.get("cameras", {})
@@ -27,7 +27,7 @@ class FrigateService:
             print(camera_object_map)
             return camera_object_map
 
-        except requests.exceptions.RequestException as e:
+        except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise HTTPException(
                 status_code=502, detail=f"Failed to connect to Frigate: {str(e)}"
             )
@@ -46,39 +46,26 @@ class FrigateService:
 
     async def get_camera_events(self, camera_name: str) -> dict:
         """Get list of events for a specific camera"""
-        url = f"{self.base_url}/api/events?camera={camera_name}"
+        url = f"{self.base_url}/api/events"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = await http_client.get(url, params={"camera": camera_name}, timeout=aiohttp.ClientTimeout(total=10))
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
+        except HttpError as e:
             raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Frigate events API error: {e.response.text}",
+                status_code=e.status,
+                detail=f"Frigate events API error: {e.text}",
             )
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise HTTPException(
                 status_code=502, detail=f"Failed to contact Frigate: {str(e)}"
             )
 
     MEDIA_BASE_PATH = "/media/exports"
 
-    def get_clip_from_timestamps(
-        self, camera_name: str, start_time: int, end_time: int, download: bool = False
-    ) -> StreamingResponse:
-        """
-        Call Frigate's /start/:start_ts/end/:end_ts/clip.mp4 API to retrieve a video clip.
-
-        Args:
-            camera_name (str): Name of the camera.
-            start_time (int): Start timestamp (e.g. 1749531197).
-            end_time (int): End timestamp (e.g. 1749531212).
-            download (bool): If True, download the file.
-
-        Returns:
-            StreamingResponse: Video stream response.
-        """
+    def clip_url(self, camera_name: str, start_time: int, end_time: int, download: bool = False) -> str:
+        """URL of Frigate's /start/:start_ts/end/:end_ts/clip.mp4 API for the given range."""
         if end_time <= start_time:
             raise HTTPException(
                 status_code=400, detail="End time must be after start time"
@@ -87,28 +74,37 @@ class FrigateService:
         url = f"{self.base_url}/api/{camera_name}/start/{start_time}/end/{end_time}/clip.mp4"
         if download:
             url += "?download=1"
+        return url
+
+    async def download_clip(
+        self, camera_name: str, start_time: int, end_time: int, dest_path: str, download: bool = False
+    ) -> int:
+        """
+        Call Frigate's /start/:start_ts/end/:end_ts/clip.mp4 API and stream the clip to a file.
 
+        Args:
+            camera_name (str): Name of the camera.
+            start_time (int): Start timestamp (e.g. 1749531197).
+            end_time (int): End timestamp (e.g. 1749531212).
+            dest_path (str): File the clip is written to.
+            download (bool): If True, request the clip as a download.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        url = self.clip_url(camera_name, start_time, end_time, download)
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            return StreamingResponse(
-                response.iter_content(chunk_size=8192),
-                media_type="video/mp4",
-                headers={
-                    "Content-Disposition": response.headers.get(
-                        "Content-Disposition", "inline"
-                    )
-                },
-            )
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
+            _, size = await http_client.download(url, dest_path)
+            return size
+        except HttpError as e:
+            if e.status == 404:
                 raise HTTPException(
                     status_code=404, detail="Clip not found for specified time range"
                 )
             raise HTTPException(
-                status_code=502, detail=f"Frigate error: {e.response.text}"
+                status_code=502, detail=f"Frigate error: {e.text}"
             )
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             raise HTTPException(
                 status_code=502, detail=f"Failed to connect to Frigate: {str(e)}"
-            )
\ No newline at end of file
+            )
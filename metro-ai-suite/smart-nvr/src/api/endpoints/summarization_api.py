@@ -2,14 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 import os
 import json
+import asyncio
 import logging
-import requests
+import aiohttp
 from typing import Union
 from pathlib import Path
 from typing import Optional
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse, FileResponse
 from model.model import SummaryPayload
+from utils.http_client import http_client, HttpError, RelayResult
 import traceback
 
 # Setup logger
@@ -24,15 +26,20 @@ class SummarizationService:
     def __init__(self):
         logger.debug(f"SummarizationService initialized")
 
-    def video_upload(self, video_path: Union[str, Path], base_url: str, camera_name: str) -> dict:
+    @staticmethod
+    def _video_form(video, filename: str, tags: str) -> aiohttp.FormData:
+        # aiohttp streams the video (an open file, closed once sent, or an async byte stream)
+        form = aiohttp.FormData()
+        form.add_field("video", video, filename=filename, content_type="video/mp4")
+        form.add_field("tags", tags)
+        return form
+
+    async def video_upload(self, video_path: Union[str, Path], base_url: str, camera_name: str) -> dict:
         logger.debug(f"Starting video upload: {video_path}")
 
         try:
             video_path = Path(video_path)  # Ensure consistent use of Path
             tags = f"{camera_name}"
-            data = {
-                    "tags": tags
-                }
 
             if not video_path.exists():
                 logger.error(f"File does not exist at path: {video_path}")
@@ -46,14 +53,11 @@ class SummarizationService:
                     status_code=400, detail=f"Path is not a file: {video_path}"
                 )
 
-            with open(video_path, "rb") as video_file:
-                files = {"video": (video_path.name, video_file, "video/mp4")}
-                upload_url = f"{base_url}/manager/videos/"
-                logger.debug(f"Sending POST request to {upload_url}")
-
-                response = requests.post(
-                    upload_url, files=files, data=data, timeout=30
-                )
+            upload_url = f"{base_url}/manager/videos/"
+            logger.debug(f"Sending POST request to {upload_url}")
+            response = await http_client.post(
+                upload_url, data=lambda: self._video_form(open(video_path, "rb"), video_path.name, tags)
+            )
 
             response.raise_for_status()
             logger.info(f"Video uploaded successfully: {video_path} and tag: {tags}")
@@ -61,6 +65,16 @@ class SummarizationService:
 
             return response.json()
 
+        # network errors first: asyncio.TimeoutError and aiohttp's OS-level errors are also OSErrors
+        except HttpError as e:
+            logger.error(f"Failed to upload video: {type(e).__name__} - {e}")
+            raise HTTPException(status_code=e.status, detail=f"Failed to upload video: {e.text}")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to upload video: {type(e).__name__} - {e}")
+            logger.debug(traceback.format_exc())
+            raise HTTPException(status_code=502, detail=f"Failed to upload video: {e}")
+
         except FileNotFoundError:
             logger.error(f"File not found: {video_path}")
             raise HTTPException(status_code=400, detail="Video file not found.")
@@ -69,31 +83,41 @@ class SummarizationService:
             logger.error(f"I/O error while reading file: {e}")
             raise HTTPException(status_code=500, detail="Error reading video file.")
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to upload video: {type(e).__name__} - {e}")
-            logger.debug(traceback.format_exc())
-            status = e.response.status_code if e.response else 502
-            detail = e.response.text if e.response else str(e)
-            raise HTTPException(status_code=status, detail=f"Failed to upload video: {detail}")
-
-    def create_summary(self, payload: SummaryPayload, base_url: str) -> dict:
+    async def video_upload_stream(
+        self, source_url: str, base_url: str, camera_name: str, min_size: int = 0
+    ) -> RelayResult:
+        """
+        Uploads the video at source_url (e.g. a Frigate clip) while it is being downloaded,
+        without a local copy. The upload is attempted once; the result carries its response.
+        """
+        upload_url = f"{base_url}/manager/videos/"
+        filename = f"{camera_name}_{Path(source_url.split('?')[0]).name}"
+        logger.debug(f"Streaming {source_url} to {upload_url}")
+        return await http_client.relay(
+            source_url,
+            upload_url,
+            lambda body: self._video_form(body, filename, camera_name),
+            min_size=min_size,
+        )
+
+    async def create_summary(self, payload: SummaryPayload, base_url: str) -> dict:
         logger.debug(f"Creating summary for payload: {payload}")
         try:
-            response = requests.post(f"{base_url}/manager/summary", json=payload.dict())
+            response = await http_client.post(f"{base_url}/manager/summary", json=payload.dict())
             response.raise_for_status()
             logger.info("Summary creation request successful.")
             logger.debug(f"Summary creation response: {response.json()}")
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Failed to create summary: {e}")
             raise HTTPException(
                 status_code=502, detail=f"Failed to create summary: {str(e)}"
             )
 
-    def get_summary_result(self, pipeline_id: str, base_url: str) -> dict:
+    async def get_summary_result(self, pipeline_id: str, base_url: str) -> dict:
         logger.debug(f"Fetching summary result for pipeline_id: {pipeline_id}")
         try:
-            response = requests.get(f"{base_url}/manager/summary/{pipeline_id}")
+            response = await http_client.get(f"{base_url}/manager/summary/{pipeline_id}")
             response.raise_for_status()
 
             json_data = response.json()
@@ -103,7 +127,7 @@ class SummarizationService:
             # logger.debug(f"Summary result JSON: {json.dumps(json_data, indent=2)}")
 
             return json_data  # ✅ This returns the full parsed response
-        except requests.exceptions.RequestException as e:
+        except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(
                 f"Failed to get summary result for pipeline_id {pipeline_id}: {e}"
             )
@@ -3,16 +3,24 @@
 # SPDX-License-Identifier: Apache-2.0
 # --- Camera Watcher API (moved to end for formatting) ---
 
-from typing import List, Dict
+import asyncio
+import logging
+from typing import List, Dict, Optional
 from service.directory_watcher import set_camera_watcher_mapping, get_enabled_cameras
 from service.directory_watcher import upload_videos_to_dataprep
-from fastapi import APIRouter, Depends, HTTPException, Request, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, Body, Query
 from pydantic import BaseModel
+import aiohttp
 from api.endpoints.frigate_api import FrigateService
 from api.endpoints.summarization_api import SummarizationService
 from service.vms_service import VmsService
 from service import redis_store
-import requests
+from service.event_coalescer import event_coalescer
+from utils.http_client import http_client
+from utils.upload_queue import get_upload_queue
+from config import SUMMARY_FETCH_CONCURRENCY
+
+logger = logging.getLogger("router")
 
 class CameraWatcherRequest(BaseModel):
     cameras: List[Dict[str, bool]]
@@ -37,13 +45,18 @@ async def health_check():
 
 @router.get("/cameras", summary="Get list of camera names")
 async def get_cameras():
-    return frigate_service.get_camera_names()
+    return await frigate_service.get_camera_names()
 
 
 @router.get("/events", summary="Get list of events for a specific camera")
 async def get_camera_events(camera: str):
     return await frigate_service.get_camera_events(camera)
 
+@router.get("/events/coalescing", summary="Counters of merged and dispatched Frigate event messages")
+async def get_event_coalescing_stats():
+    return event_coalescer.get_stats()
+
+
 @router.get("/summary/{camera_name}", summary="Stream video using clip.mp4 API")
 async def summarize_video(
     camera_name: str, start_time: float, end_time: float, download: bool = False
@@ -62,7 +75,12 @@ async def search_video_embeddings(
 
 @router.get("/summary-status/{summary_id}", summary="Get the summary using id")
 async def get_summary(summary_id: str):
-    return vms_service.summary(summary_id)
+    return await vms_service.summary(summary_id)
+
+
+@router.get("/summary-transfer", summary="Clips streamed vs spilled to disk and time to summary start")
+async def get_summary_transfer_stats():
+    return vms_service.get_transfer_stats()
 
 
 from service.redis_store import (
@@ -70,13 +88,33 @@ from service.redis_store import (
     get_summary_ids,
     get_summary_result,
     get_search_results_by_rule,
+    get_completed_summaries,
+    save_completed_summary,
 )
 
 
+async def _fetch_pending_summary(sid: str, semaphore: asyncio.Semaphore):
+    """Asks the summarizer for a summary not yet complete; persists it once it is final."""
+    async with semaphore:
+        try:
+            result = await vms_service.summary(sid)
+        except Exception as e:
+            logger.warning(f"Summary {sid} status unavailable: {e}")
+            return "Pending"
+    if VmsService.is_summary_complete(result):
+        await save_completed_summary(sid, result)
+    return result or "Pending"
+
+
 @router.get("/rules/responses/")
-async def get_all_rule_summaries(request: Request):
+async def get_all_rule_summaries(
+    request: Request,
+    offset: int = Query(0, ge=0, description="Summaries to skip per rule, oldest first"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum summaries returned per rule"),
+):
     rules = await get_rules(request)
     output = {}
+    pending = {}
 
     for rule in rules:
         rule_id = rule["id"]
@@ -85,14 +123,20 @@ async def get_all_rule_summaries(request: Request):
         if "search" in rule.get("action", "").lower():
             continue
 
-        summary_ids = await get_summary_ids(request, rule_id)
-        summaries = {}
-
+        summary_ids = await get_summary_ids(request, rule_id, offset, limit)
+        # Completed summaries are served from Redis; only the rest go to the summarizer
+        completed = await get_completed_summaries(request, summary_ids)
+        output[rule_id] = {sid: completed.get(sid) for sid in summary_ids}
         for sid in summary_ids:
-            result = vms_service.summary(sid)
-            summaries[sid] = result or "Pending"
+            if sid not in completed:
+                pending.setdefault(sid, []).append(rule_id)
 
-        output[rule_id] = summaries
+    if pending:
+        semaphore = asyncio.Semaphore(SUMMARY_FETCH_CONCURRENCY)
+        results = await asyncio.gather(*(_fetch_pending_summary(sid, semaphore) for sid in pending))
+        for sid, result in zip(pending, results):
+            for rule_id in pending[sid]:
+                output[rule_id][sid] = result
 
     return output
 
@@ -168,9 +212,9 @@ async def set_camera_watchers(
     # Step 1: Check if Video Search Service is reachable
     try:
         health_url = f"{VSS_SEARCH_URL}/manager/search/watched"
-        response = requests.get(health_url, timeout=5)
-        if response.status_code != 200:
-            raise Exception(f"Unexpected status: {response.status_code}")
+        response = await http_client.get(health_url, retries=0, timeout=aiohttp.ClientTimeout(total=5))
+        if response.status != 200:
+            raise Exception(f"Unexpected status: {response.status}")
     except Exception as e:
         # Log and return error
         error_msg = f"Video search service is unreachable, please check and try again."
@@ -217,6 +261,11 @@ async def get_camera_watcher_mapping(request: Request = None):
     return {"mapping": merged}
 
 
+@router.get("/watchers/upload-queue", summary="Upload queue depth, throughput and failure counts")
+async def get_upload_queue_stats():
+    return get_upload_queue().stats()
+
+
 @router.get("/watchers/enable", summary="Alias to fetch current watcher mapping (GET)")
 async def get_camera_watcher_mapping_alias(request: Request = None):
     """Provide a GET alias on /watchers/enable so users who query that endpoint directly
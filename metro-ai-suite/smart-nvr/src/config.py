@@ -36,3 +36,17 @@ SCENESCAPE_CLIENT_KEY_PATH = os.getenv("SCENESCAPE_CLIENT_KEY_PATH", "/mosquitto
 # Scenescape throttling configuration
 SCENESCAPE_THROTTLE_INTERVAL = float(os.getenv("SCENESCAPE_THROTTLE_INTERVAL", 2.0))
 
+# Shared async HTTP client (Frigate, VSS); see utils/http_client.py
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 8))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5.0))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 120.0))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.5))
+
+# Concurrent summary status lookups made by GET /rules/responses/
+SUMMARY_FETCH_CONCURRENCY = int(os.getenv("SUMMARY_FETCH_CONCURRENCY", 8))
+
+# Frigate sends new/update/end messages per tracked object; messages for one event id arriving
+# within this many seconds are merged before rules are evaluated
+MQTT_COALESCE_WINDOW = float(os.getenv("MQTT_COALESCE_WINDOW", 0.5))
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from service.directory_watcher import restore_camera_watchers_from_redis
 from utils.utils import upload_videos_to_dataprep
+from utils.upload_queue import get_upload_queue
 from fastapi import FastAPI
 from api.router import router  # your custom route logic (rules, results, etc.)
 from service.mqtt_listener import start_mqtt_clients
@@ -9,6 +10,7 @@ import asyncio
 import logging
 from config import REDIS_HOST, REDIS_PORT
 import redis.asyncio as redis
+from utils.http_client import http_client
 
 # Configure global logger
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +36,9 @@ async def startup_event():
     logger.info("🚀 FastAPI starting up... launching MQTT listener")
     await start_mqtt_clients()
 
+    # Resume uploads left in the persistent queue by a previous run
+    get_upload_queue()
+
     # Start the camera watcher manager (restore from Redis)
     logger.info("[Watcher] Restoring camera watchers from Redis and starting directory watcher(s)...")
     try:
@@ -47,6 +52,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     await app.state.redis_client.close()
+    await http_client.close()
 
 
 @app.get("/")
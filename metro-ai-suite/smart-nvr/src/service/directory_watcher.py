@@ -1,9 +1,11 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import time
 import os
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from threading import Timer, Thread, Lock
@@ -24,6 +26,10 @@ _handler: Optional["DebouncedHandler"] = None
 _enabled_cameras: Dict[str, bool] = {}
 _mapping_lock = Lock()
 _current_debounce: Optional[int] = None
+_watermark_lock = Lock()
+
+MIN_FILE_SIZE = 524288  # ~512KB threshold; ignore tiny partial files
+MAX_READY_TRACKED = 10000
 
 # Root paths to watch. Support legacy single path plus optional list (comma separated)
 _primary_root = getattr(settings, "WATCH_DIRECTORY_CONTAINER_PATH", None)
@@ -42,15 +48,40 @@ if not _root_watch_paths:
 
 
 class DebouncedHandler(FileSystemEventHandler):
+    """
+    Collects finished recordings of enabled cameras and hands them to `action` in batches.
+
+    A file is ready once it is closed after writing or moved into place (inotify events), or,
+    where those events are not available, once its size and mtime stayed the same over
+    `stable_polls` polls `poll_interval` seconds apart, so recordings still being written are not
+    picked up. Ready files are dispatched once `batch_size` of them accumulated, otherwise
+    `debounce_time` after the first one.
+    """
     last_updated = None  # Class-level attribute
     lock = Lock()  # Lock for thread safety
 
-    def __init__(self, debounce_time: int, action: Callable[[Set[str]], None]):
+    def __init__(
+        self,
+        debounce_time: int,
+        action: Callable[[Set[str]], None],
+        stable_polls: int = settings.WATCHER_STABLE_POLLS,
+        poll_interval: float = settings.WATCHER_POLL_INTERVAL,
+        batch_size: int = settings.WATCHER_BATCH_SIZE,
+    ):
         self.debounce_time = debounce_time
         self.action = action
+        self.stable_polls = stable_polls
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
         self.timer: Optional[Timer] = None
         self.file_paths: Set[str] = set()
         self.first_event_time: Optional[datetime] = None
+        # Files seen but not yet stable: path -> [size, mtime, unchanged polls]
+        self._candidates: Dict[str, list] = {}
+        self._candidates_lock = Lock()
+        self._poll_timer: Optional[Timer] = None
+        # Files already handed on, so later modified events for them are ignored
+        self._ready: "OrderedDict[str, None]" = OrderedDict()
 
     def _camera_enabled(self, file_path: str) -> bool:
         """Determine the camera name from the file path relative to root and check if enabled."""
@@ -91,25 +122,88 @@ class DebouncedHandler(FileSystemEventHandler):
             logger.debug(f"Could not determine camera for {file_path}: {e}")
             return False
 
-    def _handle_file_event(self, path: str, log_prefix: str):
-        """Common logic for created/modified events."""
+    def _accept(self, path: str) -> bool:
         if not path.endswith(".mp4"):
-            return
+            return False
         if not os.path.exists(path):  # transient create/delete racing
-            return
+            return False
         try:
-            if os.path.getsize(path) <= 524288:  # ~512KB threshold; ignore tiny partial files
-                return
+            if os.path.getsize(path) <= MIN_FILE_SIZE:  # ignore tiny partial files
+                return False
         except OSError:
-            return
-        if not self._camera_enabled(path):
+            return False
+        return self._camera_enabled(path)
+
+    def _handle_file_event(self, path: str, log_prefix: str):
+        """Common logic for created/modified events: watch the file until it is stable."""
+        if path in self._ready or not self._accept(path):
             return
         # Use debug for modified, info for first-time create scale reduction
         log_fn = logger.info if log_prefix == "created" else logger.debug
         log_fn(f"[Watcher] {log_prefix} accepted file: {path}")
+        self.track(path)
+
+    def track(self, path: str):
+        """Marks `path` ready once its size and mtime stop changing."""
+        if self.stable_polls <= 0:
+            self._mark_ready(path, "no stability check")
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._candidates_lock:
+            if path not in self._candidates:
+                self._candidates[path] = [stat.st_size, stat.st_mtime, 0]
+            if self._poll_timer is None:
+                self._start_poll_timer()
+
+    def _start_poll_timer(self):
+        self._poll_timer = Timer(self.poll_interval, self._poll)
+        self._poll_timer.daemon = True
+        self._poll_timer.start()
+
+    def _poll(self):
+        ready = []
+        with self._candidates_lock:
+            for path, state in list(self._candidates.items()):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    del self._candidates[path]
+                    continue
+                if (stat.st_size, stat.st_mtime) == (state[0], state[1]):
+                    state[2] += 1
+                    if state[2] >= self.stable_polls:
+                        del self._candidates[path]
+                        ready.append(path)
+                else:
+                    state[:] = [stat.st_size, stat.st_mtime, 0]
+            self._poll_timer = None
+            if self._candidates:
+                self._start_poll_timer()
+        for path in ready:
+            self._mark_ready(path, "stable")
+
+    def _mark_ready(self, path: str, reason: str):
+        with self._candidates_lock:
+            self._candidates.pop(path, None)
+            if path in self._ready:
+                return
+            self._ready[path] = None
+            while len(self._ready) > MAX_READY_TRACKED:
+                self._ready.popitem(last=False)
+        logger.info(f"[Watcher] Ready ({reason}): {path}")
         with self.lock:
             self.file_paths.add(path)
-        self._debounce()
+            full = len(self.file_paths) >= self.batch_size
+        if full:
+            logger.debug(f"[Watcher] Batch size {self.batch_size} reached; processing now")
+            if self.timer:
+                self.timer.cancel()
+            self._process_files()
+        else:
+            self._debounce()
 
     def on_created(self, event):  # watchdog callback
         if not event.is_directory:
@@ -119,6 +213,14 @@ class DebouncedHandler(FileSystemEventHandler):
         if not event.is_directory:
             self._handle_file_event(event.src_path, "modified")
 
+    def on_closed(self, event):  # watchdog callback (inotify IN_CLOSE_WRITE): the writer is done
+        if not event.is_directory and self._accept(event.src_path):
+            self._mark_ready(event.src_path, "closed after write")
+
+    def on_moved(self, event):  # watchdog callback: renamed into place, complete by convention
+        if not event.is_directory and self._accept(event.dest_path):
+            self._mark_ready(event.dest_path, "moved into place")
+
     def _debounce(self):
         if self.first_event_time is None:
             self.first_event_time = datetime.now()
@@ -154,6 +256,7 @@ class DebouncedHandler(FileSystemEventHandler):
                     duration = time.time() - start_ts
                     if result:
                         logger.info(f"[Watcher] Batch action success (files={len(self.file_paths)} elapsed={duration:.2f}s)")
+                        _advance_watermarks(_recording_slots(self.file_paths))
                     else:
                         logger.warning(f"[Watcher] Batch action reported failure or partial success (files={len(self.file_paths)} elapsed={duration:.2f}s). Check preceding logs for details.")
                     self.file_paths.clear()
@@ -252,53 +355,149 @@ async def set_camera_watcher_mapping(
 
 
 def _initial_scan_for_cameras(cameras: list[str], action: Callable[[Set[str]], None]):
-    """Scan existing directory tree for mp4 files belonging to newly enabled cameras and process them."""
+    """
+    Dispatch existing recordings of newly enabled cameras that are newer than their watermark.
+
+    Date and hour directories before a camera's watermark (less one hour of overlap) are skipped
+    without being listed, so the scan covers the recordings since the last run rather than the
+    whole history. Files modified too recently to be complete go through the handler's
+    stability check instead of being dispatched.
+    """
     try:
         if not _root_watch_paths:
             return
+        watermarks = _load_watermarks()
+        floors = {camera: _slot_floor(watermarks.get(camera)) for camera in cameras}
+        settle_before = time.time() - (_handler.poll_interval * max(_handler.stable_polls, 1) if _handler else 0)
         batch: Set[str] = set()
+        unsettled: Set[str] = set()
+        newest: Dict[str, str] = {}
         # Iterate over all roots and walk expected Frigate layout.
         for root_base in _root_watch_paths:
             try:
-                date_dirs = [d for d in os.listdir(root_base) if _looks_like_date(d)]
+                date_dirs = sorted(d for d in os.listdir(root_base) if _looks_like_date(d))
             except Exception as e:
                 logger.debug(f"[Watcher] Could not list root {root_base} for initial scan: {e}")
                 continue
             for date_dir in date_dirs:
+                if all(date_dir < floor[:10] for floor in floors.values()):
+                    continue
                 date_path = os.path.join(root_base, date_dir)
                 if not os.path.isdir(date_path):
                     continue
                 try:
-                    hour_dirs = [h for h in os.listdir(date_path) if len(h) == 2 and h.isdigit()]
+                    hour_dirs = sorted(h for h in os.listdir(date_path) if len(h) == 2 and h.isdigit())
                 except Exception:
                     continue
                 for hour_dir in hour_dirs:
                     hour_path = os.path.join(date_path, hour_dir)
                     if not os.path.isdir(hour_path):
                         continue
+                    slot = f"{date_dir}/{hour_dir}"
                     for camera in cameras:
+                        if slot < floors[camera]:
+                            continue
                         cam_path = os.path.join(hour_path, camera)
                         if not os.path.isdir(cam_path):
                             continue
+                        newest[camera] = max(newest.get(camera, ""), slot)
                         for root, _, files in os.walk(cam_path):
                             for f in files:
                                 if not f.endswith('.mp4'):
                                     continue
                                 fp = os.path.join(root, f)
                                 try:
-                                    if os.path.getsize(fp) > 524288:
-                                        batch.add(fp)
+                                    stat = os.stat(fp)
                                 except OSError:
                                     continue
+                                if stat.st_size <= MIN_FILE_SIZE:
+                                    continue
+                                if stat.st_mtime > settle_before:
+                                    unsettled.add(fp)
+                                else:
+                                    batch.add(fp)
+        if unsettled and _handler:
+            logger.info(f"[Watcher] Initial scan: {len(unsettled)} recent files of {cameras} wait for the stability check")
+            for fp in unsettled:
+                _handler.track(fp)
+        elif unsettled:
+            batch |= unsettled
         if batch:
-            logger.info(f"[Watcher] Initial scan found {len(batch)} existing files for newly enabled cameras {cameras}. Dispatching action.")
-            action(batch)
+            logger.info(f"[Watcher] Initial scan found {len(batch)} existing files for newly enabled cameras {cameras} (since {floors}). Dispatching action.")
+            ordered = sorted(batch)
+            size = _handler.batch_size if _handler else settings.WATCHER_BATCH_SIZE
+            for i in range(0, len(ordered), size):
+                action(set(ordered[i:i + size]))
         else:
             logger.info(f"[Watcher] Initial scan found no existing files for cameras {cameras} above size threshold.")
+        _advance_watermarks(newest)
     except Exception as e:
         logger.error(f"Error during initial camera scan: {e}")
 
 
+def _watcher_state_path() -> str:
+    return os.path.abspath(settings.WATCHER_STATE_PATH)
+
+
+def _load_watermarks() -> Dict[str, str]:
+    """Per camera "YYYY-MM-DD/HH" of the newest recording hour already handed on."""
+    try:
+        with open(_watcher_state_path()) as f:
+            return json.load(f).get("scan_watermarks", {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"[Watcher] Could not read scan watermarks, scanning everything: {e}")
+        return {}
+
+
+def _advance_watermarks(slots: Dict[str, str]):
+    """Moves camera watermarks forward (never back) and persists them atomically."""
+    if not slots:
+        return
+    with _watermark_lock:
+        watermarks = _load_watermarks()
+        changed = {camera: slot for camera, slot in slots.items() if slot > watermarks.get(camera, "")}
+        if not changed:
+            return
+        watermarks.update(changed)
+        path = _watcher_state_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"scan_watermarks": watermarks}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[Watcher] Could not persist scan watermarks: {e}")
+
+
+def _slot_floor(watermark: Optional[str]) -> str:
+    """First "YYYY-MM-DD/HH" slot to scan: one hour before the watermark, for files finished late."""
+    if not watermark:
+        return ""
+    try:
+        return (datetime.strptime(watermark, "%Y-%m-%d/%H") - timedelta(hours=1)).strftime("%Y-%m-%d/%H")
+    except ValueError:
+        return ""
+
+
+def _recording_slots(paths) -> Dict[str, str]:
+    """Newest "YYYY-MM-DD/HH" per camera among recordings in the Frigate <date>/<hour>/<camera> layout."""
+    slots: Dict[str, str] = {}
+    for path in paths:
+        for root in _root_watch_paths:
+            rel = os.path.relpath(path, root)
+            if rel.startswith('..'):
+                continue
+            parts = rel.split(os.sep)
+            if len(parts) >= 4 and _looks_like_date(parts[0]) and parts[1].isdigit() and len(parts[1]) == 2:
+                slot = f"{parts[0]}/{parts[1]}"
+                slots[parts[2]] = max(slots.get(parts[2], ""), slot)
+            break
+    return slots
+
+
 def _looks_like_date(s: str) -> bool:
     """Return True if string matches YYYY-MM-DD."""
     if len(s) != 10:
@@ -37,8 +37,8 @@ async def dispatch_action(action: str, event: dict):
             # Save summary_id under the rule
             await save_summary_id(event["rule_id"], summary_id)
 
-            # Retrieve actual summary result (synchronously)
-            summary_result = vms_service.summary(summary_id)["summary"]
+            # Retrieve actual summary result
+            summary_result = (await vms_service.summary(summary_id))["summary"]
 
             logger.info(
                 f"Saving summary result  {summary_result} for summary id {summary_id}"
@@ -0,0 +1,108 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+
+from config import MQTT_COALESCE_WINDOW
+from service.rule_engine import process_event
+
+logger = logging.getLogger("event-coalescer")
+
+# Shorter events are not worth a clip summary
+MIN_EVENT_DURATION = 10
+# Ended event ids remembered to drop late duplicate `end`/`update` messages
+MAX_FINISHED_EVENTS = 4096
+
+
+def is_dispatchable(event: dict) -> bool:
+    label = event.get("label")
+    camera_name = event.get("camera")
+    start_time = event.get("start_time")
+    end_time = event.get("end_time")
+    return bool(
+        label and camera_name and start_time and end_time
+        and (end_time - start_time) >= MIN_EVENT_DURATION
+    )
+
+
+class EventCoalescer:
+    """
+    Per event id coalescing of Frigate `new`/`update`/`end` messages.
+
+    The first message of an event opens a window of `window` seconds; later messages for the same
+    id only replace the held state. The window is flushed when it expires, or at once on `end`.
+    A flushed state goes to rule evaluation only if it is a new transition: the event has ended,
+    lasted long enough, and was not already dispatched with that label. All methods except
+    submit_threadsafe() run on the event loop that evaluates rules.
+    """
+
+    def __init__(self, handler=process_event, window: float = MQTT_COALESCE_WINDOW,
+                 max_finished: int = MAX_FINISHED_EVENTS):
+        self.handler = handler
+        self.window = window
+        self.max_finished = max_finished
+        self._pending = {}
+        self._dispatched = OrderedDict()
+        self.counters = Counter(received=0, merged=0, dispatched=0, skipped=0)
+
+    def submit_threadsafe(self, loop: asyncio.AbstractEventLoop, message_type: str, event: dict, context: dict):
+        """Hands a message from an MQTT client thread to `loop`."""
+        loop.call_soon_threadsafe(self.submit, message_type, event, context)
+
+    def submit(self, message_type: str, event: dict, context: dict):
+        self.counters["received"] += 1
+        event_id = event.get("id")
+        if event_id is None:
+            self._flush_state(event, context)
+            return
+
+        pending = self._pending.get(event_id)
+        if pending is not None:
+            self.counters["merged"] += 1
+            pending[0], pending[1] = event, context
+        else:
+            handle = asyncio.get_running_loop().call_later(self.window, self._flush, event_id)
+            pending = self._pending[event_id] = [event, context, handle]
+
+        if message_type == "end":
+            pending[2].cancel()
+            self._flush(event_id)
+
+    def _flush(self, event_id):
+        pending = self._pending.pop(event_id, None)
+        if pending is not None:
+            self._flush_state(pending[0], pending[1])
+
+    def _flush_state(self, event: dict, context: dict):
+        event_id = event.get("id")
+        label = event.get("label")
+        if not is_dispatchable(event) or (event_id is not None and self._dispatched.get(event_id) == label):
+            self.counters["skipped"] += 1
+            return
+
+        if event_id is not None:
+            self._dispatched[event_id] = label
+            self._dispatched.move_to_end(event_id)
+            while len(self._dispatched) > self.max_finished:
+                self._dispatched.popitem(last=False)
+
+        self.counters["dispatched"] += 1
+        logger.info(
+            f" Event {event_id} label: {label} |  Camera: {event.get('camera')} |  "
+            f"Start: {event.get('start_time')} |  End: {event.get('end_time')}"
+        )
+        task = asyncio.ensure_future(self.handler(event, context))
+        task.add_done_callback(
+            lambda fut: (
+                logger.info(f" process_event completed: {fut.result()}")
+                if not fut.exception()
+                else logger.error(f" process_event failed: {fut.exception()}", exc_info=True)
+            )
+        )
+
+    def get_stats(self) -> dict:
+        return {**self.counters, "pending": len(self._pending)}
+
+
+event_coalescer = EventCoalescer()
@@ -8,6 +8,8 @@ import ssl
 import time
 import paho.mqtt.client as mqtt
 from service.rule_engine import process_event
+from service.rule_index import rule_index
+from service.event_coalescer import event_coalescer
 from datetime import datetime
 from datetime import timedelta
 from config import (
@@ -88,31 +90,13 @@ def on_message(client, userdata, msg):
         if msg.topic.startswith("frigate/"):
             event_data = payload.get("after") or payload.get("before") or {}
             logger.info(f" Message received on topic: {msg.topic} at {event_data.get('frame_time')}")
-            label = event_data.get("label")
-            camera_name = event_data.get("camera")
-            start_time = event_data.get("start_time")
-            end_time = event_data.get("end_time")
-
-            if label and camera_name and start_time and end_time and (end_time - start_time) >= 10:
-                logger.info(
-                    f" Event label: {label} |  Camera: {camera_name} |  Start: {start_time} |  End: {end_time}"
-                )
-                future = asyncio.run_coroutine_threadsafe(
-                    process_event(event_data, context={"source": "frigate", "topic": msg.topic}),
-                    event_loop,
-                )
-                future.add_done_callback(
-                    lambda fut: (
-                        logger.info(f" process_event completed: {fut.result()}")
-                        if not fut.exception()
-                        else logger.error(f" process_event failed: {fut.exception()}", exc_info=True)
-                    )
-                )
-            else:
-                return
-                #logger.warning(
-                    #" Skipping Frigate summary due to missing fields or short duration (<10s)."
-                #)
+            # merged per event id; rules are evaluated once the event reaches a new dispatchable state
+            event_coalescer.submit_threadsafe(
+                event_loop,
+                payload.get("type"),
+                event_data,
+                {"source": "frigate", "topic": msg.topic},
+            )
 
         elif msg.topic.startswith("scenescape/"):
             now = time.time()
@@ -170,6 +154,8 @@ def start_mqtt(broker, port, user, password, userdata,
     logger.info(f" Connecting to MQTT broker {userdata} at {broker}:{port}")
 
 async def start_mqtt_clients():
+    # process_event runs on event_loop, so the rule index is kept current from the same loop
+    asyncio.run_coroutine_threadsafe(rule_index.listen(), event_loop)
     await asyncio.to_thread(
         start_mqtt,
         MQTT_BROKER,
@@ -18,6 +18,19 @@ fallback_redis_client = redis.from_url(
 )
 
 logger = logging.getLogger("redis-store")
+
+# Keep in sync with service.rule_index.RULES_CHANNEL
+RULES_CHANNEL = "rules:changed"
+
+
+async def _publish_rule_change(redis_client, rule_id: str):
+    """Tells rule indexes in every process to reload; a lost notification only delays the reload."""
+    try:
+        await redis_client.publish(RULES_CHANNEL, rule_id)
+    except Exception as e:
+        logger.error(f"Failed to publish rule change for {rule_id}: {e}")
+
+
 async def add_rule(request: Request, rule_id: str, rule_data: dict) -> bool:
     """Adds a new rule if it doesn't already exist. Returns True if added, False if exists."""
     redis_client = request.app.state.redis_client
@@ -26,6 +39,7 @@ async def add_rule(request: Request, rule_id: str, rule_data: dict) -> bool:
         return False
     await redis_client.set(key, json.dumps(rule_data))
     await redis_client.sadd("rules", rule_id)
+    await _publish_rule_change(redis_client, rule_id)
     return True
 
 
@@ -34,6 +48,7 @@ async def store_rule(request: Request, rule_id: str, rule_data: dict):
     redis_client = request.app.state.redis_client
     await redis_client.set(f"rule:{rule_id}", json.dumps(rule_data))
     await redis_client.sadd("rules", rule_id)
+    await _publish_rule_change(redis_client, rule_id)
 
 
 async def get_rule(request: Request, rule_id: str):
@@ -50,13 +65,12 @@ async def get_rules(request=None):
         if request
         else fallback_redis_client
     )
-    rule_ids = await redis_client.smembers("rules")
-    rules = []
-    for rid in rule_ids:
-        data = await redis_client.get(f"rule:{rid}")
-        if data:
-            rules.append(json.loads(data))
-    return rules
+    rule_ids = sorted(await redis_client.smembers("rules"))
+    if not rule_ids:
+        return []
+    # One MGET instead of a GET per rule
+    values = await redis_client.mget([f"rule:{rid}" for rid in rule_ids])
+    return [json.loads(data) for data in values if data]
 
 
 import json
@@ -76,6 +90,7 @@ async def delete_rule(request: Request, rule_id: str) -> bool:
     await redis_client.delete(f"rule:{rule_id}")
     await redis_client.delete(f"search_results:{rule_id}")
     await redis_client.srem("rules", rule_id)
+    await _publish_rule_change(redis_client, rule_id)
 
     # Delete associated summary_result keys from response list
     response_key = f"response:{rule_id}"
@@ -94,6 +109,11 @@ async def delete_rule(request: Request, rule_id: str) -> bool:
             # Log or ignore malformed entries
             pass
 
+    # Completed summaries cached for every summary created by the rule
+    for summary_id in await redis_client.lrange(f"summary_ids:{rule_id}", 0, -1):
+        summary_keys_to_delete.append(f"summary_completed:{summary_id}")
+    summary_keys_to_delete.append(f"summary_ids:{rule_id}")
+
     # Delete response and all summary_result:* keys
     await redis_client.delete(response_key)
     if summary_keys_to_delete:
@@ -155,10 +175,30 @@ async def save_search(rule_id: str, search_output: dict, request=None):
     await redis_client.rpush(f"search_results:{rule_id}", entry)
 
 
-async def get_summary_ids(request: Request, rule_id: str):
-    """Get all summary IDs for a rule."""
+async def get_summary_ids(request: Request, rule_id: str, offset: int = 0, limit: int = None):
+    """Get the summary IDs for a rule, oldest first; `offset`/`limit` select a page."""
+    redis_client = request.app.state.redis_client
+    end = -1 if limit is None else offset + limit - 1
+    return await redis_client.lrange(f"summary_ids:{rule_id}", offset, end)
+
+
+async def save_completed_summary(summary_id: str, result: dict, request=None):
+    """Store a summary that reached its final state; it is served from Redis from then on."""
+    redis_client = (
+        getattr(request.app.state, "redis_client", None)
+        if request
+        else fallback_redis_client
+    )
+    await redis_client.set(f"summary_completed:{summary_id}", json.dumps(result))
+
+
+async def get_completed_summaries(request: Request, summary_ids: list) -> dict:
+    """Completed summaries among `summary_ids` (one round trip), keyed by summary ID."""
+    if not summary_ids:
+        return {}
     redis_client = request.app.state.redis_client
-    return await redis_client.lrange(f"summary_ids:{rule_id}", 0, -1)
+    values = await redis_client.mget([f"summary_completed:{sid}" for sid in summary_ids])
+    return {sid: json.loads(value) for sid, value in zip(summary_ids, values) if value}
 
 
 async def save_summary_result(summary_id: str, summary_result: str, request=None):
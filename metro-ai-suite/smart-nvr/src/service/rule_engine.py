@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from service.redis_store import get_rules, store_response
 from service.dispatcher import dispatch_action
+from service.rule_index import rule_index
 import logging
 from fastapi import Request
 
@@ -24,18 +25,12 @@ async def process_event(event: dict, context: dict = None):
         logger.info(f"Event context: {context}")
 
     logger.info(f"Detected label: {event.get('label')}")
-    rules = await get_rules()
-    logger.info(f"Loaded {len(rules)} rules")
+    # Only rules for this camera (or any camera) and label; Redis is read only after a rule change
+    rules = await rule_index.match(event.get("camera"), event.get("label"), get_rules)
+    logger.info(f"{len(rules)} rules match camera and label")
 
     for rule in rules:
         logger.info(f"Evaluating rule: {rule}")
-        if rule.get("label") != event.get("label"):
-            logger.info("Rule did not match: label mismatch.")
-            continue
-
-        if rule.get("camera") and rule["camera"] != event.get("camera"):
-            logger.info("Rule did not match: camera mismatch.")
-            continue
 
         rule_source = rule.get("source")
         event_source = (context or {}).get("source") if context else None
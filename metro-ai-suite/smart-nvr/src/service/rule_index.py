@@ -0,0 +1,89 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import logging
+from collections import defaultdict
+
+import redis.asyncio as redis
+from config import REDIS_HOST, REDIS_PORT
+
+logger = logging.getLogger("rule-index")
+
+# Published by redis_store whenever a rule is added, overwritten or deleted
+RULES_CHANNEL = "rules:changed"
+# Keyspace notifications for the "rules" set, delivered only if the server has notify-keyspace-events enabled;
+# they also catch rule changes made outside this service
+RULES_KEYSPACE_PATTERN = "__keyspace@*__:rules"
+RECONNECT_DELAY = 2.0
+
+
+class RuleIndex:
+    """
+    In-process index of the configured rules, keyed by (camera, label).
+
+    Rules without a camera match every camera and are kept under (None, label). The index is
+    built from Redis once and reused until a rule change is announced on RULES_CHANNEL. While
+    no change listener is subscribed, changes could be missed, so every lookup reloads.
+    """
+
+    def __init__(self):
+        self._rules = {}
+        self._stale = True
+        self.subscribed = False
+
+    def invalidate(self):
+        self._stale = True
+
+    def build(self, rules: list):
+        index = defaultdict(list)
+        for rule in rules:
+            index[(rule.get("camera") or None, rule.get("label"))].append(rule)
+        self._rules = dict(index)
+
+    async def match(self, camera, label, loader) -> list:
+        """
+        Rules whose camera and label match the event. `loader` is an async callable returning
+        all rules; it is only awaited when the index is stale.
+        """
+        if self._stale or not self.subscribed:
+            # cleared first: an invalidation arriving while loading marks the index stale again
+            self._stale = False
+            rules = await loader()
+            self.build(rules)
+            logger.info(f"Rule index rebuilt with {len(rules)} rules")
+        matched = self._rules.get((None, label), [])
+        camera = camera or None
+        if camera is not None:
+            matched = self._rules.get((camera, label), []) + matched
+        return list(matched)
+
+    async def listen(self, redis_url: str = f"redis://{REDIS_HOST}:{REDIS_PORT}"):
+        """Invalidates the index on every rule change notification; reconnects on errors."""
+        while True:
+            client = redis.from_url(redis_url, decode_responses=True)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(RULES_CHANNEL)
+                await pubsub.psubscribe(RULES_KEYSPACE_PATTERN)
+                self.subscribed = True
+                # changes made before the subscription was active are unknown
+                self.invalidate()
+                logger.info(f"Listening for rule changes on {RULES_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") in ("message", "pmessage"):
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Rule change listener disconnected: {e}")
+            finally:
+                self.subscribed = False
+                try:
+                    await pubsub.close()
+                    await client.close()
+                except Exception:
+                    pass
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+rule_index = RuleIndex()
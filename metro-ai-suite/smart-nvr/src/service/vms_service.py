@@ -1,19 +1,22 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
-import requests
 import os
+import time
+import asyncio
 import tempfile
 import subprocess
-import aiofiles
 import logging
+from collections import deque
 from pathlib import Path
 from typing import Optional
+import aiohttp
 from fastapi import HTTPException
 from api.endpoints.frigate_api import FrigateService
 from model.model import Sampling, Evam, SummaryPayload
 from api.endpoints.summarization_api import SummarizationService
 from config import VSS_SUMMARY_URL
 from config import VSS_SEARCH_URL
+from utils.http_client import http_client, HttpError, RETRY_STATUSES
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -22,6 +25,9 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+# Clips this small carry no footage for the requested range
+MIN_CLIP_SIZE = 100
+
 frigate_service = FrigateService()
 summarization_service = SummarizationService()
 
@@ -32,17 +38,57 @@ class VmsService:
         self.summarization_service = summarization_service
         self.vss_summary_url: str = VSS_SUMMARY_URL
         self.vss_search_url: str = VSS_SEARCH_URL
+        self.transfer_stats = {"streamed": 0, "spilled": 0, "streamed_bytes": 0, "spilled_bytes": 0}
+        self._summary_start_times = deque(maxlen=100)  # seconds from request to summary pipeline created
         logger.info("VmsService initialized.")
 
+    def get_transfer_stats(self) -> dict:
+        """How clips reached the summarizer: streamed without a local copy, or spilled to disk for a retry."""
+        times = list(self._summary_start_times)
+        return {
+            **self.transfer_stats,
+            "time_to_summary_start_sec": {
+                "last": round(times[-1], 3) if times else None,
+                "avg": round(sum(times) / len(times), 3) if times else None,
+                "max": round(max(times), 3) if times else None,
+            },
+        }
+
+    @staticmethod
+    def _video_id_response(upload_result) -> dict:
+        if not upload_result or "videoId" not in upload_result:
+            return {
+                "status": 500,
+                "message": "Video upload failed - no videoId returned",
+            }
+
+        logger.info(f"Video uploaded, videoId: {upload_result.get('videoId')}")
+        return {"status": 200, "message": upload_result["videoId"]}
+
     async def upload_video_to_summarizer(
         self, camera_name: str, start_time: float, end_time: float, is_search: bool
     ) -> dict:
-        """Fetches clip from Frigate, writes to temp file, uploads it, and returns videoId."""
+        """
+        Streams the clip from Frigate straight into the upload and returns videoId.
+
+        The clip only goes through a temporary file when the streamed upload fails in a way
+        worth retrying, since a retry needs the bytes again.
+        """
+        base_url = self.vss_search_url if is_search else self.vss_summary_url
         try:
-            stream_response = self.frigate_service.get_clip_from_timestamps(
-                camera_name, start_time, end_time, download=True
+            source_url = self.frigate_service.clip_url(camera_name, start_time, end_time, download=True)
+            relay = await self.summarization_service.video_upload_stream(
+                source_url, base_url, camera_name, min_size=MIN_CLIP_SIZE
             )
-            logger.info("Clip retrieved from Frigate.")
+        except HttpError as e:
+            logger.error(f"Failed to get clip: {e}")
+            return {
+                "status": 500,
+                "message": "Failed to retrieve video clip from camera",
+            }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Streaming the clip to {base_url} failed ({type(e).__name__}: {e}); retrying from a local copy")
+            return await self._upload_from_file(camera_name, start_time, end_time, base_url)
         except Exception as e:
             logger.error(f"Failed to get clip: {e}")
             return {
@@ -50,24 +96,60 @@ class VmsService:
                 "message": "Failed to retrieve video clip from camera",
             }
 
-        # Write stream to temp file while checking size
-        temp_file_size = 0
+        if relay.upload is None:
+            logger.warning(f"No video found for given timestamps (clip size: {relay.size} bytes)")
+            return {
+                "status": 404,
+                "message": "No video footage available for the selected time range. Please try different timestamps.",
+            }
+        if relay.upload.status in RETRY_STATUSES:
+            logger.warning(f"Streamed upload to {base_url} got HTTP {relay.upload.status}; retrying from a local copy")
+            return await self._upload_from_file(camera_name, start_time, end_time, base_url)
+
+        self.transfer_stats["streamed"] += 1
+        self.transfer_stats["streamed_bytes"] += relay.size
+        logger.info(
+            f"Streamed {relay.size} bytes from Frigate to {base_url} "
+            f"(upload started after {relay.upload_start_sec:.3f}s)"
+        )
+        try:
+            relay.upload.raise_for_status()
+            return self._video_id_response(relay.upload.json())
+        except Exception as e:
+            logger.error(f"Video upload failed: {e}")
+            return {"status": 500, "message": "Video upload failed"}
+
+    async def _upload_from_file(
+        self, camera_name: str, start_time: float, end_time: float, base_url: str
+    ) -> dict:
+        """Fetches clip from Frigate, writes to temp file, uploads it with retries, and returns videoId."""
         with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp_file:
             tmp_path = tmp_file.name
         logger.info(f"Temporary file created at: {tmp_path}")
 
+        # Stream the clip to the temp file (on the shared HTTP client loop) while counting its size
         try:
-            async with aiofiles.open(tmp_path, "wb") as f:
-                async for chunk in stream_response.body_iterator:
-                    await f.write(chunk)
-                    temp_file_size += len(chunk)
+            temp_file_size = await self.frigate_service.download_clip(
+                camera_name, start_time, end_time, tmp_path, download=True
+            )
+            logger.info("Clip retrieved from Frigate.")
+        except Exception as e:
+            logger.error(f"Failed to get clip: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return {
+                "status": 500,
+                "message": "Failed to retrieve video clip from camera",
+            }
 
+        self.transfer_stats["spilled"] += 1
+        self.transfer_stats["spilled_bytes"] += temp_file_size
+        try:
             # Check if video is too small (likely empty)
-            if temp_file_size <= 100:
+            if temp_file_size <= MIN_CLIP_SIZE:
                 logger.warning(
                     f"No video found for given timestamps (file size: {temp_file_size} bytes)"
                 )
-                os.remove(tmp_path)
                 return {
                     "status": 404,
                     "message": "No video footage available for the selected time range. Please try different timestamps.",
@@ -76,29 +158,10 @@ class VmsService:
             logger.info(
                 f"Stream written to temporary file. Size: {temp_file_size} bytes"
             )
-        except Exception as e:
-            logger.error(f"Failed to process video stream: {e}")
-            return {"status": 500, "message": "Failed to process video stream"}
-
-        # Upload file
-        try:
-            if is_search:
-                upload_result = self.summarization_service.video_upload(
-                    tmp_path, self.vss_search_url, camera_name
-                )
-            else:
-                upload_result = self.summarization_service.video_upload(
-                    tmp_path, self.vss_summary_url, camera_name
-                )
-
-            if not upload_result or "videoId" not in upload_result:
-                return {
-                    "status": 500,
-                    "message": "Video upload failed - no videoId returned",
-                }
-
-            logger.info(f"Video uploaded, videoId: {upload_result.get('videoId')}")
-            return {"status": 200, "message": upload_result["videoId"]}
+            upload_result = await self.summarization_service.video_upload(
+                tmp_path, base_url, camera_name
+            )
+            return self._video_id_response(upload_result)
         except Exception as e:
             logger.error(f"Video upload failed: {e}")
             return {"status": 500, "message": "Video upload failed"}
@@ -118,6 +181,7 @@ class VmsService:
             f"start_time: {start_time}, end_time: {end_time}"
         )
 
+        started = time.monotonic()
         upload_resp = await self.upload_video_to_summarizer(
             camera_name, start_time, end_time, False
         )
@@ -131,7 +195,7 @@ class VmsService:
                 sampling=Sampling(chunkDuration=8, samplingFrame=8),
                 evam=Evam(evamPipeline="object_detection"),
             )
-            pipeline = self.summarization_service.create_summary(
+            pipeline = await self.summarization_service.create_summary(
                 payload, self.vss_summary_url
             )
 
@@ -141,18 +205,26 @@ class VmsService:
                     "message": "Summary creation failed - no pipelineId returned",
                 }
 
+            elapsed = time.monotonic() - started
+            self._summary_start_times.append(elapsed)
             logger.info(
-                f"Summary pipeline created with ID: {pipeline.get('summaryPipelineId')}"
+                f"Summary pipeline created with ID: {pipeline.get('summaryPipelineId')} "
+                f"{elapsed:.3f}s after the request"
             )
             return {"status": 200, "message": pipeline["summaryPipelineId"]}
         except Exception as e:
             logger.error(f"Failed to create summary: {e}")
             return {"status": 500, "message": "Failed to create video summary"}
 
-    def summary(self, summary_id: str):
+    @staticmethod
+    def is_summary_complete(result) -> bool:
+        """True for a final summary() result; in-progress results carry frameSummaries instead."""
+        return bool(result) and bool(result.get("summary")) and "frameSummaries" not in result
+
+    async def summary(self, summary_id: str):
         logger.info(f"Fetching summary result for ID: {summary_id}")
         try:
-            result = summarization_service.get_summary_result(
+            result = await summarization_service.get_summary_result(
                 summary_id, self.vss_summary_url
             )
         except Exception as e:
@@ -216,7 +288,7 @@ class VmsService:
         logger.info(f"Calling search-embeddings API: {url}")
 
         try:
-            response = requests.post(url)
+            response = await http_client.post(url)
             response.raise_for_status()
             message = response.json().get("message", "No message in response.")
             logger.info(f"Embedding search response: {message}")
@@ -225,6 +297,6 @@ class VmsService:
                 "video_id": upload_resp["message"],
                 "message": message,
             }
-        except requests.RequestException as e:
+        except Exception as e:
             logger.error(f"Search embeddings API failed: {e}")
             raise
@@ -2,11 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 import asyncio
 import os
+import shutil
 import sys
 import pathlib
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
 
+# Keep the upload queue database and watcher state out of the working tree; settings read them at import
+_STATE_DIR = tempfile.mkdtemp(prefix="smart-nvr-tests-")
+os.environ.setdefault("UPLOAD_QUEUE_DB", os.path.join(_STATE_DIR, "upload_queue.db"))
+os.environ.setdefault("WATCHER_STATE_PATH", os.path.join(_STATE_DIR, "watcher_state.json"))
+
 # Ensure the src directory (parent of this tests folder) is on sys.path so 'api', 'service', etc. resolve
 _SRC_DIR = pathlib.Path(__file__).resolve().parents[1]
 if str(_SRC_DIR) not in sys.path:
@@ -19,6 +26,11 @@ from api.router import router  # api package lives under src/api
 app = FastAPI()
 app.include_router(router)
 
+@pytest.fixture(scope="session", autouse=True)
+def _state_dir():
+    yield _STATE_DIR
+    shutil.rmtree(_STATE_DIR, ignore_errors=True)
+
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
@@ -1,5 +1,6 @@
 """Additional directory_watcher tests for small helpers and mapping restoration."""
 import os
+import threading
 import pytest
 from unittest.mock import AsyncMock, patch
 from service import directory_watcher as dw
@@ -41,3 +42,92 @@ async def test_set_camera_watcher_mapping_starts_watcher(monkeypatch, tmp_path):
     result = await dw.set_camera_watcher_mapping({"camA": True}, 1, action_stub)
     assert result["camA"] is True
     assert dw.get_enabled_cameras()["camA"] is True
+
+
+def _recording(tmp_path, slot, camera="garage", name="seg.mp4", age=3600):
+    import time
+    date_dir, hour_dir = slot.split("/")
+    cam_dir = tmp_path / date_dir / hour_dir / camera
+    cam_dir.mkdir(parents=True, exist_ok=True)
+    fp = cam_dir / name
+    fp.write_bytes(b"0" * 600_000)
+    old = time.time() - age
+    os.utime(fp, (old, old))
+    return str(fp)
+
+
+def _scan_setup(monkeypatch, tmp_path):
+    state = tmp_path / "state" / "watcher_state.json"
+    monkeypatch.setattr("service.directory_watcher._root_watch_paths", [str(tmp_path / "rec")])
+    monkeypatch.setattr("service.directory_watcher._handler", None)
+    monkeypatch.setattr("service.directory_watcher._watcher_state_path", lambda: str(state))
+    listed = []
+    real_listdir = os.listdir
+    scanning_thread = threading.get_ident()
+
+    def listdir(path):
+        # scans started in the background by other tests may still be running
+        if threading.get_ident() == scanning_thread:
+            listed.append(path)
+        return real_listdir(path)
+
+    monkeypatch.setattr("service.directory_watcher.os.listdir", listdir)
+    return state, listed
+
+
+def test_initial_scan_is_incremental_from_watermark(monkeypatch, tmp_path):
+    import json
+    state, listed = _scan_setup(monkeypatch, tmp_path)
+    rec = tmp_path / "rec"
+    old = _recording(rec, "2025-01-01/10")
+    before_floor = _recording(rec, "2025-01-02/04")
+    overlap = _recording(rec, "2025-01-02/05")
+    latest = _recording(rec, "2025-01-02/06")
+    state.parent.mkdir()
+    state.write_text(json.dumps({"scan_watermarks": {"garage": "2025-01-02/06"}}))
+
+    batches = []
+    dw._initial_scan_for_cameras(["garage"], lambda files: batches.append(set(files)))
+
+    # the watermark hour and the hour before it are scanned again; older history is skipped
+    assert set().union(*batches) == {overlap, latest}
+    assert str(rec / "2025-01-01") not in listed
+    assert old and before_floor
+
+    newer = _recording(rec, "2025-01-02/07")
+    batches.clear()
+    dw._initial_scan_for_cameras(["garage"], lambda files: batches.append(set(files)))
+    # watermark was still 06, so 05 and 06 are rescanned along with the new hour
+    assert set().union(*batches) == {overlap, latest, newer}
+    assert json.loads(state.read_text())["scan_watermarks"]["garage"] == "2025-01-02/07"
+
+
+def test_first_scan_covers_history_in_batches(monkeypatch, tmp_path):
+    import json
+    state, _ = _scan_setup(monkeypatch, tmp_path)
+    monkeypatch.setattr(dw.settings, "WATCHER_BATCH_SIZE", 2)
+    rec = tmp_path / "rec"
+    files = {_recording(rec, f"2025-01-0{d}/0{h}") for d in (1, 2) for h in (1, 2)}
+
+    batches = []
+    dw._initial_scan_for_cameras(["garage"], lambda files: batches.append(set(files)))
+
+    assert set().union(*batches) == files
+    assert all(len(b) <= 2 for b in batches)
+    assert json.loads(state.read_text())["scan_watermarks"] == {"garage": "2025-01-02/02"}
+
+
+def test_recent_scan_files_go_through_stability_check(monkeypatch, tmp_path):
+    _scan_setup(monkeypatch, tmp_path)
+    rec = tmp_path / "rec"
+    settled = _recording(rec, "2025-01-02/06", name="old.mp4")
+    fresh = _recording(rec, "2025-01-02/06", name="fresh.mp4", age=0)
+    handler = dw.DebouncedHandler(5, lambda files: True, stable_polls=2, poll_interval=60)
+    monkeypatch.setattr("service.directory_watcher._handler", handler)
+
+    batches = []
+    dw._initial_scan_for_cameras(["garage"], lambda files: batches.append(set(files)))
+
+    assert batches == [{settled}]
+    assert fresh in handler._candidates
+    handler._poll_timer.cancel()
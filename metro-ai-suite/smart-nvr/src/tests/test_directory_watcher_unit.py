@@ -60,7 +60,8 @@ def test_camera_enabled_processes(monkeypatch, tmp_path):
         is_directory = False
         src_path = video
 
-    h.on_created(E())
+    # the writer closed the file, so it is ready without waiting for the stability polls
+    h.on_closed(E())
     # Force immediate processing
     h._process_files()
     # Wait briefly for action thread to run
@@ -98,3 +99,80 @@ def test_ignores_small_files(monkeypatch, tmp_path):
     time.sleep(0.1)
     # Should not have invoked action (events list empty)
     assert events == []  # nothing processed
+
+
+def wait_for(condition, timeout=3.0):
+    import time
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def enabled_garage(monkeypatch, tmp_path):
+    root = tmp_path / "2025-09-25" / "12" / "garage"
+    root.mkdir(parents=True)
+    monkeypatch.setattr("service.directory_watcher._root_watch_paths", [str(tmp_path)])
+    monkeypatch.setattr("service.directory_watcher._enabled_cameras", {"garage": True})
+    return root
+
+
+class Event:
+    is_directory = False
+
+    def __init__(self, src_path, dest_path=None):
+        self.src_path = src_path
+        self.dest_path = dest_path
+
+
+def test_growing_file_is_not_ready_until_stable(monkeypatch, tmp_path):
+    import time
+    root = enabled_garage(monkeypatch, tmp_path)
+    video = make_tmp_video(root)
+    batches = []
+    h = DebouncedHandler(debounce_time=0, action=lambda files: batches.append(set(files)),
+                         stable_polls=2, poll_interval=0.05)
+
+    h.on_created(Event(video))
+    # keep appending for several poll intervals, as a recorder still writing would
+    for _ in range(10):
+        with open(video, "ab") as f:
+            f.write(b"1" * 1024)
+        h.on_modified(Event(video))
+        time.sleep(0.03)
+    assert batches == []
+
+    assert wait_for(lambda: batches)
+    assert batches == [{video}]
+
+
+def test_moved_into_place_is_ready(monkeypatch, tmp_path):
+    root = enabled_garage(monkeypatch, tmp_path)
+    partial = make_tmp_video(root, name="clip.mp4.part")
+    final = str(root / "clip.mp4")
+    os.rename(partial, final)
+    batches = []
+    h = DebouncedHandler(debounce_time=0, action=lambda files: batches.append(set(files)))
+
+    h.on_moved(Event(partial, final))
+    assert wait_for(lambda: batches)
+    assert batches == [{final}]
+    # later modified events for a file already handed on are ignored
+    h.on_modified(Event(final))
+    assert h._candidates == {}
+
+
+def test_full_batch_is_dispatched_before_debounce(monkeypatch, tmp_path):
+    root = enabled_garage(monkeypatch, tmp_path)
+    videos = [make_tmp_video(root, name=f"clip{i}.mp4") for i in range(2)]
+    batches = []
+    h = DebouncedHandler(debounce_time=60, action=lambda files: batches.append(set(files)),
+                         stable_polls=0, batch_size=2)
+
+    for video in videos:
+        h.on_created(Event(video))
+    assert wait_for(lambda: batches)
+    assert batches == [set(videos)]
+
@@ -20,7 +20,7 @@ async def test_dispatcher_summarize_success(monkeypatch):
     class FakeVms:
         async def summarize(self, camera_name, start_time, end_time):
             return {"status": 200, "message": "sum123"}
-        def summary(self, summary_id):
+        async def summary(self, summary_id):
             return {"summary": "Summary text"}
 
     monkeypatch.setattr("service.dispatcher.vms_service", FakeVms())
@@ -49,7 +49,7 @@ async def test_dispatcher_summarize_non_200(monkeypatch):
     class FakeVms:
         async def summarize(self, *a, **k):
             return {"status": 500, "message": "failure"}
-        def summary(self, summary_id):
+        async def summary(self, summary_id):
             return {"summary": "Should not be used"}
 
     monkeypatch.setattr("service.dispatcher.vms_service", FakeVms())
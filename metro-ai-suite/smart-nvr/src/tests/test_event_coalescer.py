@@ -0,0 +1,119 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Tests for per event id coalescing of Frigate MQTT messages."""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from service.event_coalescer import EventCoalescer
+
+WINDOW = 0.05
+
+
+def frigate_event(event_id, end_time=None, label="car", start_time=100.0):
+    return {
+        "id": event_id,
+        "label": label,
+        "camera": "garage",
+        "start_time": start_time,
+        "end_time": end_time,
+    }
+
+
+def recording_handler(calls):
+    async def handler(event, context):
+        calls.append((event["id"], event["label"], event["end_time"]))
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_burst_is_dispatched_once_with_latest_state():
+    calls = []
+    coalescer = EventCoalescer(recording_handler(calls), window=WINDOW)
+    coalescer.submit("new", frigate_event("e1"), {})
+    for _ in range(20):
+        coalescer.submit("update", frigate_event("e1"), {})
+    coalescer.submit("end", frigate_event("e1", end_time=115.0), {})
+    await asyncio.sleep(0)
+
+    assert calls == [("e1", "car", 115.0)]
+    assert coalescer.get_stats() == {"received": 22, "merged": 21, "dispatched": 1, "skipped": 0, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_window_flushes_without_end_and_late_duplicates_are_skipped():
+    calls = []
+    coalescer = EventCoalescer(recording_handler(calls), window=WINDOW)
+    # an update that already carries the end time, then nothing until the window expires
+    coalescer.submit("update", frigate_event("e2", end_time=120.0), {})
+    await asyncio.sleep(WINDOW * 3)
+    assert calls == [("e2", "car", 120.0)]
+
+    # Frigate re-sends the ended event (e.g. snapshot updates): no new transition
+    coalescer.submit("update", frigate_event("e2", end_time=120.0), {})
+    coalescer.submit("end", frigate_event("e2", end_time=120.0), {})
+    await asyncio.sleep(WINDOW * 3)
+    assert len(calls) == 1
+    assert coalescer.counters["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_short_or_unfinished_events_are_not_dispatched():
+    calls = []
+    coalescer = EventCoalescer(recording_handler(calls), window=WINDOW)
+    coalescer.submit("new", frigate_event("e3"), {})
+    coalescer.submit("end", frigate_event("e3", end_time=105.0), {})  # 5 s, too short
+    coalescer.submit("new", frigate_event("e4"), {})
+    await asyncio.sleep(WINDOW * 3)
+    assert calls == []
+    assert coalescer.counters["skipped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_label_change_after_dispatch_is_a_new_transition():
+    calls = []
+    coalescer = EventCoalescer(recording_handler(calls), window=WINDOW)
+    coalescer.submit("end", frigate_event("e5", end_time=130.0, label="car"), {})
+    coalescer.submit("end", frigate_event("e5", end_time=130.0, label="truck"), {})
+    await asyncio.sleep(0)
+    assert [c[1] for c in calls] == ["car", "truck"]
+
+
+def test_replayed_burst_through_mqtt_listener(monkeypatch):
+    """Replays a Frigate burst through on_message with stub MQTT messages."""
+    from service import mqtt_listener
+
+    calls = []
+    coalescer = EventCoalescer(recording_handler(calls), window=WINDOW)
+    monkeypatch.setattr(mqtt_listener, "event_coalescer", coalescer)
+
+    def message(message_type, after):
+        payload = {"type": message_type, "before": after, "after": after}
+        return SimpleNamespace(topic="frigate/events", payload=json.dumps(payload).encode())
+
+    burst = [message("new", frigate_event("b1")), message("new", frigate_event("b2", label="person"))]
+    for _ in range(50):
+        burst.append(message("update", frigate_event("b1")))
+        burst.append(message("update", frigate_event("b2", label="person")))
+    burst.append(message("end", frigate_event("b1", end_time=130.0)))
+    burst.append(message("end", frigate_event("b2", end_time=140.0, label="person")))
+    burst.append(message("end", frigate_event("b1", end_time=130.0)))  # duplicate end
+
+    for msg in burst:
+        mqtt_listener.on_message(None, "frigate", msg)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = coalescer.get_stats()
+        if stats["received"] == len(burst) and stats["pending"] == 0 and len(calls) == 2:
+            break
+        time.sleep(0.01)
+
+    stats = coalescer.get_stats()
+    assert sorted(calls) == [("b1", "car", 130.0), ("b2", "person", 140.0)]
+    assert stats["received"] == len(burst)
+    assert stats["dispatched"] == 2
+    assert stats["merged"] + stats["dispatched"] + stats["skipped"] == len(burst)
@@ -1,47 +1,47 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 """Tests for FrigateService interactions with external Frigate API."""
+import aiohttp
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock
 from api.endpoints.frigate_api import FrigateService
-import requests
+from utils.http_client import HttpResponse, HttpError
 
 
-def test_get_camera_names_success():
+@pytest.mark.asyncio
+async def test_get_camera_names_success():
     service = FrigateService(base_url='http://fake')
-    fake_cfg = {"cameras": {"garage": {"objects": {"track": ["person"]}}, "yard": {"objects": {"track": []}}}}
-    with patch('api.endpoints.frigate_api.requests.get') as mget:
-        mget.return_value = MagicMock(status_code=200, json=lambda: fake_cfg)
-        result = service.get_camera_names()
+    fake_cfg = b'{"cameras": {"garage": {"objects": {"track": ["person"]}}, "yard": {"objects": {"track": []}}}}'
+    with patch('api.endpoints.frigate_api.http_client.get', new_callable=AsyncMock) as mget:
+        mget.return_value = HttpResponse(200, 'http://fake/api/config', fake_cfg)
+        result = await service.get_camera_names()
         assert result == {"garage": ["person"], "yard": []}
 
 
-def test_get_camera_names_error():
+@pytest.mark.asyncio
+async def test_get_camera_names_error():
     service = FrigateService(base_url='http://fake')
-    with patch('api.endpoints.frigate_api.requests.get') as mget:
-        mget.side_effect = requests.exceptions.RequestException('boom')
+    with patch('api.endpoints.frigate_api.http_client.get', new_callable=AsyncMock) as mget:
+        mget.side_effect = aiohttp.ClientConnectionError('boom')
         with pytest.raises(Exception):
-            service.get_camera_names()
+            await service.get_camera_names()
 
 
-def test_get_clip_from_timestamps_404():
+@pytest.mark.asyncio
+async def test_download_clip_404(tmp_path):
     service = FrigateService(base_url='http://fake')
-    fake_resp = MagicMock()
-    fake_resp.status_code = 404
-    fake_resp.text = 'not found'
-    http_err = requests.exceptions.HTTPError(response=fake_resp)
-    with patch('api.endpoints.frigate_api.requests.get', side_effect=http_err):
+    http_err = HttpError(404, 'not found', 'http://fake')
+    with patch('api.endpoints.frigate_api.http_client.download', AsyncMock(side_effect=http_err)):
         with pytest.raises(Exception) as exc:
-            service.get_clip_from_timestamps('garage', 1, 2)
+            await service.download_clip('garage', 1, 2, str(tmp_path / 'clip.mp4'))
         assert 'Clip not found' in str(exc.value)
 
 
-def test_get_clip_from_timestamps_stream_success():
+@pytest.mark.asyncio
+async def test_download_clip_success(tmp_path):
     service = FrigateService(base_url='http://fake')
-    fake_stream = MagicMock()
-    fake_stream.iter_content = lambda chunk_size: [b'a', b'b']
-    fake_stream.headers = {'Content-Disposition': 'inline'}
-    fake_stream.raise_for_status = lambda: None
-    with patch('api.endpoints.frigate_api.requests.get', return_value=fake_stream):
-        resp = service.get_clip_from_timestamps('garage', 1, 3)
-        assert resp.media_type == 'video/mp4'
\ No newline at end of file
+    with patch('api.endpoints.frigate_api.http_client.download', new_callable=AsyncMock) as mdownload:
+        mdownload.return_value = (HttpResponse(200, 'http://fake'), 2)
+        size = await service.download_clip('garage', 1, 3, str(tmp_path / 'clip.mp4'), download=True)
+        assert size == 2
+        assert mdownload.call_args.args[0].endswith('/api/garage/start/1/end/3/clip.mp4?download=1')
@@ -0,0 +1,279 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Tests for the shared async HTTP client against local stub servers."""
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from api.endpoints.frigate_api import FrigateService
+from api.endpoints.summarization_api import SummarizationService
+from service.vms_service import VmsService
+from utils.http_client import AsyncHttpClient, HttpError
+
+DELAY = 0.3
+
+
+async def start_server(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_overlap():
+    async def slow(request):
+        await asyncio.sleep(DELAY)
+        return web.json_response({"ok": True})
+
+    runner, base = await start_server([web.get("/slow", slow)])
+    client = AsyncHttpClient(limit_per_host=8)
+    try:
+        started = time.monotonic()
+        responses = await asyncio.gather(*(client.get(f"{base}/slow") for _ in range(8)))
+        elapsed = time.monotonic() - started
+        assert all(r.status == 200 and r.json() == {"ok": True} for r in responses)
+        # eight requests share the pool and take about one delay, not eight
+        assert elapsed < DELAY * 3
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_retries_unavailable_then_succeeds():
+    attempts = []
+
+    async def flaky(request):
+        attempts.append(1)
+        if len(attempts) < 3:
+            return web.Response(status=503, text="starting")
+        return web.json_response({"ok": True})
+
+    runner, base = await start_server([web.get("/flaky", flaky)])
+    client = AsyncHttpClient(retries=2, backoff=0.01)
+    try:
+        response = await client.get(f"{base}/flaky")
+        assert response.status == 200
+        assert len(attempts) == 3
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    attempts = []
+
+    async def missing(request):
+        attempts.append(1)
+        return web.Response(status=404, text="nope")
+
+    runner, base = await start_server([web.get("/missing", missing)])
+    client = AsyncHttpClient(retries=2, backoff=0.01)
+    try:
+        response = await client.get(f"{base}/missing")
+        with pytest.raises(HttpError) as exc:
+            response.raise_for_status()
+        assert exc.value.status == 404
+        assert len(attempts) == 1
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_download_streams_to_file_and_run_sync(tmp_path):
+    payload = b"v" * 300_000
+
+    async def clip(request):
+        return web.Response(body=payload, content_type="video/mp4")
+
+    runner, base = await start_server([web.get("/clip.mp4", clip)])
+    client = AsyncHttpClient()
+    try:
+        dest = tmp_path / "clip.mp4"
+        response, size = await client.download(f"{base}/clip.mp4", str(dest))
+        assert response.status == 200 and size == len(payload)
+        assert dest.read_bytes() == payload
+
+        # a plain thread (like the directory watcher) blocks only itself
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(status=client.run_sync(client.get(f"{base}/clip.mp4")).status)
+        )
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.01)
+        assert result["status"] == 200
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_summarize_load(tmp_path):
+    """Many events summarized at once against stub Frigate and VSS servers."""
+    uploads = []
+
+    async def clip(request):
+        await asyncio.sleep(DELAY)
+        return web.Response(body=b"c" * 4096, content_type="video/mp4")
+
+    async def upload(request):
+        form = await request.post()
+        uploads.append(form["tags"])
+        await asyncio.sleep(DELAY)
+        return web.json_response({"videoId": f"vid{len(uploads)}"})
+
+    async def summary(request):
+        body = await request.json()
+        return web.json_response({"summaryPipelineId": f"p-{body['videoId']}"})
+
+    frigate_runner, frigate_base = await start_server([web.get("/api/{camera}/start/{start}/end/{end}/clip.mp4", clip)])
+    vss_runner, vss_base = await start_server([
+        web.post("/manager/videos/", upload),
+        web.post("/manager/summary", summary),
+    ])
+    try:
+        vms = VmsService(FrigateService(base_url=frigate_base), SummarizationService())
+        vms.vss_summary_url = vss_base
+        started = time.monotonic()
+        results = await asyncio.gather(*(vms.summarize(f"cam{i}", 100, 110) for i in range(6)))
+        elapsed = time.monotonic() - started
+        assert [r["status"] for r in results] == [200] * 6
+        assert sorted(uploads) == [f"cam{i}" for i in range(6)]
+        # download + upload per event, overlapped across events
+        assert elapsed < DELAY * 6
+    finally:
+        await frigate_runner.cleanup()
+        await vss_runner.cleanup()
+
+
+CHUNK = 64 * 1024
+CHUNKS = 8
+
+
+def paced_clip(events, chunks=CHUNKS):
+    """Frigate stub sending the clip in chunks spread over DELAY, like a clip being assembled."""
+    async def clip(request):
+        events.setdefault("clip_requests", 0)
+        events["clip_requests"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "video/mp4"})
+        await response.prepare(request)
+        for _ in range(chunks):
+            await response.write(b"c" * CHUNK)
+            await asyncio.sleep(DELAY / chunks)
+        events["clip_sent"] = time.monotonic()
+        await response.write_eof()
+        return response
+    return clip
+
+
+def recording_upload(events, statuses=()):
+    """VSS stub that reads the multipart upload as it arrives and answers with the given statuses first."""
+    statuses = list(statuses)
+
+    async def upload(request):
+        fields = {}
+        async for part in await request.multipart():
+            if part.name == "video":
+                size = 0
+                while chunk := await part.read_chunk():
+                    events.setdefault("first_video_byte", time.monotonic())
+                    size += len(chunk)
+                fields["video"] = size
+            else:
+                fields[part.name] = await part.text()
+        events.setdefault("uploads", []).append(fields)
+        if statuses:
+            return web.Response(status=statuses.pop(0), text="busy")
+        return web.json_response({"videoId": f"vid{len(events['uploads'])}"})
+    return upload
+
+
+async def summary_stub(request):
+    body = await request.json()
+    return web.json_response({"summaryPipelineId": f"p-{body['videoId']}"})
+
+
+async def start_clip_servers(events, statuses=(), chunks=CHUNKS):
+    frigate = await start_server([web.get("/api/{camera}/start/{start}/end/{end}/clip.mp4", paced_clip(events, chunks))])
+    vss = await start_server([
+        web.post("/manager/videos/", recording_upload(events, statuses)),
+        web.post("/manager/summary", summary_stub),
+    ])
+    return frigate, vss
+
+
+@pytest.mark.asyncio
+async def test_clip_is_streamed_to_upload_without_local_copy(monkeypatch):
+    events = {}
+    (frigate_runner, frigate_base), (vss_runner, vss_base) = await start_clip_servers(events)
+    monkeypatch.setattr("service.vms_service.tempfile.NamedTemporaryFile", None)  # any spill would fail
+    try:
+        vms = VmsService(FrigateService(base_url=frigate_base), SummarizationService())
+        vms.vss_summary_url = vss_base
+        result = await vms.summarize("garage", 100, 110)
+
+        assert result == {"status": 200, "message": "p-vid1"}
+        assert events["uploads"] == [{"video": CHUNK * CHUNKS, "tags": "garage"}]
+        # the upload was under way before Frigate finished sending the clip
+        assert events["first_video_byte"] < events["clip_sent"]
+        stats = vms.get_transfer_stats()
+        assert stats["streamed"] == 1 and stats["streamed_bytes"] == CHUNK * CHUNKS
+        assert stats["spilled"] == 0 and stats["spilled_bytes"] == 0
+        assert stats["time_to_summary_start_sec"]["last"] < DELAY * 2
+    finally:
+        await frigate_runner.cleanup()
+        await vss_runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_failed_streamed_upload_is_retried_from_disk():
+    events = {}
+    (frigate_runner, frigate_base), (vss_runner, vss_base) = await start_clip_servers(events, statuses=[503], chunks=2)
+    try:
+        vms = VmsService(FrigateService(base_url=frigate_base), SummarizationService())
+        vms.vss_summary_url = vss_base
+        result = await vms.upload_video_to_summarizer("garage", 100, 110, False)
+
+        assert result == {"status": 200, "message": "vid2"}
+        # the clip is fetched again for the copy the retry reads
+        assert events["clip_requests"] == 2
+        assert [u["video"] for u in events["uploads"]] == [CHUNK * 2] * 2
+        stats = vms.get_transfer_stats()
+        assert stats["streamed"] == 0
+        assert stats["spilled"] == 1 and stats["spilled_bytes"] == CHUNK * 2
+    finally:
+        await frigate_runner.cleanup()
+        await vss_runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_relay_does_not_upload_small_body():
+    uploads = []
+
+    async def empty(request):
+        return web.Response(body=b"x" * 10)
+
+    async def upload(request):
+        uploads.append(1)
+        return web.json_response({})
+
+    runner, base = await start_server([web.get("/clip.mp4", empty), web.post("/upload", upload)])
+    client = AsyncHttpClient()
+    try:
+        result = await client.relay(f"{base}/clip.mp4", f"{base}/upload", lambda body: body, min_size=100)
+        assert result.size == 10 and result.upload is None
+        assert uploads == []
+    finally:
+        await client.close()
+        await runner.cleanup()
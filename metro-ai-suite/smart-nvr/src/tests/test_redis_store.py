@@ -14,6 +14,7 @@ class FakeRedis:
         self.store = {}
         self.sets = {"rules": set()}
         self.lists = {}
+        self.published = []
 
     # Key/Value
     async def set(self, k, v):
@@ -22,6 +23,12 @@ class FakeRedis:
     async def get(self, k):
         return self.store.get(k)
 
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
     async def exists(self, k):
         return 1 if k in self.store else 0
 
@@ -46,9 +53,8 @@ class FakeRedis:
 
     async def lrange(self, key, start, end):
         data = self.lists.get(key, [])
-        if end == -1:
-            end = len(data)
-        return data[start:end]
+        # Redis ranges include `end`; -1 is the last element
+        return data[start:] if end == -1 else data[start:end + 1]
 
 
 def make_request(fake):
@@ -63,6 +69,7 @@ async def test_add_rule_and_duplicate():
     assert added is True
     dup = await rs.add_rule(req, 'r1', {'id':'r1','label':'L','action':'a'})
     assert dup is False
+    assert fake.published == [(rs.RULES_CHANNEL, 'r1')]
 
 
 @pytest.mark.asyncio
@@ -78,6 +85,8 @@ async def test_rule_storage_and_delete():
     assert ok is True
     missing = await rs.delete_rule(req, 'r2')
     assert missing is False
+    # store + delete; the failed delete does not announce a change
+    assert fake.published == [(rs.RULES_CHANNEL, 'r2'), (rs.RULES_CHANNEL, 'r2')]
 
 
 @pytest.mark.asyncio
@@ -98,6 +107,26 @@ async def test_store_and_fetch_responses_and_summaries():
     assert search_results[0]['video_id'] == 'vid1'
 
 
+@pytest.mark.asyncio
+async def test_summary_id_pages_and_completed_summaries():
+    fake = FakeRedis()
+    req = make_request(fake)
+    await rs.store_rule(req, 'r4', {'id': 'r4', 'label': 'L', 'action': 'summarize'})
+    for sid in ('s1', 's2', 's3'):
+        await rs.save_summary_id('r4', sid, req)
+    assert await rs.get_summary_ids(req, 'r4', 1, 2) == ['s2', 's3']
+    assert await rs.get_summary_ids(req, 'r4') == ['s1', 's2', 's3']
+
+    await rs.save_completed_summary('s2', {'summary': 'done'}, req)
+    assert await rs.get_completed_summaries(req, ['s1', 's2']) == {'s2': {'summary': 'done'}}
+    assert await rs.get_completed_summaries(req, []) == {}
+
+    # deleting the rule drops its summary ids and cached completions
+    await rs.delete_rule(req, 'r4')
+    assert await rs.get_summary_ids(req, 'r4') == []
+    assert await rs.get_completed_summaries(req, ['s2']) == {}
+
+
 @pytest.mark.asyncio
 async def test_camera_watcher_mapping_store_load():
     fake = FakeRedis()
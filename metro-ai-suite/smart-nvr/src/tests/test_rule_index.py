@@ -0,0 +1,81 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Tests for the in-process (camera, label) rule index used by the rule engine."""
+import pytest
+from unittest.mock import AsyncMock
+
+from service.rule_index import RuleIndex
+
+RULES = [
+    {"id": "r1", "label": "car", "camera": "garage", "action": "summarize"},
+    {"id": "r2", "label": "car", "camera": None, "action": "search"},
+    {"id": "r3", "label": "person", "camera": "garage", "action": "summarize"},
+    {"id": "r4", "label": "car", "camera": "street", "action": "summarize"},
+]
+
+
+def subscribed_index():
+    index = RuleIndex()
+    index.subscribed = True
+    return index
+
+
+@pytest.mark.asyncio
+async def test_match_by_camera_and_label_including_any_camera_rules():
+    index = subscribed_index()
+    loader = AsyncMock(return_value=RULES)
+    matched = await index.match("garage", "car", loader)
+    assert [r["id"] for r in matched] == ["r1", "r2"]
+    assert [r["id"] for r in await index.match("lobby", "car", loader)] == ["r2"]
+    assert await index.match("garage", "bicycle", loader) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("camera", [None, ""])
+async def test_event_without_camera_matches_any_camera_rules_once(camera):
+    index = subscribed_index()
+    loader = AsyncMock(return_value=RULES)
+    assert [r["id"] for r in await index.match(camera, "car", loader)] == ["r2"]
+
+
+@pytest.mark.asyncio
+async def test_steady_state_does_not_reload():
+    index = subscribed_index()
+    loader = AsyncMock(return_value=RULES)
+    for _ in range(5):
+        await index.match("garage", "car", loader)
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reloads_on_next_match():
+    index = subscribed_index()
+    loader = AsyncMock(return_value=RULES)
+    await index.match("garage", "car", loader)
+    loader.return_value = RULES[:1]
+    index.invalidate()
+    assert [r["id"] for r in await index.match("garage", "car", loader)] == ["r1"]
+    assert loader.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_reload_is_not_lost():
+    index = subscribed_index()
+
+    async def loader():
+        index.invalidate()  # rule changed while the rules were being read
+        return RULES
+
+    calls = AsyncMock(side_effect=loader)
+    await index.match("garage", "car", calls)
+    await index.match("garage", "car", calls)
+    assert calls.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_without_listener_every_match_reloads():
+    index = RuleIndex()
+    loader = AsyncMock(return_value=RULES)
+    await index.match("garage", "car", loader)
+    await index.match("garage", "car", loader)
+    assert loader.await_count == 2
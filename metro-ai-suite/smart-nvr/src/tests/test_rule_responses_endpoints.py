@@ -1,6 +1,7 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 """Tests for endpoints returning rule summary and search responses."""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -8,16 +9,74 @@ from unittest.mock import AsyncMock, patch
 async def test_rule_summaries_endpoint(client):
     async def fake_get_rules(request):
         return [{"id": "r1", "action": "summarize", "camera": "cam"}]
-    async def fake_get_summary_ids(request, rule_id):
+    async def fake_get_summary_ids(request, rule_id, offset=0, limit=None):
         return ["s1", "s2"]
     with patch("api.router.get_rules", fake_get_rules), \
          patch("api.router.get_summary_ids", fake_get_summary_ids), \
+         patch("api.router.get_completed_summaries", AsyncMock(return_value={})), \
+         patch("api.router.save_completed_summary", AsyncMock()) as save, \
          patch("api.router.vms_service.summary", return_value={"status": "completed"}):
         resp = client.get("/rules/responses/")
         assert resp.status_code == 200
         data = resp.json()
         assert "r1" in data
         assert len(data["r1"]) == 2
+        # neither result carries a final summary, so nothing is persisted
+        save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rule_summaries_only_fetch_pending_and_persist_completed(client):
+    async def fake_get_rules(request):
+        return [{"id": "r1", "action": "summarize", "camera": "cam"}]
+
+    summary_ids = AsyncMock(return_value=["s1", "s2", "s3"])
+    completed = {"s1": {"summary": "cached"}}
+    results = {
+        "s2": {"summary": "final"},
+        "s3": {"summary": "Final summary is being generated please wait for a while.", "frameSummaries": []},
+    }
+    in_flight = 0
+    peak = 0
+
+    async def fake_summary(sid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return results[sid]
+
+    with patch("api.router.get_rules", fake_get_rules), \
+         patch("api.router.get_summary_ids", summary_ids), \
+         patch("api.router.get_completed_summaries", AsyncMock(return_value=completed)), \
+         patch("api.router.save_completed_summary", AsyncMock()) as save, \
+         patch("api.router.vms_service.summary", AsyncMock(side_effect=fake_summary)) as summary:
+        resp = client.get("/rules/responses/?offset=10&limit=3")
+        assert resp.status_code == 200
+        data = resp.json()["r1"]
+
+    assert data["s1"] == {"summary": "cached"}
+    assert data["s2"] == {"summary": "final"}
+    assert "frameSummaries" in data["s3"]
+    assert sorted(c.args[0] for c in summary.await_args_list) == ["s2", "s3"]
+    assert peak == 2
+    save.assert_awaited_once_with("s2", {"summary": "final"})
+    assert summary_ids.await_args.args[2:] == (10, 3)
+
+
+@pytest.mark.asyncio
+async def test_rule_summaries_unreachable_summarizer_reports_pending(client):
+    async def fake_get_rules(request):
+        return [{"id": "r1", "action": "summarize", "camera": "cam"}]
+    with patch("api.router.get_rules", fake_get_rules), \
+         patch("api.router.get_summary_ids", AsyncMock(return_value=["s1"])), \
+         patch("api.router.get_completed_summaries", AsyncMock(return_value={})), \
+         patch("api.router.save_completed_summary", AsyncMock()), \
+         patch("api.router.vms_service.summary", AsyncMock(side_effect=Exception("down"))):
+        resp = client.get("/rules/responses/")
+        assert resp.status_code == 200
+        assert resp.json() == {"r1": {"s1": "Pending"}}
 
 @pytest.mark.asyncio
 async def test_rule_search_responses_endpoint(client):
@@ -1,54 +1,60 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 """Tests for summarization service video upload and summary retrieval."""
+import aiohttp
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
-import requests
+from unittest.mock import patch, AsyncMock
 from api.endpoints.summarization_api import SummarizationService
 from model.model import Sampling, Evam, SummaryPayload
+from utils.http_client import HttpResponse
 
 
-def test_video_upload_file_missing(tmp_path):
+@pytest.mark.asyncio
+async def test_video_upload_file_missing(tmp_path):
     svc = SummarizationService()
     with pytest.raises(Exception):
-        svc.video_upload(tmp_path / 'nope.mp4', 'http://fake', 'camX')
+        await svc.video_upload(tmp_path / 'nope.mp4', 'http://fake', 'camX')
 
 
-def test_video_upload_request_exception(tmp_path):
+@pytest.mark.asyncio
+async def test_video_upload_request_exception(tmp_path):
     svc = SummarizationService()
     f = tmp_path / 'clip.mp4'
     f.write_bytes(b'1234')
-    err_resp = MagicMock()
-    err_resp.status_code = 500
-    err = requests.exceptions.RequestException('fail')
-    with patch('api.endpoints.summarization_api.requests.post', side_effect=err):
+    err = aiohttp.ClientConnectionError('fail')
+    with patch('api.endpoints.summarization_api.http_client.post', AsyncMock(side_effect=err)):
         with pytest.raises(Exception):
-            svc.video_upload(f, 'http://fake', 'camX')
+            await svc.video_upload(f, 'http://fake', 'camX')
 
 
-def test_video_upload_success(tmp_path):
+@pytest.mark.asyncio
+async def test_video_upload_success(tmp_path):
     svc = SummarizationService()
     f = tmp_path / 'clip2.mp4'
     f.write_bytes(b'0' * 2048)
-    with patch('api.endpoints.summarization_api.requests.post') as mpost:
-        mpost.return_value = MagicMock(status_code=200, json=lambda: {'videoId': 'vid1'}, raise_for_status=lambda: None)
-        resp = svc.video_upload(f, 'http://fake', 'camY')
+    with patch('api.endpoints.summarization_api.http_client.post', new_callable=AsyncMock) as mpost:
+        mpost.return_value = HttpResponse(200, 'http://fake', b'{"videoId": "vid1"}')
+        resp = await svc.video_upload(f, 'http://fake', 'camY')
         assert resp['videoId'] == 'vid1'
+        # the form is built per attempt so a retried upload re-reads the file
+        assert callable(mpost.call_args.kwargs['data'])
 
 
-def test_create_summary_success():
+@pytest.mark.asyncio
+async def test_create_summary_success():
     svc = SummarizationService()
     payload = SummaryPayload(videoId='v1', title='t', sampling=Sampling(chunkDuration=8, samplingFrame=8), evam=Evam(evamPipeline='object_detection'))
-    with patch('api.endpoints.summarization_api.requests.post') as mpost:
-        mpost.return_value = MagicMock(status_code=200, json=lambda: {'summaryPipelineId': 'p1'}, raise_for_status=lambda: None)
-        resp = svc.create_summary(payload, 'http://fake')
+    with patch('api.endpoints.summarization_api.http_client.post', new_callable=AsyncMock) as mpost:
+        mpost.return_value = HttpResponse(200, 'http://fake', b'{"summaryPipelineId": "p1"}')
+        resp = await svc.create_summary(payload, 'http://fake')
         assert resp['summaryPipelineId'] == 'p1'
 
 
-def test_get_summary_result_success():
+@pytest.mark.asyncio
+async def test_get_summary_result_success():
     svc = SummarizationService()
-    with patch('api.endpoints.summarization_api.requests.get') as mget:
-        mget.return_value = MagicMock(status_code=200, json=lambda: {'summary': 'done'}, raise_for_status=lambda: None)
-        resp = svc.get_summary_result('abc', 'http://fake')
-        assert resp['summary'] == 'done'
\ No newline at end of file
+    with patch('api.endpoints.summarization_api.http_client.get', new_callable=AsyncMock) as mget:
+        mget.return_value = HttpResponse(200, 'http://fake', b'{"summary": "done"}')
+        resp = await svc.get_summary_result('abc', 'http://fake')
+        assert resp['summary'] == 'done'
@@ -0,0 +1,186 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Tests for the persistent upload queue: retries, dedup, resume and metrics."""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from utils.upload_queue import UploadQueue, DONE, FAILED, DUPLICATE, QUEUED
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def make_files(tmp_path, count, content=None):
+    paths = []
+    for i in range(count):
+        f = tmp_path / f"clip{i}.mp4"
+        f.write_bytes(content if content is not None else f"video-{i}".encode() * 100)
+        paths.append(str(f))
+    return paths
+
+
+def states(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT path, state FROM jobs").fetchall())
+
+
+@pytest.fixture
+def queue_factory(tmp_path):
+    queues = []
+
+    def make(upload, **kwargs):
+        kwargs.setdefault("backoff", 0.01)
+        kwargs.setdefault("delete_processed", False)
+        queue = UploadQueue(str(tmp_path / "queue.db"), upload, **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        try:
+            queue.close()
+        except Exception:
+            pass
+
+
+def test_uploads_queued_files_and_reports_metrics(tmp_path, queue_factory):
+    uploaded = []
+
+    async def upload(path):
+        uploaded.append(path)
+        return f"vid-{len(uploaded)}"
+
+    queue = queue_factory(upload, workers=2)
+    queue.start()
+    files = make_files(tmp_path, 3)
+    assert queue.enqueue(files) == 3
+    # already known paths are not queued again
+    assert queue.enqueue(files) == 0
+
+    assert wait_until(lambda: queue.stats()["states"][DONE] == 3)
+    stats = queue.stats()
+    assert sorted(uploaded) == sorted(files)
+    assert stats["depth"] == 0
+    assert stats["uploads_per_min"] == 3
+    assert stats["bytes_per_sec"] > 0
+    assert stats["failed"] == 0
+
+
+def test_failed_uploads_are_retried_with_backoff(tmp_path, queue_factory):
+    attempts = []
+
+    async def flaky(path):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError("summarizer restarting")
+        return "vid-ok"
+
+    queue = queue_factory(flaky, workers=1, max_attempts=5)
+    queue.start()
+    files = make_files(tmp_path, 1)
+    queue.enqueue(files)
+
+    assert wait_until(lambda: states(queue.db_path).get(files[0]) == DONE)
+    assert len(attempts) == 3
+    # second retry waits at least twice the base backoff
+    assert attempts[2] - attempts[1] >= 0.02
+    assert queue.stats()["attempt_failures"] == 2
+
+
+def test_gives_up_after_max_attempts_and_failed_files_can_be_requeued(tmp_path, queue_factory):
+    calls = []
+
+    async def broken(path):
+        calls.append(path)
+        raise ConnectionError("down")
+
+    queue = queue_factory(broken, workers=1, max_attempts=2)
+    queue.start()
+    files = make_files(tmp_path, 1)
+    queue.enqueue(files)
+
+    assert wait_until(lambda: queue.stats()["failed"] == 1)
+    assert len(calls) == 2
+    assert queue.enqueue(files) == 1
+    assert wait_until(lambda: len(calls) == 4)
+
+
+def test_identical_content_is_uploaded_once(tmp_path, queue_factory):
+    uploaded = []
+
+    async def upload(path):
+        uploaded.append(path)
+        await asyncio.sleep(0.05)
+        return "vid-same"
+
+    queue = queue_factory(upload, workers=2)
+    queue.start()
+    files = make_files(tmp_path, 2, content=b"same recording" * 1000)
+    queue.enqueue(files)
+
+    assert wait_until(lambda: sorted(states(queue.db_path).values()) == [DONE, DUPLICATE])
+    assert len(uploaded) == 1
+
+
+def test_interrupted_uploads_resume_after_restart(tmp_path, queue_factory):
+    async def never(path):
+        raise AssertionError("not started")
+
+    first = queue_factory(never)
+    files = make_files(tmp_path, 2)
+    first.enqueue(files)
+    # simulate a crash while the first file was uploading
+    assert first._claim()[0] == files[0]
+    first.close()
+
+    uploaded = []
+
+    async def upload(path):
+        uploaded.append(path)
+        return "vid"
+
+    second = queue_factory(upload)
+    assert states(second.db_path)[files[1]] == QUEUED
+    second.start()
+    assert wait_until(lambda: len(uploaded) == 2)
+    assert sorted(uploaded) == sorted(files)
+
+
+def test_worker_pool_bounds_concurrency(tmp_path, queue_factory):
+    in_flight = 0
+    peak = 0
+
+    async def slow(path):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return "vid"
+
+    queue = queue_factory(slow, workers=2)
+    queue.start()
+    queue.enqueue(make_files(tmp_path, 6))
+
+    assert wait_until(lambda: queue.stats()["states"][DONE] == 6)
+    assert peak == 2
+
+
+def test_missing_file_is_marked_failed(tmp_path, queue_factory):
+    async def upload(path):
+        return "vid"
+
+    queue = queue_factory(upload)
+    queue.start()
+    queue.enqueue([str(tmp_path / "gone.mp4")])
+    assert wait_until(lambda: queue.stats()["failed"] == 1)
+    assert queue.stats()["states"][FAILED] == 1
@@ -1,54 +1,71 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 """Tests for upload utility functions."""
-from unittest.mock import patch, MagicMock
-from utils.utils import upload_single_video_with_retry, upload_videos_to_dataprep
+import pytest
+from unittest.mock import MagicMock
+from utils.http_client import HttpResponse, HttpError
+from utils.utils import upload_single_video, upload_videos_to_dataprep
 
 
-def test_upload_single_success(tmp_path, monkeypatch):
-    fp = tmp_path / "file.mp4"
+@pytest.mark.asyncio
+async def test_upload_single_success(tmp_path, monkeypatch):
+    fp = tmp_path / "2025-01-02" / "03" / "garage" / "file.mp4"
+    fp.parent.mkdir(parents=True)
     fp.write_bytes(b"0" * 600_000)
 
     post_calls = []
 
-    def fake_post(url, files=None, data=None):  # include data param used by production code
-        m = MagicMock()
+    async def fake_post(url, data=None, retries=None):  # include data param used by production code
+        post_calls.append((url, retries))
         if "search-embeddings" in url:
-            m.raise_for_status.return_value = None
-            m.json.return_value = {"status": "ok"}
-        else:
-            m.raise_for_status.return_value = None
-            m.json.return_value = {"videoId": "vid123"}
-        post_calls.append(url)
-        return m
+            return HttpResponse(200, url, b'{"status": "ok"}')
+        return HttpResponse(200, url, b'{"videoId": "vid123"}')
 
-    monkeypatch.setattr("utils.utils.requests.post", fake_post)
+    monkeypatch.setattr("utils.utils.http_client.post", fake_post)
 
-    assert upload_single_video_with_retry(str(fp), max_retries=2) is True
-    assert any("videos/" in c for c in post_calls)
-    assert any("search-embeddings" in c for c in post_calls)
+    assert await upload_single_video(str(fp)) == "vid123"
+    assert any("videos/" in c for c, _ in post_calls)
+    assert any("search-embeddings/vid123" in c for c, _ in post_calls)
+    # the upload queue owns retries; the client must not retry on its own
+    assert all(r == 0 for _, r in post_calls)
 
 
-def test_upload_single_failure(tmp_path, monkeypatch):
+@pytest.mark.asyncio
+async def test_upload_single_failure(tmp_path, monkeypatch):
     fp = tmp_path / "file.mp4"
     fp.write_bytes(b"0" * 600_000)
 
-    def fake_post(url, files=None, data=None):  # signature alignment
-        raise Exception("boom")
+    async def fake_post(url, data=None, retries=None):  # signature alignment
+        return HttpResponse(503, url, b"busy")
+
+    monkeypatch.setattr("utils.utils.http_client.post", fake_post)
+
+    with pytest.raises(HttpError):
+        await upload_single_video(str(fp))
+
 
-    monkeypatch.setattr("utils.utils.requests.post", fake_post)
+@pytest.mark.asyncio
+async def test_upload_single_without_video_id(tmp_path, monkeypatch):
+    fp = tmp_path / "file.mp4"
+    fp.write_bytes(b"0" * 1024)
+
+    async def fake_post(url, data=None, retries=None):
+        return HttpResponse(200, url, b"{}")
 
-    assert upload_single_video_with_retry(str(fp), max_retries=2) is False
+    monkeypatch.setattr("utils.utils.http_client.post", fake_post)
 
+    with pytest.raises(ValueError):
+        await upload_single_video(str(fp))
 
-def test_upload_batch(tmp_path, monkeypatch):
+
+def test_upload_batch_is_queued(tmp_path, monkeypatch):
     f1 = tmp_path / "f1.mp4"
     f1.write_bytes(b"0" * 600_000)
     f2 = tmp_path / "f2.mp4"
     f2.write_bytes(b"0" * 600_000)
 
-    def fake_single(path, max_retries=3):
-        return True
-
-    monkeypatch.setattr("utils.utils.upload_single_video_with_retry", fake_single)
-    assert upload_videos_to_dataprep([str(f1), str(f2)]) is True
+    queue = MagicMock()
+    queue.enqueue.return_value = 2
+    monkeypatch.setattr("utils.utils.get_upload_queue", lambda: queue)
+    assert upload_videos_to_dataprep({str(f1), str(f2)}) is True
+    assert sorted(queue.enqueue.call_args.args[0]) == [str(f1), str(f2)]
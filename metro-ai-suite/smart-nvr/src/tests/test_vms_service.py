@@ -1,30 +1,36 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 """Tests for VmsService summarization and search operations."""
+import os
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from service.vms_service import VmsService
 from api.endpoints.frigate_api import FrigateService
 from api.endpoints.summarization_api import SummarizationService
 from fastapi import HTTPException
-import types
+from utils.http_client import HttpResponse, RelayResult
 
 
-class DummyStream:
-    def __init__(self, chunks):
-        async def iterator():
-            for c in chunks:
-                yield c
-        self.body_iterator = iterator()
+def fake_download(size):
+    async def download(camera_name, start_time, end_time, dest_path, download=False):
+        with open(dest_path, 'wb') as f:
+            f.write(b'a' * size)
+        return size
+    return download
+
+
+def relayed(size, status=200, body=b'{"videoId": "vid123"}'):
+    upload = HttpResponse(status, 'x', body) if size > 100 else None
+    return AsyncMock(return_value=RelayResult(HttpResponse(200, 'x'), size, upload, 0.01))
 
 
 @pytest.mark.asyncio
 async def test_upload_video_small_file(monkeypatch, tmp_path):
-    # Frigate returns tiny stream -> triggers 404 logic path (size <=100)
+    # Frigate returns tiny clip -> triggers 404 logic path (size <=100)
     fs = FrigateService(base_url='x')
     ss = SummarizationService()
     v = VmsService(fs, ss)
-    monkeypatch.setattr(fs, 'get_clip_from_timestamps', lambda *a, **k: DummyStream([b'xx']))
+    monkeypatch.setattr(ss, 'video_upload_stream', relayed(2))
     resp = await v.upload_video_to_summarizer('cam', 1, 2, False)
     assert resp['status'] == 404
 
@@ -34,12 +40,41 @@ async def test_upload_video_success(monkeypatch, tmp_path):
     fs = FrigateService(base_url='x')
     ss = SummarizationService()
     v = VmsService(fs, ss)
-    # Provide large enough stream
-    monkeypatch.setattr(fs, 'get_clip_from_timestamps', lambda *a, **k: DummyStream([b'a' * 150]))
-    # Updated signature includes camera_name
-    monkeypatch.setattr(ss, 'video_upload', lambda path, base, cam: {'videoId': 'vid123'})
+    monkeypatch.setattr(ss, 'video_upload_stream', relayed(150))
+    monkeypatch.setattr(fs, 'download_clip', AsyncMock())
     resp = await v.upload_video_to_summarizer('cam', 1, 5, False)
     assert resp['status'] == 200 and resp['message'] == 'vid123'
+    assert ss.video_upload_stream.call_args.args[0] == 'x/api/cam/start/1/end/5/clip.mp4?download=1'
+    # streamed: no local copy
+    fs.download_clip.assert_not_awaited()
+    assert v.get_transfer_stats()['streamed'] == 1 and v.get_transfer_stats()['spilled'] == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_video_retries_from_file_when_stream_fails(monkeypatch, tmp_path):
+    fs = FrigateService(base_url='x')
+    ss = SummarizationService()
+    v = VmsService(fs, ss)
+    monkeypatch.setattr(ss, 'video_upload_stream', relayed(150, status=503, body=b'busy'))
+    monkeypatch.setattr(fs, 'download_clip', fake_download(150))
+    monkeypatch.setattr(ss, 'video_upload', AsyncMock(return_value={'videoId': 'vid456'}))
+    resp = await v.upload_video_to_summarizer('cam', 1, 5, False)
+    assert resp == {'status': 200, 'message': 'vid456'}
+    assert v.get_transfer_stats()['spilled'] == 1 and v.get_transfer_stats()['spilled_bytes'] == 150
+    # the temporary copy is removed after the upload
+    assert not os.path.exists(ss.video_upload.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_upload_video_rejected_is_not_retried(monkeypatch, tmp_path):
+    fs = FrigateService(base_url='x')
+    ss = SummarizationService()
+    v = VmsService(fs, ss)
+    monkeypatch.setattr(ss, 'video_upload_stream', relayed(150, status=400, body=b'bad video'))
+    monkeypatch.setattr(fs, 'download_clip', AsyncMock())
+    resp = await v.upload_video_to_summarizer('cam', 1, 5, True)
+    assert resp['status'] == 500
+    fs.download_clip.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -48,7 +83,7 @@ async def test_summary_empty_frames(monkeypatch):
     ss = SummarizationService()
     v = VmsService(fs, ss)
     with patch('service.vms_service.summarization_service.get_summary_result', return_value={'frameSummaries': [{'startFrame':1,'endFrame':2,'status':'processing','summary':None}]}):
-        result = v.summary('pipe123')
+        result = await v.summary('pipe123')
         assert 'Final summary is being generated' in result['summary']
         assert result['frameSummaries'][0]['status'] == 'processing'
 
@@ -61,8 +96,8 @@ async def test_search_embeddings_success(monkeypatch):
     async def fake_upload(*a, **k):
         return {'status':200,'message':'vid77'}
     monkeypatch.setattr(v, 'upload_video_to_summarizer', fake_upload)
-    with patch('service.vms_service.requests.post') as mpost:
-        mpost.return_value = MagicMock(status_code=200, json=lambda: {'message':'ok'}, raise_for_status=lambda: None)
+    with patch('service.vms_service.http_client.post', new_callable=AsyncMock) as mpost:
+        mpost.return_value = HttpResponse(200, 'x', b'{"message": "ok"}')
         resp = await v.search_embeddings('cam',1,2)
         assert resp['status'] == 200 and resp['video_id'] == 'vid77'
 
@@ -75,6 +110,6 @@ async def test_search_embeddings_failure(monkeypatch):
     async def fake_upload(*a, **k):
         return {'status':200,'message':'vid99'}
     monkeypatch.setattr(v, 'upload_video_to_summarizer', fake_upload)
-    with patch('service.vms_service.requests.post', side_effect=Exception('fail')):
+    with patch('service.vms_service.http_client.post', AsyncMock(side_effect=Exception('fail'))):
         with pytest.raises(Exception):
             await v.search_embeddings('cam',1,2)
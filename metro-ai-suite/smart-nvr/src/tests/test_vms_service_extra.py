@@ -1,57 +1,83 @@
 """Extra tests for VmsService covering success and failure paths."""
+import aiohttp
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from service.vms_service import VmsService
+from utils.http_client import HttpResponse, RelayResult
+
+
+def fake_download(size):
+    """AsyncMock standing in for FrigateService.download_clip: writes `size` bytes to dest_path."""
+    async def download(camera_name, start_time, end_time, dest_path, download=False):
+        with open(dest_path, "wb") as f:
+            f.write(b"x" * size)
+        return size
+    return AsyncMock(side_effect=download)
+
+
+def fake_stream(size, video_id):
+    """AsyncMock standing in for SummarizationService.video_upload_stream."""
+    upload = HttpResponse(200, "http://dummy", ('{"videoId": "%s"}' % video_id).encode()) if size > 100 else None
+    return AsyncMock(return_value=RelayResult(HttpResponse(200, "http://frigate"), size, upload, 0.01))
+
+
+def make_service():
+    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+    vs.summarization_service.video_upload = AsyncMock()
+    vs.summarization_service.video_upload_stream = fake_stream(0, None)
+    vs.summarization_service.create_summary = AsyncMock()
+    return vs
 
-class DummyAsyncStream:
-    def __init__(self, chunks):
-        async def gen():
-            for c in chunks:
-                yield c
-        # body_iterator is an async iterable object directly (accessed without call)
-        self.body_iterator = gen()
 
 @pytest.mark.asyncio
 async def test_upload_video_to_summarizer_success(monkeypatch):
-    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+    vs = make_service()
     vs.vss_summary_url = "http://dummy-summary"
     vs.vss_search_url = "http://dummy-search"
-    dummy_stream = DummyAsyncStream([b"x" * 200])
-    vs.frigate_service.get_clip_from_timestamps.return_value = dummy_stream
-    vs.summarization_service.video_upload.return_value = {"videoId": "vid123"}
+    vs.summarization_service.video_upload_stream = fake_stream(200, "vid123")
     resp = await vs.upload_video_to_summarizer("cam1", 1.0, 2.0, False)
     assert resp["status"] == 200
     assert resp["message"] == "vid123"
+    assert vs.summarization_service.video_upload_stream.call_args.args[1] == "http://dummy-summary"
 
 @pytest.mark.asyncio
 async def test_upload_video_to_summarizer_small_file(monkeypatch):
-    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+    vs = make_service()
     vs.vss_summary_url = "http://dummy-summary"
-    dummy_stream = DummyAsyncStream([b"x" * 10])  # too small triggers 404
-    vs.frigate_service.get_clip_from_timestamps.return_value = dummy_stream
+    vs.summarization_service.video_upload_stream = fake_stream(10, None)  # too small triggers 404
     resp = await vs.upload_video_to_summarizer("cam1", 1.0, 2.0, False)
     assert resp["status"] == 404
 
+@pytest.mark.asyncio
+async def test_upload_video_to_summarizer_connection_lost_uses_local_copy(monkeypatch):
+    vs = make_service()
+    vs.vss_summary_url = "http://dummy-summary"
+    vs.summarization_service.video_upload_stream = AsyncMock(side_effect=aiohttp.ServerDisconnectedError())
+    vs.frigate_service.download_clip = fake_download(200)
+    vs.summarization_service.video_upload.return_value = {"videoId": "vidCD"}
+    resp = await vs.upload_video_to_summarizer("cam1", 1.0, 2.0, False)
+    assert resp == {"status": 200, "message": "vidCD"}
+    assert vs.summarization_service.video_upload.call_args.args[1:] == ("http://dummy-summary", "cam1")
+
 @pytest.mark.asyncio
 async def test_summarize_pipeline_failure(monkeypatch):
-    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+    vs = make_service()
     vs.vss_summary_url = "http://dummy-summary"
     # upload succeeds
-    dummy_stream = DummyAsyncStream([b"x" * 200])
-    vs.frigate_service.get_clip_from_timestamps.return_value = dummy_stream
-    vs.summarization_service.video_upload.return_value = {"videoId": "vid999"}
+    vs.summarization_service.video_upload_stream = fake_stream(200, "vid999")
     vs.summarization_service.create_summary.return_value = {}  # missing pipeline id
     resp = await vs.summarize("cam1", 1.0, 2.0)
     assert resp["status"] == 500
 
-def test_summary_empty_result(monkeypatch):
-    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+@pytest.mark.asyncio
+async def test_summary_empty_result(monkeypatch):
+    vs = make_service()
     vs.vss_summary_url = "http://dummy-summary"
     # The VmsService.summary method calls the module-level summarization_service, not the instance attribute.
     # Patch the global to avoid an HTTP request and return a controlled empty summary result.
     monkeypatch.setattr(
         "service.vms_service.summarization_service.get_summary_result",
-        lambda pipeline_id, base_url: {
+        AsyncMock(return_value={
             "frameSummaries": [
                 {
                     "startFrame": 0,
@@ -61,22 +87,20 @@ def test_summary_empty_result(monkeypatch):
                 }
             ],
             "summary": None,
-        },
+        }),
     )
-    out = vs.summary("sum123")
+    out = await vs.summary("sum123")
     assert "Final summary is being generated" in out["summary"]
     assert out["frameSummaries"][0]["status"] == "ok"
 
 @pytest.mark.asyncio
 async def test_search_embeddings_success(monkeypatch):
-    vs = VmsService(frigate_service=MagicMock(), summarization_service=MagicMock())
+    vs = make_service()
     vs.vss_search_url = "http://dummy-search"
     vs.vss_summary_url = "http://dummy-summary"
-    dummy_stream = DummyAsyncStream([b"x" * 200])
-    vs.frigate_service.get_clip_from_timestamps.return_value = dummy_stream
-    vs.summarization_service.video_upload.return_value = {"videoId": "vidAB"}
-    # Patch requests.post inside module
-    with patch("service.vms_service.requests.post", return_value=MagicMock(json=lambda: {"message": "ok"}, raise_for_status=lambda: None)):
+    vs.summarization_service.video_upload_stream = fake_stream(200, "vidAB")
+    # Patch the shared HTTP client inside module
+    with patch("service.vms_service.http_client.post", AsyncMock(return_value=HttpResponse(200, "http://dummy-search", b'{"message": "ok"}'))):
         resp = await vs.search_embeddings("cam1", 1.0, 2.0)
         assert resp["status"] == 200
         assert resp["video_id"] == "vidAB"
@@ -5,6 +5,7 @@ import pytest
 from unittest.mock import patch, AsyncMock
 
 from api.router import get_camera_watcher_mapping, set_camera_watchers, CameraWatcherRequest
+from utils.http_client import HttpResponse
 
 @pytest.mark.asyncio
 async def test_get_camera_watcher_mapping_runtime_only():
@@ -21,17 +22,14 @@ async def test_get_camera_watcher_mapping_runtime_only():
 async def test_set_camera_watchers_persists_and_returns():
     fake_save = AsyncMock()
     fake_load = AsyncMock(return_value={})
-    # Patch health check HTTP call (requests.get) used inside router.set_camera_watchers
-    class FakeResp:
-        status_code = 200
-        def json(self):
-            return {}
+    # Patch health check HTTP call (http_client.get) used inside router.set_camera_watchers
+    fake_get = AsyncMock(return_value=HttpResponse(200, "http://fake", b"{}"))
 
     with patch("service.directory_watcher.save_camera_watcher_mapping", fake_save), \
          patch("service.directory_watcher._ensure_watcher_running"), \
          patch("service.directory_watcher._initial_scan_for_cameras"), \
          patch("service.directory_watcher._enabled_cameras", {}), \
-         patch("api.router.requests.get", return_value=FakeResp()):
+         patch("api.router.http_client.get", fake_get):
         req = CameraWatcherRequest(cameras=[{"garage": True}, {"livingroom": False}])
         # Directly call underlying function through router wrapper
         from api.router import set_camera_watchers as endpoint
@@ -36,6 +36,19 @@ class Settings(BaseSettings):
     DEBOUNCE_TIME: int = Field(default=5, env="DEBOUNCE_TIME")
     DELETE_PROCESSED_FILES: bool = Field(default=False, env="DELETE_PROCESSED_FILES")
     WATCH_DIRECTORY_RECURSIVE: bool = Field(default=False, env="WATCH_DIRECTORY_RECURSIVE")
+    # A recording is ready once closed after writing, or unchanged (size, mtime) for this many polls
+    WATCHER_STABLE_POLLS: int = Field(default=2, env="WATCHER_STABLE_POLLS")
+    WATCHER_POLL_INTERVAL: float = Field(default=2.0, env="WATCHER_POLL_INTERVAL")
+    # Ready files are handed on once this many accumulated (or after the debounce time)
+    WATCHER_BATCH_SIZE: int = Field(default=32, env="WATCHER_BATCH_SIZE")
+    # Per camera scan watermarks, so startup scans only cover recordings since the last run
+    WATCHER_STATE_PATH: str = Field(default="data/watcher_state.json", env="WATCHER_STATE_PATH")
+    # Persistent upload queue (see utils/upload_queue.py)
+    UPLOAD_QUEUE_DB: str = Field(default="data/upload_queue.db", env="UPLOAD_QUEUE_DB")
+    UPLOAD_WORKERS: int = Field(default=4, env="UPLOAD_WORKERS")
+    UPLOAD_MAX_ATTEMPTS: int = Field(default=5, env="UPLOAD_MAX_ATTEMPTS")
+    UPLOAD_RETRY_BACKOFF: float = Field(default=2.0, env="UPLOAD_RETRY_BACKOFF")
+    UPLOAD_RETRY_MAX_DELAY: float = Field(default=300.0, env="UPLOAD_RETRY_MAX_DELAY")
     # Upload target (Video Search / embeddings service)
     VIDEO_UPLOAD_ENDPOINT: str = Field(default="", env="VSS_SEARCH_IP")
     # Proxy control (trimmed to only what upload code references)
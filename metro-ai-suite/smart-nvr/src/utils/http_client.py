@@ -0,0 +1,268 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+import aiofiles
+import aiohttp
+from config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_CONNECT_TIMEOUT,
+    HTTP_TIMEOUT, HTTP_RETRIES, HTTP_RETRY_BACKOFF
+)
+
+logger = logging.getLogger("http-client")
+
+# Responses worth retrying: rate limited or a gateway/upstream that is (re)starting
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class HttpError(Exception):
+    """Raised by HttpResponse.raise_for_status() for 4xx/5xx responses."""
+
+    def __init__(self, status: int, text: str, url: str):
+        super().__init__(f"HTTP {status} from {url}: {text[:200]}")
+        self.status = status
+        self.text = text
+        self.url = url
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    url: str
+    body: bytes = b""
+    headers: dict = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body) if self.body else None
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HttpError(self.status, self.text, self.url)
+
+
+@dataclass
+class RelayResult:
+    """Outcome of AsyncHttpClient.relay()."""
+    source: HttpResponse  # source response headers, without the body
+    size: int  # body bytes read from the source
+    upload: Optional[HttpResponse] = None  # None when the body was at most min_size bytes and not uploaded
+    upload_start_sec: Optional[float] = None  # from sending the source request to the first body byte going out
+
+
+class AsyncHttpClient:
+    """
+    Process-wide pooled HTTP client for Frigate and the VSS services.
+
+    A single aiohttp session (keep-alive pool, bounded connections per host) lives on a dedicated
+    event loop thread. Coroutines on any loop (FastAPI, the MQTT listener loop) await requests
+    through run(), and plain threads (directory watcher) through run_sync(), so every caller
+    shares one pool and no caller's loop blocks on network I/O.
+
+    Connection errors, timeouts and RETRY_STATUSES are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        limit: int = HTTP_MAX_CONNECTIONS,
+        limit_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff: float = HTTP_RETRY_BACKOFF,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="http-client", daemon=True).start()
+            return self._loop
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Only called on the client loop, which owns the session
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout),
+                trust_env=True,  # honour http(s)_proxy / no_proxy like requests did
+            )
+        return self._session
+
+    async def run(self, coro):
+        """Runs `coro` on the client loop and awaits its result from the caller's loop."""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def run_sync(self, coro, timeout: Optional[float] = None):
+        """Runs `coro` on the client loop from a thread without an event loop, blocking that thread only."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    def spawn(self, coro):
+        """Schedules a long-running coroutine (e.g. a worker pool) on the client loop; returns its Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = self.backoff * (2 ** attempt)
+        return delay + random.uniform(0, delay / 2)
+
+    async def _with_retries(self, url: str, retries: Optional[int], attempt_fn):
+        retries = self.retries if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                result = await attempt_fn()
+                if not isinstance(result, HttpResponse) or result.status not in RETRY_STATUSES or attempt >= retries:
+                    return result
+                reason = f"HTTP {result.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            delay = self._backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"Request to {url} failed ({reason}); retry {attempt}/{retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _request(self, method: str, url: str, retries: Optional[int], kwargs: dict) -> HttpResponse:
+        session = await self._get_session()
+
+        async def attempt():
+            request_kwargs = dict(kwargs)
+            if callable(request_kwargs.get("data")):
+                # a factory builds a fresh body (e.g. a form over a reopened file) for every attempt
+                request_kwargs["data"] = request_kwargs["data"]()
+            async with session.request(method, url, **request_kwargs) as response:
+                return HttpResponse(response.status, url, await response.read(), dict(response.headers))
+
+        return await self._with_retries(url, retries, attempt)
+
+    async def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> HttpResponse:
+        """
+        Sends a request and returns the fully read response. kwargs go to aiohttp
+        (params, json, data, headers, timeout); `data` may be a zero-argument factory.
+        """
+        return await self.run(self._request(method, url, retries, kwargs))
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def _download(self, url: str, dest_path: str, retries: Optional[int], chunk_size: int, kwargs: dict):
+        session = await self._get_session()
+
+        async def attempt():
+            async with session.get(url, **kwargs) as response:
+                if response.status >= 400:
+                    return HttpResponse(response.status, url, await response.read(), dict(response.headers))
+                size = 0
+                async with aiofiles.open(dest_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await f.write(chunk)
+                        size += len(chunk)
+                return HttpResponse(response.status, url, b"", dict(response.headers)), size
+
+        result = await self._with_retries(url, retries, attempt)
+        if isinstance(result, HttpResponse):
+            result.raise_for_status()
+        return result
+
+    async def download(self, url: str, dest_path: str, retries: Optional[int] = None, chunk_size: int = 64 * 1024,
+                       **kwargs):
+        """Streams a response body to dest_path; returns (response without body, bytes written)."""
+        return await self.run(self._download(url, dest_path, retries, chunk_size, kwargs))
+
+    async def _relay(self, source_url: str, upload_url: str, make_body: Callable[[AsyncIterator[bytes]], object],
+                     min_size: int, retries: Optional[int], chunk_size: int, upload_kwargs: dict) -> RelayResult:
+        session = await self._get_session()
+        started = time.monotonic()
+
+        async def open_source():
+            response = await session.get(source_url)
+            if response.status >= 400:
+                async with response:
+                    return HttpResponse(response.status, source_url, await response.read(), dict(response.headers))
+            return response
+
+        response = await self._with_retries(source_url, retries, open_source)
+        if isinstance(response, HttpResponse):
+            response.raise_for_status()
+
+        async with response:
+            source = HttpResponse(response.status, source_url, b"", dict(response.headers))
+            chunks = response.content.iter_chunked(chunk_size)
+            # read ahead just far enough to tell an empty clip from a real one
+            head, size = [], 0
+            async for chunk in chunks:
+                head.append(chunk)
+                size += len(chunk)
+                if size > min_size:
+                    break
+            if size <= min_size:
+                return RelayResult(source, size)
+
+            result = RelayResult(source, size)
+
+            async def body():
+                result.upload_start_sec = time.monotonic() - started
+                for chunk in head:
+                    yield chunk
+                head.clear()
+                # one chunk at a time: the upload's socket writes pace the reads from the source
+                async for chunk in chunks:
+                    result.size += len(chunk)
+                    yield chunk
+
+            async with session.post(upload_url, data=make_body(body()), **upload_kwargs) as upload:
+                result.upload = HttpResponse(upload.status, upload_url, await upload.read(), dict(upload.headers))
+            return result
+
+    async def relay(self, source_url: str, upload_url: str, make_body: Callable[[AsyncIterator[bytes]], object],
+                    min_size: int = 0, retries: Optional[int] = None, chunk_size: int = 64 * 1024,
+                    **upload_kwargs) -> RelayResult:
+        """
+        Streams the body of a GET on source_url into a POST to upload_url without storing it.
+
+        make_body wraps the body stream into the request data (e.g. a multipart form). Memory use is
+        bounded by a few chunks: the source is only read as fast as the upload is sent. Opening the
+        source is retried like any request, but the upload is sent once since the streamed bytes
+        cannot be replayed; callers that need a retry fetch the source again. A source status
+        >= 400 raises HttpError. A body of at most min_size bytes is not uploaded.
+        """
+        return await self.run(
+            self._relay(source_url, upload_url, make_body, min_size, retries, chunk_size, upload_kwargs)
+        )
+
+    async def _close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def close(self):
+        if self._loop is not None:
+            await self.run(self._close())
+
+
+http_client = AsyncHttpClient()
@@ -0,0 +1,315 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Iterable, Optional
+
+from utils.common import logger, settings
+from utils.http_client import http_client
+
+QUEUED = "queued"
+UPLOADING = "uploading"
+DONE = "done"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+STATES = (QUEUED, UPLOADING, DONE, FAILED, DUPLICATE)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+THROUGHPUT_WINDOW = 60.0
+# Upper bound on how long an idle worker sleeps before re-checking for due retries
+IDLE_POLL_INTERVAL = 5.0
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadQueue:
+    """
+    Durable queue of recordings to upload to the video search service.
+
+    Every file is a row in SQLite holding its state, attempt count and next retry time, so pending
+    work survives a restart: files that were uploading when the process stopped are queued again
+    by start(). A bounded pool of workers on the shared HTTP client loop takes due files in order;
+    a failed upload is retried with exponential backoff until max_attempts, then marked failed.
+    A file whose content hash matches a file already uploaded is marked duplicate instead.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        upload: Callable[[str], Awaitable[str]],
+        workers: int = settings.UPLOAD_WORKERS,
+        max_attempts: int = settings.UPLOAD_MAX_ATTEMPTS,
+        backoff: float = settings.UPLOAD_RETRY_BACKOFF,
+        max_delay: float = settings.UPLOAD_RETRY_MAX_DELAY,
+        delete_processed: bool = settings.DELETE_PROCESSED_FILES,
+    ):
+        self.db_path = db_path
+        self.upload = upload
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.delete_processed = delete_processed
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                path TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                enqueued_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                size INTEGER,
+                content_hash TEXT,
+                video_id TEXT,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs (state, next_attempt_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_hash ON jobs (content_hash);
+            """
+        )
+        self._conn.commit()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._future = None
+        self._workers = None
+        self._completed = deque()  # (monotonic finish time, bytes) of recent uploads
+        self.attempt_failures = 0
+
+    # --- producer side (any thread) ---
+
+    def enqueue(self, paths: Iterable[str]) -> int:
+        """Queues files not seen before and files that previously failed; returns how many were queued."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (path, state, attempts, next_attempt_at, enqueued_at, updated_at)
+                VALUES (?, ?, 0, ?, ?, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    state = excluded.state, attempts = 0, next_attempt_at = excluded.next_attempt_at,
+                    updated_at = excluded.updated_at, last_error = NULL
+                WHERE jobs.state = 'failed'
+                """,
+                [(path, QUEUED, now, now, now) for path in dict.fromkeys(paths)],
+            )
+            self._conn.commit()
+            queued = self._conn.total_changes - before
+        if queued:
+            self._notify()
+        return queued
+
+    def _notify(self):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # --- workers (HTTP client loop) ---
+
+    def start(self):
+        """Requeues interrupted uploads and starts the worker pool; safe to call more than once."""
+        if self._future is not None and not self._future.done():
+            return
+        with self._lock:
+            recovered = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?", (QUEUED, time.time(), UPLOADING)
+            ).rowcount
+            self._conn.commit()
+        if recovered:
+            logger.info(f"[UploadQueue] Resuming {recovered} uploads interrupted by a restart")
+        self._future = http_client.spawn(self._run())
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        logger.info(f"[UploadQueue] Started {self.workers} upload workers (db={self.db_path})")
+        self._workers = asyncio.gather(*(self._worker() for _ in range(self.workers)))
+        await self._workers
+
+    async def _stop(self):
+        self._workers.cancel()
+        try:
+            await self._workers
+        except asyncio.CancelledError:
+            pass
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            job = self._claim()
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._idle_timeout())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._process(*job)
+            except Exception as e:  # never let one file stop a worker
+                logger.error(f"[UploadQueue] Unexpected error processing {job[0]}: {e}")
+                self._retry_or_fail(job[0], job[1], e)
+
+    def _idle_timeout(self) -> float:
+        with self._lock:
+            (due,) = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE state = ?", (QUEUED,)
+            ).fetchone()
+        if due is None:
+            return IDLE_POLL_INTERVAL
+        return min(max(due - time.time(), 0.0), IDLE_POLL_INTERVAL)
+
+    def _claim(self):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, attempts FROM jobs WHERE state = ? AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at, enqueued_at LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            path, attempts = row
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = ?, updated_at = ? WHERE path = ?",
+                (UPLOADING, attempts + 1, now, path),
+            )
+            self._conn.commit()
+        return path, attempts + 1
+
+    def _update(self, path: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE path = ?", (*fields.values(), path))
+            self._conn.commit()
+
+    def _uploaded_copy(self, path: str, content_hash: str):
+        """(state, video_id) of another file with the same content that is uploaded or uploading."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT state, video_id FROM jobs WHERE content_hash = ? AND path != ? AND state IN (?, ?) "
+                "ORDER BY state = ? DESC LIMIT 1",
+                (content_hash, path, DONE, UPLOADING, DONE),
+            ).fetchone()
+
+    async def _process(self, path: str, attempt: int):
+        if not os.path.exists(path):
+            logger.warning(f"[UploadQueue] {path} no longer exists; dropping it")
+            self._update(path, state=FAILED, last_error="file not found")
+            return
+
+        size = os.path.getsize(path)
+        content_hash = await asyncio.to_thread(file_sha256, path)
+        self._update(path, size=size, content_hash=content_hash)
+
+        copy = self._uploaded_copy(path, content_hash)
+        if copy is not None and copy[0] == DONE:
+            logger.info(f"[UploadQueue] {path} has the same content as an uploaded file (videoId={copy[1]}); skipping")
+            self._update(path, state=DUPLICATE, video_id=copy[1])
+            self._remove_processed(path)
+            return
+        if copy is not None:
+            # identical file is being uploaded right now; look again once that finished, without using an attempt
+            self._update(path, state=QUEUED, attempts=attempt - 1, next_attempt_at=time.time() + self.backoff)
+            return
+
+        started = time.monotonic()
+        try:
+            video_id = await self.upload(path)
+        except Exception as e:
+            self._retry_or_fail(path, attempt, e)
+            return
+
+        elapsed = time.monotonic() - started
+        self._update(path, state=DONE, video_id=video_id, last_error=None)
+        self._completed.append((time.monotonic(), size))
+        logger.info(f"[UploadQueue] Uploaded {path} -> videoId={video_id} in {elapsed:.2f}s (attempt {attempt})")
+        self._remove_processed(path)
+
+    def _retry_or_fail(self, path: str, attempt: int, error: Exception):
+        self.attempt_failures += 1
+        if attempt >= self.max_attempts:
+            logger.error(f"[UploadQueue] Giving up on {path} after {attempt} attempts: {error}")
+            self._update(path, state=FAILED, last_error=str(error))
+            return
+        delay = min(self.backoff * (2 ** (attempt - 1)), self.max_delay)
+        delay += random.uniform(0, delay / 2)
+        logger.warning(f"[UploadQueue] Attempt {attempt}/{self.max_attempts} for {path} failed: {error} | retrying in {delay:.1f}s")
+        self._update(path, state=QUEUED, next_attempt_at=time.time() + delay, last_error=str(error))
+
+    def _remove_processed(self, path: str):
+        if not self.delete_processed:
+            return
+        try:
+            os.remove(path)
+            logger.info(f"[UploadQueue] Deleted processed file {path}")
+        except OSError as e:
+            logger.warning(f"[UploadQueue] Failed to delete {path}: {e}")
+
+    # --- metrics ---
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+            (oldest,) = self._conn.execute(
+                "SELECT MIN(enqueued_at) FROM jobs WHERE state IN (?, ?)", (QUEUED, UPLOADING)
+            ).fetchone()
+        cutoff = time.monotonic() - THROUGHPUT_WINDOW
+        while self._completed and self._completed[0][0] < cutoff:
+            self._completed.popleft()
+        recent = list(self._completed)
+        return {
+            "depth": counts.get(QUEUED, 0) + counts.get(UPLOADING, 0),
+            "states": {state: counts.get(state, 0) for state in STATES},
+            "workers": self.workers,
+            "oldest_pending_sec": round(now - oldest, 1) if oldest is not None else None,
+            "uploads_per_min": len(recent) * 60.0 / THROUGHPUT_WINDOW,
+            "bytes_per_sec": round(sum(size for _, size in recent) / THROUGHPUT_WINDOW, 1),
+            "attempt_failures": self.attempt_failures,
+            "failed": counts.get(FAILED, 0),
+        }
+
+    def close(self):
+        """Stops the workers (an interrupted upload is resumed by the next start()) and closes the database."""
+        if self._loop is not None and self._future is not None and not self._future.done():
+            asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result(10)
+        elif self._future is not None:
+            self._future.cancel()
+        with self._lock:
+            self._conn.close()
+
+
+_queue: Optional[UploadQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_upload_queue() -> UploadQueue:
+    """The process-wide upload queue, created and started on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            from utils.utils import upload_single_video  # utils.utils imports this module
+
+            _queue = UploadQueue(os.path.abspath(settings.UPLOAD_QUEUE_DB), upload_single_video)
+            _queue.start()
+        return _queue
@@ -3,9 +3,10 @@
 
 import os
 import re
-import time
-import requests
+import aiohttp
 from utils.common import logger, settings
+from utils.http_client import http_client
+from utils.upload_queue import get_upload_queue
 
 try:  # Keep backward compatibility if VSS_SEARCH_URL still defined elsewhere
     from config import VSS_SEARCH_URL  # type: ignore
@@ -13,9 +14,6 @@ except Exception:
     # Fallback: derive from VIDEO_UPLOAD_ENDPOINT if present
     VSS_SEARCH_URL = settings.VIDEO_UPLOAD_ENDPOINT or ""
 
-uploaded_files = set()
-
-
 def sanitize_file_path(file_path):
     file_name = os.path.basename(file_path)
     sanitized_name = re.sub(r"[^a-zA-Z0-9_\-./]", "_", file_name)
@@ -23,17 +21,15 @@ def sanitize_file_path(file_path):
 
 
 
-def upload_single_video_with_retry(file_path, max_retries=3):
-    """Upload a single video with retry mechanism"""
-    retry_count = 1
-    sanitized_name = sanitize_file_path(file_path)
-    file_size = None
-    try:
-        file_size = os.path.getsize(file_path)
-    except Exception:
-        pass
-    logger.info(f"[Upload] Starting upload attempts for {file_path} (sanitized='{sanitized_name}' size={file_size})")
+def _video_form(file, sanitized_name, tags):
+    form = aiohttp.FormData()
+    form.add_field("video", file, filename=sanitized_name, content_type="video/mp4")
+    form.add_field("tags", tags)
+    return form
 
+
+def _camera_tag(file_path):
+    """Camera name from the recording path, used as the upload tag."""
     camera_name = None
     try:
         parts = file_path.split(os.sep)
@@ -46,103 +42,54 @@ def upload_single_video_with_retry(file_path, max_retries=3):
             camera_name = os.path.basename(os.path.dirname(file_path))
     except Exception:
         camera_name = "unknown"
-    tags = f"{camera_name}"
-    while retry_count < max_retries:
-        try:
-            with open(file_path, "rb") as file:
-                logger.debug(f"Upload target base: {VSS_SEARCH_URL}")
-                # Step 1: Upload video to get ID
-
-                files = {
-                    "video": (sanitized_name, file, "video/mp4"),
-                }
-                data = {
-                    "tags": tags
-                }
-
-                upload_response = requests.post(
-                    f"{VSS_SEARCH_URL}/manager/videos/",
-                    files=files,
-                    data=data,
-                )
-                upload_response.raise_for_status()
-
-                # Extract video ID from response
-                video_data = upload_response.json()
-                video_id = video_data.get("videoId")
-                if not video_id:
-                    raise ValueError("No video ID returned from upload")
-
-                logger.info(f"[Upload] Uploaded {file_path} -> videoId={video_id}")
-
-                # Step 2: Process video for search embeddings
-                embedding_response = requests.post(
-                    f"{VSS_SEARCH_URL}/manager/videos/search-embeddings/{video_id}",
-                )
-                embedding_response.raise_for_status()
-
-                logger.info(f"[Upload] Search embeddings processed for videoId={video_id} ({file_path})")
-                return True  # Successfully processed
-        except (requests.exceptions.HTTPError, Exception) as e:
-            retry_count += 1
-
-            # Determine if we should retry or exit
-            if retry_count > max_retries:
-                # Log error with additional context for HTTP errors
-                if isinstance(e, requests.exceptions.HTTPError):
-                    status_code = (
-                        e.response.status_code if hasattr(e, "response") else "unknown"
-                    )
-                    logger.error(
-                        f"HTTP error {status_code} occurred while processing {file_path} after {max_retries} retries: {str(e)}"
-                    )
-                else:
-                    logger.error(
-                        f"Error occurred while processing {file_path} after {max_retries} retries: {str(e)}"
-                    )
-                return False
-
-            # Calculate backoff time and retry
-            backoff_time = 2**retry_count  # Exponential backoff 2,4,8,...
-            error_type = (
-                "HTTP error"
-                if isinstance(e, requests.exceptions.HTTPError)
-                else "Error"
-            )
-            logger.warning(f"[Upload] {error_type} attempt {retry_count-1}/{max_retries} for {file_path}: {str(e)} | retrying in {backoff_time}s")
-            time.sleep(backoff_time)
-
-    # This should never be reached due to the return statements above, but adding as a safety measure
-    return False
+    return f"{camera_name}"
+
+
+async def upload_single_video(file_path):
+    """
+    Uploads one video and triggers its search embeddings; returns the videoId.
+
+    A single attempt: errors propagate so the upload queue can schedule a retry.
+    """
+    sanitized_name = sanitize_file_path(file_path)
+    tags = _camera_tag(file_path)
+    logger.info(f"[Upload] Uploading {file_path} (sanitized='{sanitized_name}' size={os.path.getsize(file_path)})")
+    logger.debug(f"Upload target base: {VSS_SEARCH_URL}")
+
+    with open(file_path, "rb") as file:
+        # Step 1: Upload video to get ID
+        # retries=0: the upload queue owns the retry policy for the whole upload
+        upload_response = await http_client.post(
+            f"{VSS_SEARCH_URL}/manager/videos/",
+            data=_video_form(file, sanitized_name, tags),
+            retries=0,
+        )
+    upload_response.raise_for_status()
+
+    # Extract video ID from response
+    video_id = (upload_response.json() or {}).get("videoId")
+    if not video_id:
+        raise ValueError("No video ID returned from upload")
+    logger.info(f"[Upload] Uploaded {file_path} -> videoId={video_id}")
+
+    # Step 2: Process video for search embeddings
+    embedding_response = await http_client.post(
+        f"{VSS_SEARCH_URL}/manager/videos/search-embeddings/{video_id}",
+        retries=0,
+    )
+    embedding_response.raise_for_status()
+    logger.info(f"[Upload] Search embeddings processed for videoId={video_id} ({file_path})")
+    return video_id
 
 
 def upload_videos_to_dataprep(file_paths):
-    start_batch = time.time()
-    logger.info(f"[Upload] Starting batch upload of {len(file_paths)} files")
-    all_success = True
-    processed = 0
-    skipped = 0
-    for file_path in file_paths:
-        if file_path in uploaded_files:
-            skipped += 1
-            logger.debug(f"[Upload] Skipping already uploaded file {file_path}")
-            continue
-        single_start = time.time()
-        success = upload_single_video_with_retry(file_path)
-        elapsed_single = time.time() - single_start
-        if success:
-            processed += 1
-            uploaded_files.add(file_path)
-            logger.info(f"[Upload] Completed upload for {file_path} in {elapsed_single:.2f}s (progress {processed}/{len(file_paths)})")
-            if settings.DELETE_PROCESSED_FILES:
-                try:
-                    os.remove(file_path)
-                    logger.info(f"[Upload] Deleted processed file {file_path}")
-                except Exception as del_err:
-                    logger.warning(f"[Upload] Failed to delete {file_path}: {del_err}")
-        else:
-            all_success = False
-            logger.error(f"[Upload] Failed upload for {file_path} after retries (elapsed {elapsed_single:.2f}s)")
-    batch_elapsed = time.time() - start_batch
-    logger.info(f"[Upload] Batch complete: success={all_success} processed={processed} skipped={skipped} total={len(file_paths)} elapsed={batch_elapsed:.2f}s")
-    return all_success
\ No newline at end of file
+    """
+    Watcher action: queues the files in the persistent upload queue and returns at once.
+
+    Files already uploaded (by path) are not queued again; uploading, retries and deletion
+    of processed files happen in the queue's workers.
+    """
+    file_paths = list(file_paths)
+    queued = get_upload_queue().enqueue(file_paths)
+    logger.info(f"[Upload] Queued {queued} of {len(file_paths)} files for upload ({len(file_paths) - queued} already known)")
+    return True